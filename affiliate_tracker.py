@@ -209,6 +209,39 @@ def compute_product_stats(product_id: str, since: datetime = None,
     }
 
 
+def product_rate_table() -> dict:
+    """
+    Per-product CVR and average commission, from one pass over the click log
+    and one over the sale log. CVR is None until a product has at least
+    MIN_CLICKS_FOR_ALERT clicks, so callers can fall back to their own default.
+    """
+    products = load_products()
+    click_counts = {pid: 0 for pid in products}
+    sale_counts = {pid: 0 for pid in products}
+    commission_totals = {pid: 0.0 for pid in products}
+
+    for c in load_clicks():
+        if c["product_id"] in click_counts:
+            click_counts[c["product_id"]] += 1
+    for s in load_sales():
+        if s["product_id"] in sale_counts:
+            sale_counts[s["product_id"]] += 1
+            commission_totals[s["product_id"]] += s["commission_earned_usd"]
+
+    table = {}
+    for pid, product in products.items():
+        n_clicks, n_sales = click_counts[pid], sale_counts[pid]
+        table[pid] = {
+            "name": product["name"],
+            "clicks": n_clicks,
+            "sales": n_sales,
+            "cvr": n_sales / n_clicks if n_clicks >= MIN_CLICKS_FOR_ALERT else None,
+            "avg_commission_usd": (commission_totals[pid] / n_sales if n_sales
+                                   else product.get("commission_usd", 0.0)),
+        }
+    return table
+
+
 def weekly_pnl(weeks_back: int = 0, weekly_ad_spend: float = 0.0) -> dict:
     """Generate a weekly P&L report."""
     now = datetime.now()
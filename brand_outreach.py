@@ -6,20 +6,35 @@ Track every prospect, outreach touchpoint, and deal stage.
 
 Commands:
     python brand_outreach.py add          Add a prospect
+    python brand_outreach.py import FILE  Bulk import prospects from a CSV / NDJSON list
     python brand_outreach.py pipeline     View full pipeline
     python brand_outreach.py touch        Log a touchpoint
     python brand_outreach.py convert      Move to next stage
     python brand_outreach.py dashboard    Revenue summary
+    python brand_outreach.py forecast     Expected MRR over the next quarter, learned from stage history
     python brand_outreach.py prospects    List all prospects
+    python brand_outreach.py today        Follow-ups due now, most overdue first
+    python brand_outreach.py history      Full touchpoint history for one prospect
 """
 
 import argparse
+import bisect
+import csv
+import heapq
+import importlib
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 DATA_DIR   = Path(__file__).parent / "data"
 CRM_FILE   = DATA_DIR / "brand_crm.json"
+FOLLOWUP_FILE = DATA_DIR / "brand_followups.json"
+TOUCH_LOG_FILE   = DATA_DIR / "brand_touchpoints.log"         # append-only, one JSON event per line
+TOUCH_INDEX_FILE = DATA_DIR / "brand_touchpoints_index.json"  # pid -> byte offsets, + bytes of log covered
+STAGE_LOG_FILE   = DATA_DIR / "brand_stage_changes.log"       # append-only, one stage change per line
+FORECAST_FILE    = DATA_DIR / "brand_forecast.json"
 
 STAGES = [
     "identified",
@@ -46,16 +61,96 @@ STAGE_LABELS = {
     "closed_won":      "🟢 Closed Won",
     "closed_lost":     "🔴 Closed Lost",
 }
+STAGE_RANK = {stage: i for i, stage in enumerate(STAGES)}
+
+# Bulk import: worker threads for the enrichment step, and the prospect fields
+# an enricher may set (stage and touch history only change through the logs)
+ENRICH_WORKERS = 16
+ENRICH_FIELDS = ("niche", "contact", "contact_url", "est_monthly_gmv", "notes")
+
+# Pipeline value counts this share of a prospect's est. monthly GMV, weighted
+# by the chance a prospect at that stage eventually closes
+PIPELINE_TAKE_RATE = 0.18
+STAGE_PROBABILITY = {
+    "identified":     0.05,
+    "researched":     0.08,
+    "contacted":      0.10,
+    "replied":        0.20,
+    "demo_scheduled": 0.30,
+    "demo_done":      0.40,
+    "proposal_sent":  0.55,
+    "negotiating":    0.70,
+    "closed_won":     1.00,
+    "closed_lost":    0.00,
+}
+OPEN_STAGES = STAGES[:-2]
+STATS_VERSION = 1  # bump when the per-stage aggregate fields change
+
+# Forecast: close rates learned from stage history are shrunk toward
+# STAGE_PROBABILITY by this many pseudo-observations. Until a stage has
+# FORECAST_MIN_DEALS won deals behind it, its time-to-close is assumed even
+# over the stage's share of FORECAST_DEFAULT_CLOSE_DAYS (identified = all of it).
+FORECAST_PRIOR_WEIGHT       = 10
+FORECAST_MIN_DEALS          = 3
+FORECAST_DEFAULT_CLOSE_DAYS = 90
+FORECAST_MONTHS             = 3   # 30-day months
+FORECAST_BAND_Z             = 1.2816  # 10th / 90th percentile
+
+# Days after the last activity that the next action falls due, per stage.
+# Closed prospects have no next action.
+FOLLOWUP_DAYS = {
+    "identified":     3,
+    "researched":     2,
+    "contacted":      3,
+    "replied":        1,
+    "demo_scheduled": 1,
+    "demo_done":      2,
+    "proposal_sent":  3,
+    "negotiating":    2,
+}
+# While contacted, the gap widens with each touch (cold email cadence: day 4, 10, 21)
+CONTACTED_FOLLOWUP_DAYS = [3, 6, 11]
+
+NEXT_ACTIONS = {
+    "identified":     "Research the brand",
+    "researched":     "Send first outreach",
+    "contacted":      "Send follow-up",
+    "replied":        "Book a demo",
+    "demo_scheduled": "Confirm and run the demo",
+    "demo_done":      "Send the proposal",
+    "proposal_sent":  "Chase the proposal",
+    "negotiating":    "Push to close",
+}
 
 
 def _load():
     if not CRM_FILE.exists():
-        return {"prospects": {}, "deals": [], "stats": {}}
+        return {"prospects": {}, "deals": [], "stats": build_stats({})}
+    with open(CRM_FILE) as f:
+        try:
+            crm = json.load(f)
+        except Exception:
+            return {"prospects": {}, "deals": [], "stats": build_stats({})}
+    if crm.get("stats", {}).get("version") != STATS_VERSION:
+        crm["stats"] = build_stats(crm.get("prospects", {}))
+    if any("touchpoints" in p for p in crm.get("prospects", {}).values()):
+        _migrate_inline_touchpoints(crm)
+    return crm
+
+
+def read_crm():
+    """
+    Load the CRM for reading only. Unlike _load(), nothing is migrated or
+    written, so prospects from an older CRM may still carry inline
+    `touchpoints` lists that have not been moved to the touchpoint log.
+    """
+    if not CRM_FILE.exists():
+        return {"prospects": {}, "deals": []}
     with open(CRM_FILE) as f:
         try:
             return json.load(f)
         except Exception:
-            return {"prospects": {}, "deals": [], "stats": {}}
+            return {"prospects": {}, "deals": []}
 
 
 def _save(data):
@@ -64,35 +159,599 @@ def _save(data):
         json.dump(data, f, indent=2, default=str)
 
 
-def cmd_add(args):
-    crm = _load()
-    brand     = input("Brand name: ").strip()
-    niche     = input("Niche (beauty/supplements/home/fashion/other): ").strip()
-    est_gmv   = input("Estimated monthly GMV ($): ").strip()
-    contact   = input("Contact name: ").strip()
-    contact_url = input("LinkedIn / TikTok / Email: ").strip()
-    notes     = input("Notes (product, shop size, why a fit): ").strip()
+def append_touchpoints(events):
+    """
+    Append (pid, event) pairs to the touchpoint log and return their byte
+    offsets. Only the log is written; the offset index catches up from the
+    log tail on its next read (see load_touch_index). The CRM file is untouched.
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    offsets = []
+    with open(TOUCH_LOG_FILE, "ab") as f:
+        for pid, event in events:
+            offsets.append(f.tell())
+            line = json.dumps({"prospect_id": pid, **event}, default=str) + "\n"
+            f.write(line.encode("utf-8"))
+    return offsets
+
+
+def load_touch_index():
+    """
+    pid -> byte offsets into the touchpoint log. The saved index records how
+    many log bytes it covers, and only lines appended after that point are
+    scanned and added before it is returned.
+    """
+    index = None
+    if TOUCH_INDEX_FILE.exists():
+        with open(TOUCH_INDEX_FILE) as f:
+            index = json.load(f)
+    if not index or not isinstance(index.get("covered"), int):
+        index = {"covered": 0, "offsets": {}}
+    size = TOUCH_LOG_FILE.stat().st_size if TOUCH_LOG_FILE.exists() else 0
+    if size < index["covered"]:
+        index = {"covered": 0, "offsets": {}}
+    if size > index["covered"]:
+        offsets = index["offsets"]
+        pos = index["covered"]
+        with open(TOUCH_LOG_FILE, "rb") as f:
+            f.seek(pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offsets.setdefault(json.loads(line)["prospect_id"], []).append(pos)
+                pos += len(line)
+        index["covered"] = pos
+        with open(TOUCH_INDEX_FILE, "w") as f:
+            json.dump(index, f)
+    return index["offsets"]
+
+
+def load_touchpoints(pid):
+    """Read one prospect's touchpoints from the log, oldest first."""
+    offsets = load_touch_index().get(pid, [])
+    touches = []
+    if not offsets:
+        return touches
+    with open(TOUCH_LOG_FILE, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            touches.append(json.loads(f.readline()))
+    return touches
+
+
+def _summarise_touch(prospect, touch):
+    """Keep the per-prospect touch counters in step with the log."""
+    prospect["touch_count"]  = prospect.get("touch_count", 0) + 1
+    prospect["last_outcome"] = touch.get("outcome")
+    prospect["last_channel"] = touch.get("channel")
+
+
+def _migrate_inline_touchpoints(crm):
+    """One-time move of inline `touchpoints` lists into the touchpoint log."""
+    events = []
+    for pid, p in crm["prospects"].items():
+        for touch in p.pop("touchpoints", []):
+            _summarise_touch(p, touch)
+            events.append((pid, {"brand": p["brand"], **touch}))
+        p.setdefault("touch_count", 0)
+        p.setdefault("last_outcome", None)
+        p.setdefault("last_channel", None)
+    append_touchpoints(events)
+    _save(crm)
+
+
+def append_stage_changes(changes):
+    """Append (pid, old_stage, new_stage) changes, dated now, to the stage-change log."""
+    if not changes:
+        return
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    now = datetime.now().isoformat()
+    with open(STAGE_LOG_FILE, "a") as f:
+        for pid, old, new in changes:
+            f.write(json.dumps({"prospect_id": pid, "from": old, "to": new, "date": now}) + "\n")
+
+
+def _stage_entries(prospects):
+    """
+    When each prospect first reached each stage, and when it entered its
+    current one. Prospects start at identified on their added date; a
+    current stage with no logged change (older records) is dated by the
+    last activity.
+    """
+    reached = {pid: {"identified": p.get("added") or p.get("last_activity")}
+               for pid, p in prospects.items()}
+    last = {}
+    if STAGE_LOG_FILE.exists():
+        with open(STAGE_LOG_FILE) as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                change = json.loads(line)
+                pid    = change["prospect_id"]
+                if pid in reached:
+                    reached[pid].setdefault(change["to"], change["date"])
+                    last[pid] = (change["to"], change["date"])
+    entered = {}
+    for pid, p in prospects.items():
+        stage = p.get("stage", "identified")
+        reached[pid].setdefault(stage, p.get("last_activity") or p.get("added"))
+        if pid in last and last[pid][0] == stage:
+            entered[pid] = last[pid][1]
+        else:
+            entered[pid] = reached[pid][stage]
+    return reached, entered
+
+
+def _empty_stage():
+    return {"count": 0, "est_gmv": 0.0, "monthly_value": 0.0, "deal_types": {}}
+
+
+def _account(stats, prospect, sign=1):
+    """Add (sign=1) or remove (sign=-1) a prospect's contribution to its stage's aggregates."""
+    bucket = stats["stages"].setdefault(prospect.get("stage", "identified"), _empty_stage())
+    bucket["count"] += sign
+    bucket["est_gmv"] = round(bucket["est_gmv"] + sign * (prospect.get("est_monthly_gmv") or 0), 2)
+    bucket["monthly_value"] = round(bucket["monthly_value"] + sign * (prospect.get("monthly_value") or 0), 2)
+    if prospect.get("deal_type"):
+        types = bucket["deal_types"]
+        types[prospect["deal_type"]] = types.get(prospect["deal_type"], 0) + sign
+
+
+def build_stats(prospects):
+    """Per-stage counts, est. GMV, MRR and deal types, kept up to date on every stage change."""
+    stats = {"version": STATS_VERSION, "stages": {stage: _empty_stage() for stage in STAGES}}
+    for p in prospects.values():
+        _account(stats, p)
+    return stats
+
+
+def _stage_total(stats, stages, field="count"):
+    return sum(stats["stages"][stage][field] for stage in stages)
+
+
+def weighted_pipeline(stats):
+    """Open-stage pipeline value with each stage weighted by its close probability."""
+    return sum(stats["stages"][stage]["est_gmv"] * PIPELINE_TAKE_RATE * STAGE_PROBABILITY[stage]
+               for stage in OPEN_STAGES)
+
+
+def crm_stamp():
+    """(mtime_ns, size) of the CRM file, or None if there is none yet."""
+    if not CRM_FILE.exists():
+        return None
+    st = CRM_FILE.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def next_action_due(prospect):
+    """When the prospect's next action falls due (ISO string), or None once closed."""
+    stage = prospect.get("stage", "identified")
+    if stage not in FOLLOWUP_DAYS:
+        return None
+    days = FOLLOWUP_DAYS[stage]
+    if stage == "contacted":
+        touches = max(prospect.get("touch_count", 0), 1)
+        days = CONTACTED_FOLLOWUP_DAYS[min(touches, len(CONTACTED_FOLLOWUP_DAYS)) - 1]
+    last = prospect.get("last_activity") or prospect.get("added")
+    return (datetime.fromisoformat(last) + timedelta(days=days)).isoformat()
+
+
+def _followup_card(prospect):
+    """What `today` shows for a due prospect, kept in the queue so it needn't load the CRM."""
+    return {"brand": prospect["brand"], "stage": prospect.get("stage", "identified")}
+
+
+def build_followups(crm):
+    """
+    Follow-up queue: a min-heap of [due, pid] plus each prospect's current
+    due time and card.
+    """
+    due, cards = {}, {}
+    for pid, p in crm.get("prospects", {}).items():
+        when = next_action_due(p)
+        if when is not None:
+            due[pid] = when
+            cards[pid] = _followup_card(p)
+    heap = [[when, pid] for pid, when in due.items()]
+    heapq.heapify(heap)
+    return {"due": due, "heap": heap, "cards": cards}
+
+
+def load_followups(crm=None):
+    """Load the follow-up queue, rebuilding it if the CRM changed behind its back."""
+    followups = None
+    if FOLLOWUP_FILE.exists():
+        with open(FOLLOWUP_FILE) as f:
+            followups = json.load(f)
+    if followups is None or followups.get("stamp") != crm_stamp() or "cards" not in followups:
+        followups = build_followups(crm if crm is not None else _load())
+        _save_followups(followups)
+    return followups
+
+
+def _save_followups(followups):
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    followups["stamp"] = crm_stamp()
+    with open(FOLLOWUP_FILE, "w") as f:
+        json.dump(followups, f)
+
+
+def _reschedule(followups, prospects):
+    """
+    Push new due times for changed prospects. Superseded heap entries stay
+    put and are skipped when popped; the heap is rebuilt once they dominate.
+    """
+    for p in prospects:
+        when = next_action_due(p)
+        if when is None:
+            followups["due"].pop(p["id"], None)
+            followups["cards"].pop(p["id"], None)
+            continue
+        followups["cards"][p["id"]] = _followup_card(p)
+        if followups["due"].get(p["id"]) != when:
+            followups["due"][p["id"]] = when
+            heapq.heappush(followups["heap"], [when, p["id"]])
+    if len(followups["heap"]) > 2 * len(followups["due"]) + 64:
+        followups["heap"] = [[when, pid] for pid, when in followups["due"].items()]
+        heapq.heapify(followups["heap"])
+
+
+def _save_with_followups(crm, pids):
+    """Save the CRM and reschedule the follow-ups of the prospects that changed."""
+    followups = load_followups(crm)
+    _save(crm)
+    _reschedule(followups, [crm["prospects"][pid] for pid in pids])
+    _save_followups(followups)
+
+
+def due_followups(now=None, limit=None, followups=None):
+    """
+    Prospects whose next action is due by `now`, most overdue first, as
+    (pid, due) pairs. Pops only the due entries off the heap (O(k log n))
+    and pushes the live ones back. Pass a loaded queue to reuse its cards.
+    """
+    followups = followups or load_followups()
+    cutoff    = (now or datetime.now()).isoformat()
+    heap      = followups["heap"]
+    due, stale = [], 0
+    while heap and heap[0][0] <= cutoff and (limit is None or len(due) < limit):
+        when, pid = heapq.heappop(heap)
+        if followups["due"].get(pid) == when:
+            due.append((pid, when))
+        else:
+            stale += 1
+    for pid, when in due:
+        heapq.heappush(heap, [when, pid])
+    if stale:
+        _save_followups(followups)
+    return due
+
+
+# ─── FORECAST ─────────────────────────────────────────────────────────────────
+
+def fit_forecast_model(prospects, reached, now=None):
+    """
+    Learn, per open stage, the chance a prospect that reached it closes won
+    and how many days the won ones took from there. Closed prospects count
+    fully; prospects still open count by how much of the usual time-to-close
+    has already passed for them, so stalled leads pull the rate down.
+    Also learns the take rate (MRR / est. GMV) of won deals.
+    """
+    now   = now or datetime.now()
+    model = {stage: {"wins": 0, "resolved": 0, "days": [], "open_days": []} for stage in OPEN_STAGES}
+    won_value = won_gmv = 0.0
+    won_deals = 0
+    for pid, p in prospects.items():
+        outcome = p.get("stage")
+        if outcome not in ("closed_won", "closed_lost"):
+            for stage, when in reached[pid].items():
+                if stage in model:
+                    model[stage]["open_days"].append(max((now - datetime.fromisoformat(when)).days, 0))
+            continue
+        closed = datetime.fromisoformat(reached[pid][outcome])
+        for stage, when in reached[pid].items():
+            if stage not in model:
+                continue
+            model[stage]["resolved"] += 1
+            if outcome == "closed_won":
+                model[stage]["wins"] += 1
+                model[stage]["days"].append(max((closed - datetime.fromisoformat(when)).days, 0))
+        if outcome == "closed_won" and p.get("monthly_value") and p.get("est_monthly_gmv"):
+            won_value += p["monthly_value"]
+            won_gmv   += p["est_monthly_gmv"]
+            won_deals += 1
+
+    for stage, m in model.items():
+        m["days"].sort()
+        m["span"]     = FORECAST_DEFAULT_CLOSE_DAYS * (len(OPEN_STAGES) - STAGE_RANK[stage]) / len(OPEN_STAGES)
+        m["exposure"] = m["resolved"] + sum(_closed_by(m, days) for days in m.pop("open_days"))
+        m["p_win"]    = ((m["wins"] + FORECAST_PRIOR_WEIGHT * STAGE_PROBABILITY[stage])
+                         / (m["exposure"] + FORECAST_PRIOR_WEIGHT))
+    take_rate = won_value / won_gmv if won_deals >= FORECAST_MIN_DEALS else PIPELINE_TAKE_RATE
+    return model, take_rate
+
+
+def _closed_by(m, days):
+    """Share of won deals from this stage that closed within `days` of reaching it."""
+    if len(m["days"]) >= FORECAST_MIN_DEALS:
+        return bisect.bisect_right(m["days"], days) / len(m["days"])
+    return min(days / m["span"], 1.0)
 
-    pid = brand.lower().replace(" ", "_")
-    crm["prospects"][pid] = {
-        "id":           pid,
+
+def _win_within(m, age, horizon):
+    """
+    Chance a prospect `age` days into this stage, still open, closes won in
+    the next `horizon` days. Conditioning on it still being open discounts
+    prospects that have sat longer than won deals usually take.
+    """
+    done  = _closed_by(m, age)
+    alive = 1 - m["p_win"] * done
+    if alive <= 0:
+        return 0.0
+    return m["p_win"] * (_closed_by(m, age + horizon) - done) / alive
+
+
+def build_forecast(crm, now=None):
+    """
+    Expected MRR at the end of each of the next FORECAST_MONTHS months, with
+    a 10th-90th percentile band. Each open prospect closes won within the
+    horizon with probability _win_within, worth est. GMV × learned take
+    rate; mean and variance of that sum of independent outcomes are exact,
+    so no sampling is needed. Prospects are grouped by (stage, days in
+    stage) first, so each horizon is one pass over a few hundred groups.
+    """
+    now       = now or datetime.now()
+    prospects = crm.get("prospects", {})
+    reached, entered = _stage_entries(prospects)
+    model, take_rate = fit_forecast_model(prospects, reached, now)
+
+    groups = {}
+    for pid, p in prospects.items():
+        stage = p.get("stage", "identified")
+        value = (p.get("est_monthly_gmv") or 0) * take_rate
+        if stage not in model or value <= 0:
+            continue
+        age   = max((now - datetime.fromisoformat(entered[pid])).days, 0)
+        group = groups.setdefault((stage, age), [0.0, 0.0])
+        group[0] += value
+        group[1] += value * value
+
+    current = crm["stats"]["stages"]["closed_won"]["monthly_value"]
+    months, previous = [], 0.0
+    for month in range(1, FORECAST_MONTHS + 1):
+        horizon = 30 * month
+        mean = var = 0.0
+        for (stage, age), (total, squares) in groups.items():
+            q     = _win_within(model[stage], age, horizon)
+            mean += q * total
+            var  += q * (1 - q) * squares
+        band = FORECAST_BAND_Z * var ** 0.5
+        months.append({
+            "month":   month,
+            "through": (now + timedelta(days=horizon)).date().isoformat(),
+            "new_mrr": round(mean - previous, 2),
+            "mrr":     round(current + mean, 2),
+            "low":     round(current + max(mean - band, 0), 2),
+            "high":    round(current + mean + band, 2),
+        })
+        previous = mean
+
+    return {
+        "date":        now.date().isoformat(),
+        "take_rate":   round(take_rate, 4),
+        "current_mrr": current,
+        "open":        _stage_total(crm["stats"], OPEN_STAGES),
+        "stages":      {
+            stage: {"p_win": round(m["p_win"], 4), "prior": STAGE_PROBABILITY[stage],
+                    "wins": m["wins"], "resolved": m["resolved"],
+                    "median_days": m["days"][len(m["days"]) // 2] if m["days"] else None}
+            for stage, m in model.items()
+        },
+        "months":      months,
+    }
+
+
+def load_forecast(crm=None):
+    """The cached forecast, rebuilt when the CRM has changed or the day has rolled over."""
+    forecast = None
+    if FORECAST_FILE.exists():
+        with open(FORECAST_FILE) as f:
+            forecast = json.load(f)
+    stamp = crm_stamp()
+    if (forecast is None or forecast.get("stamp") != stamp
+            or forecast.get("date") != datetime.now().date().isoformat()):
+        forecast = build_forecast(crm if crm is not None else _load())
+        forecast["stamp"] = stamp
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with open(FORECAST_FILE, "w") as f:
+            json.dump(forecast, f, indent=2)
+    return forecast
+
+
+def _prospect_id(brand):
+    return brand.lower().replace(" ", "_")
+
+
+def _parse_money(value):
+    """Accept 12000, '$12,000', '12K' or '1.5M'."""
+    text  = str(value or "0").strip().upper().replace(",", "").replace("$", "")
+    scale = {"K": 1_000, "M": 1_000_000}.get(text[-1:], 1)
+    if scale > 1:
+        text = text[:-1]
+    return float(text or 0) * scale
+
+
+def _new_prospect(brand, niche, est_gmv, contact, contact_url, notes):
+    return {
+        "id":           _prospect_id(brand),
         "brand":        brand,
         "niche":        niche,
-        "est_monthly_gmv": float(est_gmv.replace(",", "").replace("$", "") or 0),
+        "est_monthly_gmv": est_gmv,
         "contact":      contact,
         "contact_url":  contact_url,
         "notes":        notes,
         "stage":        "identified",
-        "touchpoints":  [],
+        "touch_count":  0,
+        "last_outcome": None,
+        "last_channel": None,
         "added":        datetime.now().isoformat(),
         "last_activity": datetime.now().isoformat(),
         "deal_type":    None,   # managed | saas
         "monthly_value": 0,
     }
-    _save(crm)
+
+
+def iter_import_rows(path):
+    """Stream rows from a CSV file or, for .ndjson/.jsonl, one JSON object per line."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.suffix.lower() in (".ndjson", ".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def load_enricher(spec):
+    """Resolve an enricher given as 'module:function' (a callable taking a prospect, returning updates)."""
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Enricher '{spec}' must be given as module:function.")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def import_prospects(path, enricher=None, workers=ENRICH_WORKERS):
+    """
+    Bulk-import brands from a CSV or NDJSON file (brand, niche, est_monthly_gmv,
+    contact, contact_url, notes columns; `name` / `est_gmv` also accepted).
+
+    IDs are normalised as in cmd_add and merged by dict lookup: new brands are
+    added at identified, existing ones get a changed GMV estimate and any
+    blank fields filled. Repeated rows in the file count once (first wins).
+    If an enricher is given it runs over the added and updated prospects on a
+    thread pool; its updates to ENRICH_FIELDS are applied on the main thread
+    and anything else it returns is ignored. Everything is written in a
+    single save.
+    """
+    crm     = _load()
+    stats   = crm["stats"]
+    seen    = set()
+    changed = []
+    counts  = {"added": 0, "updated": 0, "unchanged": 0, "duplicates": 0, "skipped": 0,
+               "enriched": 0, "enrich_failed": 0}
+
+    for row in iter_import_rows(Path(path)):
+        brand = (row.get("brand") or row.get("name") or "").strip()
+        pid   = _prospect_id(brand)
+        if not pid:
+            counts["skipped"] += 1
+            continue
+        if pid in seen:
+            counts["duplicates"] += 1
+            continue
+        seen.add(pid)
+        try:
+            est_gmv = _parse_money(row.get("est_monthly_gmv") or row.get("est_gmv"))
+        except ValueError:
+            counts["skipped"] += 1
+            continue
+        fields = {
+            "niche":       (row.get("niche") or "").strip(),
+            "contact":     (row.get("contact") or "").strip(),
+            "contact_url": (row.get("contact_url") or "").strip(),
+            "notes":       (row.get("notes") or "").strip(),
+        }
+
+        existing = crm["prospects"].get(pid)
+        if existing is None:
+            prospect = _new_prospect(brand, fields["niche"], est_gmv, fields["contact"],
+                                     fields["contact_url"], fields["notes"])
+            crm["prospects"][pid] = prospect
+            _account(stats, prospect)
+            changed.append(pid)
+            counts["added"] += 1
+            continue
+
+        updates = {k: v for k, v in fields.items() if v and not existing.get(k)}
+        if est_gmv and existing.get("est_monthly_gmv") != est_gmv:
+            updates["est_monthly_gmv"] = est_gmv
+        if updates:
+            _account(stats, existing, -1)
+            existing.update(updates)
+            _account(stats, existing)
+            changed.append(pid)
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+
+    if enricher is not None and changed:
+        def enrich(pid):
+            try:
+                return pid, enricher(dict(crm["prospects"][pid]))
+            except Exception:
+                return pid, None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for pid, updates in pool.map(enrich, changed):
+                if updates is None:
+                    counts["enrich_failed"] += 1
+                    continue
+                updates = {k: v for k, v in updates.items() if k in ENRICH_FIELDS}
+                if updates:
+                    prospect = crm["prospects"][pid]
+                    _account(stats, prospect, -1)
+                    prospect.update(updates)
+                    _account(stats, prospect)
+                    counts["enriched"] += 1
+
+    if changed:
+        _save_with_followups(crm, changed)
+    return counts
+
+
+def cmd_add(args):
+    crm = _load()
+    brand     = input("Brand name: ").strip()
+    niche     = input("Niche (beauty/supplements/home/fashion/other): ").strip()
+    est_gmv   = input("Estimated monthly GMV ($): ").strip()
+    contact   = input("Contact name: ").strip()
+    contact_url = input("LinkedIn / TikTok / Email: ").strip()
+    notes     = input("Notes (product, shop size, why a fit): ").strip()
+
+    pid = _prospect_id(brand)
+    if pid in crm["prospects"]:
+        _account(crm["stats"], crm["prospects"][pid], -1)
+        if crm["prospects"][pid]["stage"] != "identified":
+            append_stage_changes([(pid, crm["prospects"][pid]["stage"], "identified")])
+    crm["prospects"][pid] = _new_prospect(
+        brand, niche, float(est_gmv.replace(",", "").replace("$", "") or 0),
+        contact, contact_url, notes,
+    )
+    _account(crm["stats"], crm["prospects"][pid])
+    _save_with_followups(crm, [pid])
     print(f"\n  ✓ {brand} added to pipeline — Stage: Identified")
 
 
+def cmd_import(args):
+    try:
+        enricher = load_enricher(args.enrich) if args.enrich else None
+    except (ValueError, ImportError, AttributeError) as e:
+        print(f"\n  Error: {e}\n")
+        return
+    start    = time.perf_counter()
+    counts   = import_prospects(args.file, enricher, args.workers)
+    print(f"\n  Imported {args.file} in {time.perf_counter() - start:.1f}s")
+    print(f"  Added:           {counts['added']:>8,}")
+    print(f"  Updated:         {counts['updated']:>8,}")
+    print(f"  Unchanged:       {counts['unchanged']:>8,}")
+    print(f"  Duplicate rows:  {counts['duplicates']:>8,}")
+    print(f"  Skipped (bad):   {counts['skipped']:>8,}")
+    if enricher is not None:
+        print(f"  Enriched:        {counts['enriched']:>8,}")
+        print(f"  Enrich failed:   {counts['enrich_failed']:>8,}")
+    print()
+
+
 def cmd_touch(args):
     crm = _load()
     print("\nProspects:")
@@ -106,24 +765,59 @@ def cmd_touch(args):
     message = input("What was said / sent: ").strip()
     outcome = input("Outcome (no_reply/replied/meeting_booked/not_interested): ").strip()
 
-    touch = {
-        "date":    datetime.now().isoformat(),
-        "channel": channel,
-        "message": message,
-        "outcome": outcome,
-    }
-    crm["prospects"][pid]["touchpoints"].append(touch)
-    crm["prospects"][pid]["last_activity"] = datetime.now().isoformat()
+    old_stage = crm["prospects"][pid]["stage"]
+    prospect  = log_touchpoint(pid, channel, message, outcome)
+    if prospect["stage"] != old_stage:
+        print(f"  → Stage updated to: {STAGE_LABELS[prospect['stage']].split(' ', 1)[1]}")
+    print(f"\n  ✓ Touchpoint logged for {prospect['brand']}")
 
-    if outcome == "replied" and crm["prospects"][pid]["stage"] == "contacted":
-        crm["prospects"][pid]["stage"] = "replied"
-        print("  → Stage updated to: Replied")
-    elif outcome == "meeting_booked":
-        crm["prospects"][pid]["stage"] = "demo_scheduled"
-        print("  → Stage updated to: Demo Scheduled")
 
-    _save(crm)
-    print(f"\n  ✓ Touchpoint logged for {crm['prospects'][pid]['brand']}")
+def log_touchpoint(pid, channel, message, outcome, mark_contacted=False):
+    """Append one touchpoint to a prospect (see log_touchpoints). Returns the prospect."""
+    return log_touchpoints([(pid, channel, message, outcome)], mark_contacted)[pid]
+
+
+def log_touchpoints(touches, mark_contacted=False):
+    """
+    Append (pid, channel, message, outcome) touchpoints to the touchpoint log
+    and apply the stage changes they imply, in a single save. Only the
+    prospect's summary counters live in the CRM. mark_contacted moves
+    identified / researched prospects to contacted (used when the touch is an
+    outbound send). Returns the touched prospects by id.
+    """
+    crm     = _load()
+    touched = {}
+    events  = []
+    changes = []
+    for pid, channel, message, outcome in touches:
+        prospect = crm["prospects"][pid]
+        touch = {
+            "date":    datetime.now().isoformat(),
+            "channel": channel,
+            "message": message,
+            "outcome": outcome,
+        }
+        events.append((pid, {"brand": prospect["brand"], **touch}))
+        _summarise_touch(prospect, touch)
+        prospect["last_activity"] = touch["date"]
+
+        old_stage = prospect["stage"]
+        _account(crm["stats"], prospect, -1)
+        if mark_contacted and prospect["stage"] in ("identified", "researched"):
+            prospect["stage"] = "contacted"
+        if outcome == "replied" and prospect["stage"] == "contacted":
+            prospect["stage"] = "replied"
+        elif outcome == "meeting_booked":
+            prospect["stage"] = "demo_scheduled"
+        _account(crm["stats"], prospect)
+        if prospect["stage"] != old_stage:
+            changes.append((pid, old_stage, prospect["stage"]))
+        touched[pid] = prospect
+
+    append_touchpoints(events)
+    append_stage_changes(changes)
+    _save_with_followups(crm, touched)
+    return touched
 
 
 def cmd_convert(args):
@@ -144,6 +838,7 @@ def cmd_convert(args):
     move = input("\nSelect: ").strip()
     new_stage = STAGES[current_idx + int(move)]
 
+    _account(crm["stats"], prospect, -1)
     crm["prospects"][pid]["stage"] = new_stage
     crm["prospects"][pid]["last_activity"] = datetime.now().isoformat()
 
@@ -160,7 +855,9 @@ def cmd_convert(args):
         })
         print(f"\n  🟢 DEAL CLOSED — {prospect['brand']} | ${monthly:,.0f}/month")
 
-    _save(crm)
+    _account(crm["stats"], prospect)
+    append_stage_changes([(pid, STAGES[current_idx], new_stage)])
+    _save_with_followups(crm, [pid])
     print(f"\n  ✓ {prospect['brand']} → {STAGE_LABELS[new_stage]}")
 
 
@@ -176,77 +873,113 @@ def cmd_pipeline(args):
         s = p.get("stage", "identified")
         stage_groups.setdefault(s, []).append(p)
 
-    total_pipeline = 0
+    stats = crm["stats"]
     for stage in STAGES:
         group = stage_groups.get(stage, [])
         if not group:
             continue
         label = STAGE_LABELS.get(stage, stage)
-        print(f"\n  {label} ({len(group)})")
+        print(f"\n  {label} ({stats['stages'][stage]['count']})")
         for p in group:
             gmv   = p.get("est_monthly_gmv", 0)
-            val   = p.get("monthly_value", 0)
-            touch = len(p.get("touchpoints", []))
+            touch = p.get("touch_count", 0)
             last  = p.get("last_activity", "")[:10]
-            total_pipeline += gmv * 0.18
             print(f"    • {p['brand']:<28} GMV: ${gmv:>8,.0f}/mo   Touches: {touch}   Last: {last}")
 
+    won            = stats["stages"]["closed_won"]
+    total_pipeline = _stage_total(stats, STAGES, "est_gmv") * PIPELINE_TAKE_RATE
     print(f"\n  {'─'*70}")
     print(f"  Total prospects:     {len(prospects)}")
-    won = [p for p in prospects.values() if p.get("stage") == "closed_won"]
-    won_mrr = sum(p.get("monthly_value", 0) for p in won)
-    print(f"  Closed won:          {len(won)}  |  MRR: ${won_mrr:,.0f}/month")
-    print(f"  Pipeline value:      ~${total_pipeline:,.0f}/month (at 18% of est. GMV)")
+    print(f"  Closed won:          {won['count']}  |  MRR: ${won['monthly_value']:,.0f}/month")
+    print(f"  Pipeline value:      ~${total_pipeline:,.0f}/month (at {PIPELINE_TAKE_RATE:.0%} of est. GMV)")
+    print(f"  Weighted pipeline:   ~${weighted_pipeline(stats):,.0f}/month (open stages × close probability)")
+    print(f"  Forecast MRR in 90d: ~${load_forecast(crm)['months'][-1]['mrr']:,.0f}/month"
+          f"  ← run: python brand_outreach.py forecast")
+    print()
+
+
+def cmd_forecast(args):
+    forecast = load_forecast()
+    print(f"\n  MRR FORECAST — {datetime.now().strftime('%B %d, %Y')}")
+    print(f"  {'─'*62}")
+    print(f"  Current MRR:      ${forecast['current_mrr']:>10,.0f}")
+    print(f"  Take rate:        {forecast['take_rate']:>10.1%}  (MRR / est. GMV of won deals)")
+    print(f"\n  {'Month':<8} {'Through':<12} {'New MRR':>10} {'MRR':>10}   {'10th–90th pct':>22}")
+    print(f"  {'─'*8} {'─'*12} {'─'*10} {'─'*10}   {'─'*22}")
+    for m in forecast["months"]:
+        band = f"${m['low']:,.0f} – ${m['high']:,.0f}"
+        print(f"  {m['month']:<8} {m['through']:<12} ${m['new_mrr']:>9,.0f} ${m['mrr']:>9,.0f}   {band:>22}")
+    print(f"\n  {'Stage':<20} {'Close rate':>10} {'Default':>8} {'Won/closed':>11} {'Median days':>12}")
+    print(f"  {'─'*20} {'─'*10} {'─'*8} {'─'*11} {'─'*12}")
+    for stage, s in forecast["stages"].items():
+        median = s["median_days"] if s["median_days"] is not None else "—"
+        print(f"  {STAGE_LABELS[stage]:<20} {s['p_win']:>10.0%} {s['prior']:>8.0%} "
+              f"{str(s['wins']) + '/' + str(s['resolved']):>11} {median:>12}")
     print()
 
 
 def cmd_dashboard(args):
-    crm = _load()
+    crm       = _load()
     prospects = crm.get("prospects", {})
-    deals     = crm.get("deals", [])
+    stats     = crm["stats"]
 
-    won = [p for p in prospects.values() if p.get("stage") == "closed_won"]
-    mrr = sum(p.get("monthly_value", 0) for p in won)
+    won = stats["stages"]["closed_won"]
+    mrr = won["monthly_value"]
     arr = mrr * 12
 
-    managed = [p for p in won if p.get("deal_type") == "managed"]
-    saas    = [p for p in won if p.get("deal_type") == "saas"]
-
-    active     = [p for p in prospects.values() if p.get("stage") not in ("closed_won", "closed_lost")]
-    stale_cut  = (datetime.now() - timedelta(days=7)).isoformat()
-    stale      = [p for p in active if p.get("last_activity", "") < stale_cut]
+    active = _stage_total(stats, OPEN_STAGES)
+    due    = due_followups()
 
     print(f"\n  SALES DASHBOARD — {datetime.now().strftime('%B %d, %Y')}")
     print(f"  {'─'*50}")
     print(f"  MRR:              ${mrr:>10,.0f}")
     print(f"  ARR:              ${arr:>10,.0f}")
-    print(f"  Closed deals:     {len(won):>10}")
-    print(f"    Managed:        {len(managed):>10}")
-    print(f"    SaaS:           {len(saas):>10}")
-    print(f"  Active pipeline:  {len(active):>10}")
-    print(f"  Stale (>7d):      {len(stale):>10}  ← follow up today")
+    print(f"  Closed deals:     {won['count']:>10}")
+    print(f"    Managed:        {won['deal_types'].get('managed', 0):>10}")
+    print(f"    SaaS:           {won['deal_types'].get('saas', 0):>10}")
+    print(f"  Active pipeline:  {active:>10}")
+    print(f"  Weighted value:   ${weighted_pipeline(stats):>10,.0f}/mo")
+    print(f"  Follow-ups due:   {len(due):>10}  ← run: python brand_outreach.py today")
     print(f"  {'─'*50}")
 
     # Conversion funnel
-    contacted = [p for p in prospects.values() if p.get("stage") not in ("identified", "researched")]
-    replied   = [p for p in prospects.values() if p.get("stage") not in ("identified", "researched", "contacted")]
-    demos     = [p for p in prospects.values() if p.get("stage") in ("demo_done", "proposal_sent", "negotiating", "closed_won")]
+    contacted = _stage_total(stats, STAGES[STAGE_RANK["contacted"]:])
+    replied   = _stage_total(stats, STAGES[STAGE_RANK["replied"]:])
+    demos     = _stage_total(stats, ("demo_done", "proposal_sent", "negotiating", "closed_won"))
 
     if contacted:
         print(f"\n  CONVERSION FUNNEL")
-        print(f"  Contacted:        {len(contacted)}")
-        print(f"  Replied:          {len(replied)}  ({len(replied)/len(contacted)*100:.0f}% of contacted)")
-        print(f"  Demos:            {len(demos)}  ({len(demos)/len(contacted)*100:.0f}% of contacted)")
-        print(f"  Closed:           {len(won)}  ({len(won)/len(contacted)*100:.0f}% of contacted)")
+        print(f"  Contacted:        {contacted}")
+        print(f"  Replied:          {replied}  ({replied/contacted*100:.0f}% of contacted)")
+        print(f"  Demos:            {demos}  ({demos/contacted*100:.0f}% of contacted)")
+        print(f"  Closed:           {won['count']}  ({won['count']/contacted*100:.0f}% of contacted)")
 
-    if stale:
+    if due:
         print(f"\n  FOLLOW UP TODAY:")
-        for p in stale[:5]:
+        for pid, _ in due[:5]:
+            p    = prospects[pid]
             days = (datetime.now() - datetime.fromisoformat(p["last_activity"])).days
             print(f"  ▶  {p['brand']:<28} {days}d since last touch — {STAGE_LABELS.get(p['stage'], p['stage'])}")
     print()
 
 
+def cmd_today(args):
+    followups = load_followups()
+    due = due_followups(limit=args.limit, followups=followups)
+    if not due:
+        print("\n  Nothing due — pipeline is up to date.\n")
+        return
+    cards = followups["cards"]
+    print(f"\n  FOLLOW-UPS DUE — {datetime.now().strftime('%B %d, %Y')}\n")
+    print(f"  {'Brand':<28} {'Stage':<20} {'Overdue':>8}  Next action")
+    print(f"  {'─'*28} {'─'*20} {'─'*8}  {'─'*24}")
+    for pid, when in due:
+        p       = cards[pid]
+        overdue = (datetime.now() - datetime.fromisoformat(when)).days
+        print(f"  {p['brand']:<28} {STAGE_LABELS.get(p['stage'], p['stage']):<20} {overdue:>7}d  {NEXT_ACTIONS[p['stage']]}")
+    print()
+
+
 def cmd_prospects(args):
     crm = _load()
     prospects = list(crm.get("prospects", {}).values())
@@ -256,29 +989,62 @@ def cmd_prospects(args):
     print(f"\n  ALL PROSPECTS ({len(prospects)})\n")
     print(f"  {'Brand':<28} {'Niche':<14} {'Stage':<20} {'GMV/mo':>10}")
     print(f"  {'─'*28} {'─'*14} {'─'*20} {'─'*10}")
-    for p in sorted(prospects, key=lambda x: STAGES.index(x.get("stage","identified")) if x.get("stage") in STAGES else 99, reverse=True):
+    for p in sorted(prospects, key=lambda x: STAGE_RANK.get(x.get("stage"), 99), reverse=True):
         print(f"  {p['brand']:<28} {p.get('niche','?'):<14} {STAGE_LABELS.get(p['stage'],p['stage']):<20} ${p.get('est_monthly_gmv',0):>9,.0f}")
     print()
 
 
+def cmd_history(args):
+    crm = _load()
+    print("\nProspects:")
+    for i, (pid, p) in enumerate(crm["prospects"].items(), 1):
+        print(f"  {i}. {p['brand']} ({p.get('touch_count', 0)} touches)")
+    choice   = input("\nSelect number: ").strip()
+    pid      = list(crm["prospects"].keys())[int(choice) - 1]
+    prospect = crm["prospects"][pid]
+
+    print(f"\n  {prospect['brand']} — {STAGE_LABELS.get(prospect['stage'], prospect['stage'])}")
+    print(f"  {'─'*60}")
+    touches = load_touchpoints(pid)
+    if not touches:
+        print("  No touchpoints logged yet.")
+    for t in touches:
+        print(f"  {t['date'][:16].replace('T', ' ')}  {t['channel']:<9} {t['outcome']:<15} {t['message']}")
+    print()
+
+
 def main():
     parser = argparse.ArgumentParser(description="TikTok Shop OS — Brand CRM")
     sub    = parser.add_subparsers(dest="cmd")
     sub.add_parser("add",       help="Add a prospect")
+    imp = sub.add_parser("import", help="Bulk import prospects from CSV / NDJSON")
+    imp.add_argument("file", help="CSV or .ndjson file with a brand column")
+    imp.add_argument("--enrich", metavar="MODULE:FUNCTION",
+                     help="Enrich added/updated prospects with a callable returning field updates")
+    imp.add_argument("--workers", type=int, default=ENRICH_WORKERS,
+                     help=f"Enrichment threads (default {ENRICH_WORKERS})")
     sub.add_parser("pipeline",  help="View pipeline")
     sub.add_parser("touch",     help="Log a touchpoint")
     sub.add_parser("convert",   help="Advance stage")
     sub.add_parser("dashboard", help="Revenue summary")
+    sub.add_parser("forecast",  help="Expected MRR over the next quarter")
     sub.add_parser("prospects", help="List all")
+    sub.add_parser("history",   help="One prospect's touchpoints")
+    today = sub.add_parser("today", help="Follow-ups due now")
+    today.add_argument("--limit", type=int, default=20, help="Show at most N (default 20)")
     args = parser.parse_args()
 
     dispatch = {
         "add":       cmd_add,
+        "import":    cmd_import,
         "pipeline":  cmd_pipeline,
         "touch":     cmd_touch,
         "convert":   cmd_convert,
         "dashboard": cmd_dashboard,
+        "forecast":  cmd_forecast,
         "prospects": cmd_prospects,
+        "today":     cmd_today,
+        "history":   cmd_history,
     }
 
     if args.cmd in dispatch:
@@ -11,16 +11,26 @@ Usage:
     python content_scheduler.py schedule   # Show upcoming scheduled posts
     python content_scheduler.py log        # Log performance for a posted video
     python content_scheduler.py report     # Weekly performance report
+    python content_scheduler.py cube       # Slice/dice performance by framework, niche, time
+    python content_scheduler.py calibrate  # Fit day/hour multipliers from your own metrics
+    python content_scheduler.py reestimate # Re-estimate earnings for every posted video
+    python content_scheduler.py dispatch   # Run the posting dispatcher (posts videos when due)
 """
 
 import argparse
+import asyncio
+import heapq
+import importlib
 import json
 import os
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+import affiliate_tracker
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -28,6 +38,9 @@ from typing import Optional
 DATA_DIR = Path(__file__).parent / "data"
 QUEUE_FILE = DATA_DIR / "content_queue.json"
 POSTED_FILE = DATA_DIR / "posted_videos.json"
+CUBE_FILE = DATA_DIR / "content_cube.json"
+CALIBRATION_FILE = DATA_DIR / "calibration.json"
+UPLOAD_STUB_LOG = DATA_DIR / "upload_stub_log.json"
 
 # Best posting windows in your local timezone (24h format)
 POSTING_WINDOWS = [
@@ -53,6 +66,19 @@ DOW_MULTIPLIERS = {
     5: 0.95,  # Saturday
     6: 1.12,  # Sunday
 }
+# The same, rescaled to average 1.0: the scale fitted multipliers are on, so
+# an uncalibrated forecast neither gains nor loses views overall
+DOW_DEFAULTS = {d: m * len(DOW_MULTIPLIERS) / sum(DOW_MULTIPLIERS.values())
+                for d, m in DOW_MULTIPLIERS.items()}
+
+# Pseudo-video count that pulls fitted multipliers toward the defaults above.
+# A weekday/hour with this many videos is weighted half data, half default.
+CALIBRATION_PRIOR_WEIGHT = 20
+
+# Posting dispatcher: how often to check the queue file for edits while idle,
+# and how long to wait before retrying a failed upload (seconds)
+DISPATCH_POLL_SECONDS = 5.0
+DISPATCH_RETRY_SECONDS = 300.0
 
 VIDEO_FRAMEWORKS = [
     "30-Day Trial",
@@ -67,6 +93,14 @@ VIDEO_FRAMEWORKS = [
     "Comparison",
 ]
 
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Dimensions and measures of the pre-aggregated performance cube. Each cell holds
+# the summed measures for one combination of dimension values.
+CUBE_DIMENSIONS = ["framework", "niche", "product", "weekday", "window", "hook"]
+CUBE_MEASURES = ["videos", "views", "link_clicks", "earnings_usd"]
+CUBE_KEY_SEP = "\x1f"  # joins dimension values into a cell key
+
 # ---------------------------------------------------------------------------
 # Data helpers
 # ---------------------------------------------------------------------------
@@ -102,14 +136,62 @@ def load_posted() -> list:
 def save_posted(posted: list) -> None:
     save_json(POSTED_FILE, posted)
 
+
+def load_cube() -> dict:
+    """Load the performance cube, rebuilding it from posted videos if missing or stale."""
+    cube = load_json(CUBE_FILE, None)
+    if cube is None or cube.get("dimensions") != CUBE_DIMENSIONS:
+        cube = rebuild_cube()
+    return cube
+
+
+def save_cube(cube: dict) -> None:
+    save_json(CUBE_FILE, cube)
+
+
+_calibration = None
+_rate_lookup = None
+
+
+def load_calibration(reload: bool = False) -> dict:
+    """Return the fitted calibration (read once per process). Empty means defaults."""
+    global _calibration
+    if _calibration is None or reload:
+        _calibration = load_json(CALIBRATION_FILE, {})
+    return _calibration
+
+
+def save_calibration(calibration: dict) -> None:
+    global _calibration
+    save_json(CALIBRATION_FILE, calibration)
+    _calibration = calibration
+
 # ---------------------------------------------------------------------------
 # Core logic
 # ---------------------------------------------------------------------------
 
+def day_multiplier(weekday: int) -> float:
+    """Calibrated day-of-week multiplier, falling back to DOW_DEFAULTS."""
+    fitted = load_calibration().get("dow_multipliers", {})
+    return fitted.get(str(weekday), DOW_DEFAULTS.get(weekday, 1.0))
+
+
+def hour_multiplier(hour: int) -> float:
+    """Calibrated hour-of-day multiplier (1.0 until a calibration has been fitted)."""
+    return load_calibration().get("hour_multipliers", {}).get(str(hour), 1.0)
+
+
 def estimate_earnings(views: int, link_ctr: float = DEFAULT_LINK_CTR,
                        cvr: float = DEFAULT_CVR,
-                       avg_commission: float = DEFAULT_AVG_COMMISSION) -> dict:
-    """Estimate earnings from a video given its view count."""
+                       avg_commission: float = DEFAULT_AVG_COMMISSION,
+                       scheduled_for: Optional[datetime] = None) -> dict:
+    """
+    Estimate earnings from a video given its view count.
+    If scheduled_for is given, views is treated as a baseline forecast and
+    scaled by the calibrated day and hour multipliers for that slot.
+    """
+    if scheduled_for is not None:
+        views = views * day_multiplier(scheduled_for.weekday()) * hour_multiplier(scheduled_for.hour)
     clicks = int(views * link_ctr)
     conversions = clicks * cvr
     earnings = conversions * avg_commission
@@ -124,15 +206,19 @@ def estimate_earnings(views: int, link_ctr: float = DEFAULT_LINK_CTR,
 def suggest_post_time(target_date: Optional[datetime] = None) -> list:
     """Return suggested post times for a given date."""
     target = target_date or datetime.now()
-    multiplier = DOW_MULTIPLIERS.get(target.weekday(), 1.0)
+    multiplier = day_multiplier(target.weekday())
     suggestions = []
     for window in POSTING_WINDOWS:
         mid_hour = (window["start"] + window["end"]) // 2
-        post_time = target.replace(hour=mid_hour, minute=0, second=0, microsecond=0)
+        # Best calibrated hour in the window; ties (e.g. uncalibrated) go to the middle
+        best_hour = max(range(window["start"], window["end"]),
+                        key=lambda h: (hour_multiplier(h), -abs(h - mid_hour)))
+        post_time = target.replace(hour=best_hour, minute=0, second=0, microsecond=0)
         suggestions.append({
             "window": window["label"],
             "suggested_time": post_time.strftime("%Y-%m-%d %H:%M"),
             "day_multiplier": multiplier,
+            "hour_multiplier": hour_multiplier(best_hour),
         })
     return suggestions
 
@@ -145,6 +231,7 @@ def add_video_to_queue(
     scheduled_date: str,
     niche: str,
     hook: str,
+    account: str = "default",
 ) -> dict:
     """Add a new video to the content queue."""
     queue = load_queue()
@@ -155,6 +242,7 @@ def add_video_to_queue(
         "framework": framework,
         "niche": niche,
         "hook": hook,
+        "account": account,
         "affiliate_link_id": affiliate_link_id,
         "scheduled_date": scheduled_date,
         "status": "queued",
@@ -190,6 +278,7 @@ def mark_posted(video_id: str, tiktok_url: str = "") -> dict:
     posted.append(video)
     save_queue(queue)
     save_posted(posted)
+    update_cube([video])
     return video
 
 
@@ -211,10 +300,14 @@ def update_metrics(video_id: str, views: int, likes: int, comments: int,
     })
     # Override click-based estimate with actual link_clicks if available
     actual_link_ctr = link_clicks / views if views > 0 else DEFAULT_LINK_CTR
+    keys, cvr_col, commission_col = cached_rate_lookup()
+    row = keys.get((video.get("product") or "").strip().lower(), 0)
     video["earnings_estimate"] = estimate_earnings(
-        views, link_ctr=actual_link_ctr
+        views, link_ctr=actual_link_ctr,
+        cvr=cvr_col[row], avg_commission=commission_col[row],
     )
     save_posted(posted)
+    update_cube([video])
     return video
 
 
@@ -272,6 +365,400 @@ def weekly_report(weeks_back: int = 0) -> dict:
         "top_framework": best_framework,
     }
 
+# ---------------------------------------------------------------------------
+# Catalog earnings estimation
+# ---------------------------------------------------------------------------
+
+def build_rate_lookup() -> tuple:
+    """
+    Precompute the video → product join used for earnings estimates.
+
+    Returns (keys, cvr, avg_commission): keys maps a lower-cased affiliate
+    product ID or name to a row index into the two rate columns. Row 0 holds
+    DEFAULT_CVR / DEFAULT_AVG_COMMISSION for products with no tracked data.
+    """
+    keys = {}
+    cvr = [DEFAULT_CVR]
+    avg_commission = [DEFAULT_AVG_COMMISSION]
+    for pid, rates in affiliate_tracker.product_rate_table().items():
+        row = len(cvr)
+        cvr.append(rates["cvr"] if rates["cvr"] is not None else DEFAULT_CVR)
+        avg_commission.append(rates["avg_commission_usd"] or DEFAULT_AVG_COMMISSION)
+        keys[pid.strip().lower()] = row
+        keys.setdefault(rates["name"].strip().lower(), row)
+    return keys, cvr, avg_commission
+
+
+def _rate_sources_stamp() -> tuple:
+    """(mtime_ns, size) of each affiliate_tracker file the rate lookup reads."""
+    stamp = []
+    for path in (affiliate_tracker.PRODUCTS_FILE, affiliate_tracker.CLICKS_FILE,
+                 affiliate_tracker.SALES_FILE):
+        st = path.stat() if path.exists() else None
+        stamp.append((st.st_mtime_ns, st.st_size) if st else None)
+    return tuple(stamp)
+
+
+def cached_rate_lookup() -> tuple:
+    """
+    build_rate_lookup(), rebuilt only when the affiliate product, click or
+    sale files have changed since the last call in this process.
+    """
+    global _rate_lookup
+    stamp = _rate_sources_stamp()
+    if _rate_lookup is None or _rate_lookup[0] != stamp:
+        _rate_lookup = (stamp, build_rate_lookup())
+    return _rate_lookup[1]
+
+
+def estimate_catalog(lookup: Optional[tuple] = None) -> dict:
+    """
+    Re-estimate earnings for every posted video in one columnar pass, using
+    per-product CVR and commission from affiliate_tracker. Pass a prebuilt
+    lookup (see build_rate_lookup) to reuse it across calls.
+    """
+    posted = load_posted()
+    keys, cvr_col, commission_col = lookup or cached_rate_lookup()
+
+    rows = [keys.get((v.get("product") or "").strip().lower(), 0) for v in posted]
+    views = [v.get("metrics", {}).get("views", 0) for v in posted]
+    link_clicks = [v.get("metrics", {}).get("link_clicks", 0) for v in posted]
+
+    ctr = [lc / n if n > 0 else DEFAULT_LINK_CTR for lc, n in zip(link_clicks, views)]
+    clicks = [int(n * r) for n, r in zip(views, ctr)]
+    conversions = [c * cvr_col[r] for c, r in zip(clicks, rows)]
+    earnings = [x * commission_col[r] for x, r in zip(conversions, rows)]
+
+    for video, c, x, e in zip(posted, clicks, conversions, earnings):
+        video["earnings_estimate"] = {
+            "estimated_clicks": c,
+            "estimated_conversions": round(x, 2),
+            "estimated_earnings_usd": round(e, 2),
+            "epc": round(e / c, 4) if c > 0 else 0.0,
+        }
+    save_posted(posted)
+    update_cube(posted)
+
+    return {
+        "videos": len(posted),
+        "matched_products": sum(1 for r in rows if r),
+        "total_estimated_earnings_usd": round(sum(earnings), 2),
+    }
+
+# ---------------------------------------------------------------------------
+# Performance cube
+# ---------------------------------------------------------------------------
+
+def posting_window(hour: int) -> str:
+    """Return the POSTING_WINDOWS label containing an hour, or 'Off-Window'."""
+    for window in POSTING_WINDOWS:
+        if window["start"] <= hour < window["end"]:
+            return window["label"]
+    return "Off-Window"
+
+
+def _cube_coords(video: dict) -> list:
+    """Dimension values for a posted video, in CUBE_DIMENSIONS order."""
+    posted_at = datetime.fromisoformat(video["posted_at"])
+    return [
+        (video.get("framework") or "Unknown").strip(),
+        (video.get("niche") or "Unknown").strip(),
+        (video.get("product") or "Unknown").strip(),
+        WEEKDAY_NAMES[posted_at.weekday()],
+        posting_window(posted_at.hour),
+        (video.get("hook") or "Unknown").strip(),
+    ]
+
+
+def _cube_contribution(video: dict) -> list:
+    """Measures a single video adds to its cell, in CUBE_MEASURES order."""
+    metrics = video.get("metrics", {})
+    return [
+        1,
+        metrics.get("views", 0),
+        metrics.get("link_clicks", 0),
+        video.get("earnings_estimate", {}).get("estimated_earnings_usd", 0.0),
+    ]
+
+
+def _cube_apply(cube: dict, video: dict) -> None:
+    """Replace a video's previous contribution to the cube with its current one."""
+    cells = cube["cells"]
+    members = cube["members"]
+
+    previous = members.pop(video["id"], None)
+    if previous:
+        key, contribution = previous[0], previous[1:]
+        cell = cells[key]
+        for i, value in enumerate(contribution):
+            cell[i] -= value
+        if cell[0] <= 0:
+            del cells[key]
+
+    if not video.get("posted_at"):
+        return
+    key = CUBE_KEY_SEP.join(_cube_coords(video))
+    contribution = _cube_contribution(video)
+    cell = cells.setdefault(key, [0] * len(CUBE_MEASURES))
+    for i, value in enumerate(contribution):
+        cell[i] += value
+    members[video["id"]] = [key] + contribution
+
+
+def rebuild_cube() -> dict:
+    """Rebuild the performance cube from scratch over all posted videos."""
+    cube = {"dimensions": CUBE_DIMENSIONS, "cells": {}, "members": {}}
+    for video in load_posted():
+        _cube_apply(cube, video)
+    save_cube(cube)
+    return cube
+
+
+def update_cube(videos: list) -> None:
+    """Incrementally fold new or changed videos into the performance cube."""
+    cube = load_cube()
+    for video in videos:
+        _cube_apply(cube, video)
+    save_cube(cube)
+
+
+def query_cube(where: Optional[dict] = None, group_by: Optional[list] = None) -> list:
+    """
+    Slice the cube by `where` ({dimension: value or list of values}) and
+    aggregate the matching cells per `group_by` dimension combination.
+    Only pre-aggregated cells are scanned, never the posted videos themselves.
+    """
+    where = where or {}
+    group_by = group_by or []
+    for dim in list(where) + list(group_by):
+        if dim not in CUBE_DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dim}'. Choose from: {', '.join(CUBE_DIMENSIONS)}")
+
+    dim_index = {d: i for i, d in enumerate(CUBE_DIMENSIONS)}
+    filters = [
+        (dim_index[d], set(v) if isinstance(v, (list, tuple, set)) else {v})
+        for d, v in where.items()
+    ]
+    group_index = [dim_index[d] for d in group_by]
+
+    groups = {}
+    for key, cell in load_cube()["cells"].items():
+        coords = key.split(CUBE_KEY_SEP)
+        if any(coords[i] not in allowed for i, allowed in filters):
+            continue
+        totals = groups.setdefault(tuple(coords[i] for i in group_index), [0] * len(CUBE_MEASURES))
+        for i, value in enumerate(cell):
+            totals[i] += value
+
+    rows = []
+    for group, (videos, views, link_clicks, earnings) in groups.items():
+        row = dict(zip(group_by, group))
+        row.update({
+            "videos": videos,
+            "total_views": views,
+            "mean_views": round(views / videos, 0) if videos else 0,
+            "link_ctr_pct": round(link_clicks / views * 100, 3) if views > 0 else 0,
+            "mean_earnings_usd": round(earnings / videos, 2) if videos else 0,
+            "total_earnings_usd": round(earnings, 2),
+        })
+        rows.append(row)
+    rows.sort(key=lambda r: r["mean_views"], reverse=True)
+    return rows
+
+# ---------------------------------------------------------------------------
+# Calibration
+# ---------------------------------------------------------------------------
+
+def _shrunk_multipliers(buckets: list, defaults: list, overall_mean: float) -> dict:
+    """
+    Per-bucket multiplier = bucket mean views / overall mean views, shrunk toward
+    the default by CALIBRATION_PRIOR_WEIGHT pseudo-observations.
+
+    Observed ratios average 1.0 by construction, so the defaults are rescaled
+    to mean 1.0 first; otherwise sparse buckets would inherit the defaults'
+    overall level and inflate every estimate.
+    """
+    k = CALIBRATION_PRIOR_WEIGHT
+    default_mean = sum(defaults) / len(defaults)
+    defaults = [d / default_mean for d in defaults]
+    fitted = {}
+    for i, ((n, total), default) in enumerate(zip(buckets, defaults)):
+        observed = (total / n) / overall_mean if n and overall_mean else default
+        fitted[str(i)] = round((n * observed + k * default) / (n + k), 3)
+    return fitted
+
+
+def fit_calibration(full: bool = False) -> dict:
+    """
+    Fit day-of-week and hour-of-day multipliers from posted video views.
+
+    Sufficient statistics (count and view sum per weekday and per hour) are
+    kept in the calibration file together with each video's last contribution,
+    so a refit only adjusts the sums for videos whose views changed since the
+    previous fit. Pass full=True to discard the stored statistics first.
+    """
+    previous = load_calibration(reload=True)
+    stats = previous.get("stats") if not full else None
+    if not stats:
+        stats = {"dow": [[0, 0] for _ in range(7)],
+                 "hour": [[0, 0] for _ in range(24)],
+                 "contrib": {}}
+    dow, hour, contrib = stats["dow"], stats["hour"], stats["contrib"]
+
+    def apply(entry, sign):
+        d, h, views = entry
+        dow[d][0] += sign
+        dow[d][1] += sign * views
+        hour[h][0] += sign
+        hour[h][1] += sign * views
+
+    seen = set()
+    for video in load_posted():
+        views = video.get("metrics", {}).get("views", 0)
+        if not video.get("posted_at") or views <= 0:
+            continue
+        posted_at = datetime.fromisoformat(video["posted_at"])
+        entry = [posted_at.weekday(), posted_at.hour, views]
+        seen.add(video["id"])
+        old = contrib.get(video["id"])
+        if old == entry:
+            continue
+        if old:
+            apply(old, -1)
+        apply(entry, +1)
+        contrib[video["id"]] = entry
+    for vid in [v for v in contrib if v not in seen]:
+        apply(contrib.pop(vid), -1)
+
+    n_videos = sum(n for n, _ in dow)
+    overall_mean = sum(total for _, total in dow) / n_videos if n_videos else 0.0
+    hour_multipliers = _shrunk_multipliers(hour, [1.0] * 24, overall_mean)
+    window_weights = {
+        w["label"]: round(sum(hour_multipliers[str(h)] for h in range(w["start"], w["end"]))
+                          / (w["end"] - w["start"]), 3)
+        for w in POSTING_WINDOWS
+    }
+
+    calibration = {
+        "version": previous.get("version", 0) + 1,
+        "fitted_at": datetime.now().isoformat(),
+        "videos_used": n_videos,
+        "prior_weight": CALIBRATION_PRIOR_WEIGHT,
+        "dow_multipliers": _shrunk_multipliers(dow, [DOW_MULTIPLIERS[d] for d in range(7)], overall_mean),
+        "hour_multipliers": hour_multipliers,
+        "window_weights": window_weights,
+        "stats": stats,
+    }
+    save_calibration(calibration)
+    return calibration
+
+# ---------------------------------------------------------------------------
+# Posting dispatcher
+# ---------------------------------------------------------------------------
+
+async def stub_uploader(video: dict) -> str:
+    """Local stand-in for a TikTok uploader: logs the upload, returns a fake URL."""
+    await asyncio.sleep(0)
+    log = load_json(UPLOAD_STUB_LOG, [])
+    log.append({"video_id": video["id"], "account": video.get("account", "default"),
+                "uploaded_at": datetime.now().isoformat()})
+    save_json(UPLOAD_STUB_LOG, log)
+    return f"https://www.tiktok.com/@{video.get('account', 'default')}/video/{video['id']}"
+
+
+def load_uploader(spec: str):
+    """Resolve an uploader given as 'module:function' (an async callable taking a video)."""
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Uploader '{spec}' must be given as module:function.")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _due_timestamp(video: dict) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(video["scheduled_date"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def run_dispatcher(uploader=stub_uploader,
+                         poll_seconds: float = DISPATCH_POLL_SECONDS,
+                         retry_seconds: float = DISPATCH_RETRY_SECONDS,
+                         once: bool = False) -> None:
+    """
+    Post queued videos as their scheduled_date comes due.
+
+    Due times live in a min-heap; the loop sleeps until the earliest one (or
+    poll_seconds, to notice queue edits) and rebuilds the heap whenever the
+    queue file changes on disk. Uploads run concurrently across accounts but
+    one at a time per account. After a successful upload the video is moved
+    to posted via mark_posted. With once=True the dispatcher exits as soon as
+    nothing is due or in flight.
+    """
+    heap = []
+    videos = {}
+    in_flight = set()
+    retry_at = {}
+    account_locks = {}
+    tasks = set()
+    wake = asyncio.Event()
+    queue_mtime = None
+
+    def rearm() -> None:
+        heap.clear()
+        videos.clear()
+        for video in load_queue():
+            due = _due_timestamp(video)
+            if due is None or video["id"] in in_flight:
+                continue
+            videos[video["id"]] = video
+            heap.append((max(due, retry_at.get(video["id"], 0)), video["id"]))
+        heapq.heapify(heap)
+
+    async def dispatch(video: dict) -> None:
+        account = video.get("account", "default")
+        lock = account_locks.setdefault(account, asyncio.Lock())
+        async with lock:
+            try:
+                url = await uploader(video)
+            except Exception as exc:
+                retry_at[video["id"]] = time.time() + retry_seconds
+                print(f"✗ Upload failed for {video['id']} ({account}): {exc} — retrying in {retry_seconds:.0f}s")
+            else:
+                try:
+                    mark_posted(video["id"], url or "")
+                    print(f"✓ Posted {video['id']} ({account}) → {url}")
+                except ValueError:
+                    print(f"  {video['id']} left the queue during upload — not marked posted.")
+            finally:
+                in_flight.discard(video["id"])
+                wake.set()
+
+    while True:
+        mtime = QUEUE_FILE.stat().st_mtime_ns if QUEUE_FILE.exists() else None
+        if mtime != queue_mtime:
+            queue_mtime = mtime
+            rearm()
+
+        now = time.time()
+        while heap and heap[0][0] <= now:
+            _, video_id = heapq.heappop(heap)
+            in_flight.add(video_id)
+            task = asyncio.create_task(dispatch(videos.pop(video_id)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if once and not tasks and not in_flight:
+            return
+        timeout = min(poll_seconds, heap[0][0] - now) if heap else poll_seconds
+        wake.clear()
+        try:
+            await asyncio.wait_for(wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        if wake.is_set():
+            queue_mtime = None  # an upload finished or failed: re-read the queue
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -291,17 +778,20 @@ def cmd_add(_args) -> None:
     affiliate_link_id = input("Affiliate link ID (from link_manager): ").strip()
     niche = input("Niche (e.g., beauty, fitness, AI tools): ").strip()
     hook = input("Opening hook line: ").strip()
+    account = input("Posting account (leave blank for default): ").strip() or "default"
     scheduled_date = input("Scheduled date (YYYY-MM-DD HH:MM or leave blank for now): ").strip()
     if not scheduled_date:
         scheduled_date = datetime.now().isoformat()
 
-    video = add_video_to_queue(title, product, framework, affiliate_link_id, scheduled_date, niche, hook)
+    video = add_video_to_queue(title, product, framework, affiliate_link_id, scheduled_date,
+                               niche, hook, account)
     print(f"\n✓ Video added to queue: {video['id']}")
 
     suggestions = suggest_post_time(datetime.fromisoformat(scheduled_date[:10]))
     print("\nSuggested posting windows:")
     for s in suggestions:
-        print(f"  [{s['window']}] {s['suggested_time']}  (day multiplier: {s['day_multiplier']}x)")
+        print(f"  [{s['window']}] {s['suggested_time']}  "
+              f"(day multiplier: {s['day_multiplier']}x, hour: {s['hour_multiplier']}x)")
 
 
 def cmd_schedule(_args) -> None:
@@ -383,8 +873,77 @@ def cmd_report(_args) -> None:
     print(f"{'='*60}")
 
 
+def cmd_cube(_args) -> None:
+    """Group-by / filter view over the performance cube."""
+    print(f"\nDimensions: {', '.join(CUBE_DIMENSIONS)}")
+    group_input = input("Group by (comma-separated, default framework,niche): ").strip()
+    group_by = [d.strip() for d in group_input.split(",") if d.strip()] or ["framework", "niche"]
+    filter_input = input("Filter (e.g. niche=beauty,window=Prime Time — optional): ").strip()
+    where = {}
+    for clause in filter_input.split(","):
+        if "=" in clause:
+            dim, value = clause.split("=", 1)
+            where.setdefault(dim.strip(), []).append(value.strip())
+
+    rows = query_cube(where, group_by)
+    if not rows:
+        print("\nNo posted videos match. Mark videos as posted with `log` first.")
+        return
+
+    label_width = 40
+    print(f"\n{'='*(label_width + 60)}")
+    print(f"PERFORMANCE CUBE — by {' × '.join(group_by)}")
+    print(f"{'='*(label_width + 60)}")
+    print(f"{'Group':<{label_width}} {'Videos':<8} {'Mean Views':<12} {'CTR%':<8} {'Mean Earn':<12} {'Total Earn'}")
+    print(f"{'-'*(label_width + 60)}")
+    for r in rows:
+        label = " / ".join(str(r[d]) for d in group_by)[:label_width - 1]
+        print(
+            f"{label:<{label_width}} {r['videos']:<8} {r['mean_views']:<12,.0f} "
+            f"{r['link_ctr_pct']:<8} ${r['mean_earnings_usd']:<11,.2f} ${r['total_earnings_usd']:,.2f}"
+        )
+
+
+def cmd_reestimate(_args) -> None:
+    """Re-estimate earnings for all posted videos with per-product rates."""
+    result = estimate_catalog()
+    print(f"\n✓ Re-estimated {result['videos']} posted videos "
+          f"({result['matched_products']} matched to tracked affiliate products).")
+    print(f"  Total estimated earnings: ${result['total_estimated_earnings_usd']:,.2f}")
+
+
+def cmd_dispatch(args) -> None:
+    """Run the posting dispatcher until interrupted."""
+    uploader = load_uploader(args.uploader) if args.uploader else stub_uploader
+    print(f"Dispatcher running ({'one pass' if args.once else 'Ctrl+C to stop'}) — "
+          f"uploader: {args.uploader or 'local stub'}")
+    try:
+        asyncio.run(run_dispatcher(uploader, once=args.once))
+    except KeyboardInterrupt:
+        print("\nDispatcher stopped.")
+
+
+def cmd_calibrate(args) -> None:
+    """Refit day/hour multipliers from posted video metrics."""
+    cal = fit_calibration(full=args.full)
+    print(f"\n{'='*60}")
+    print(f"CALIBRATION v{cal['version']} — {cal['videos_used']} videos with metrics")
+    print(f"{'='*60}")
+    print(f"{'Day':<12} {'Default':<10} {'Fitted':<10} {'Videos'}")
+    print(f"{'-'*60}")
+    for d, name in enumerate(WEEKDAY_NAMES):
+        print(f"{name:<12} {DOW_DEFAULTS[d]:<10.3f} {cal['dow_multipliers'][str(d)]:<10} {cal['stats']['dow'][d][0]}")
+    print(f"\n{'Window':<12} {'Weight'}")
+    print(f"{'-'*60}")
+    for label, weight in cal["window_weights"].items():
+        print(f"{label:<12} {weight}")
+    if cal["videos_used"] < CALIBRATION_PRIOR_WEIGHT:
+        print(f"\nNote: fewer than {CALIBRATION_PRIOR_WEIGHT} videos — multipliers stay close to defaults.")
+
+
 def main():
     ensure_data_dir()
+    load_calibration()
 
     parser = argparse.ArgumentParser(
         description="TikTok Content Scheduler & Performance Tracker"
@@ -394,6 +953,13 @@ def main():
     subparsers.add_parser("schedule", help="View the upcoming content queue")
     subparsers.add_parser("log", help="Log performance metrics for a video")
     subparsers.add_parser("report", help="View weekly performance report")
+    subparsers.add_parser("cube", help="Performance by framework, niche, product, weekday, window, hook")
+    calibrate = subparsers.add_parser("calibrate", help="Fit day/hour multipliers from posted metrics")
+    calibrate.add_argument("--full", action="store_true", help="Refit from scratch instead of incrementally")
+    subparsers.add_parser("reestimate", help="Re-estimate earnings with per-product CVR and commission")
+    dispatch = subparsers.add_parser("dispatch", help="Post queued videos as they come due")
+    dispatch.add_argument("--uploader", help="Uploader as module:function (default: local stub)")
+    dispatch.add_argument("--once", action="store_true", help="Post everything due now, then exit")
 
     args = parser.parse_args()
 
@@ -402,6 +968,10 @@ def main():
         "schedule": cmd_schedule,
         "log": cmd_log,
         "report": cmd_report,
+        "cube": cmd_cube,
+        "calibrate": cmd_calibrate,
+        "reestimate": cmd_reestimate,
+        "dispatch": cmd_dispatch,
     }
 
     if args.command in commands:
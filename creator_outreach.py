@@ -8,24 +8,50 @@ Owner earns 20–30% of creator affiliate commissions as manager fee.
 
 Usage:
     python creator_outreach.py add-creator      # Add a creator to pipeline
+    python creator_outreach.py import-creators FILE  # Bulk import a CSV / NDJSON discovery list
     python creator_outreach.py update-status    # Update outreach status
     python creator_outreach.py add-note         # Add note to a creator record
+    python creator_outreach.py view             # One creator's profile and full note history
     python creator_outreach.py pipeline         # Full pipeline with status counts
+                                                #   (--status / --niche / --band to filter)
     python creator_outreach.py dashboard        # Active creators, products, revenue share
-    python creator_outreach.py top-creators     # Top earners by revenue generated
+    python creator_outreach.py funnel           # Stage conversion, time-in-stage, weekly cohorts
+    python creator_outreach.py search QUERY     # Full-text search of creator notes + brand touchpoints
+    python creator_outreach.py lookalikes HANDLE  # Most similar uncontacted creators
+    python creator_outreach.py payouts          # Monthly manager-fee statements from sale events
+    python creator_outreach.py top-creators     # Top creators by revenue, followers or owner cut
 """
 
 import argparse
+import heapq
 import json
-from datetime import datetime
+import math
+import re
+import zlib
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import affiliate_tracker
+import brand_outreach
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
 
 DATA_DIR = Path(__file__).parent / "data"
 CREATORS_FILE = DATA_DIR / "creators.json"
+INDEX_FILE = DATA_DIR / "creator_index.json"
+# Notes and status changes: append-only JSON-lines log + per-creator byte offsets
+NOTES_LOG_FILE = DATA_DIR / "creator_notes.log"
+NOTES_INDEX_FILE = DATA_DIR / "creator_notes_index.json"
+FUNNEL_FILE = DATA_DIR / "creator_funnel.json"
+# Full-text search index: meta.json, docs.log and per-term posting shards
+SEARCH_INDEX_DIR = DATA_DIR / "search_index"
+SEARCH_META_FILE = SEARCH_INDEX_DIR / "meta.json"
+SEARCH_DOCS_FILE = SEARCH_INDEX_DIR / "docs.log"
+SEARCH_PENDING_FILE = SEARCH_INDEX_DIR / "pending_platform_notes.log"
+FEATURES_FILE = DATA_DIR / "creator_features.json"
+PAYOUTS_DIR = DATA_DIR / "payouts"
 
 # Valid pipeline statuses in order
 STATUSES = [
@@ -37,6 +63,9 @@ STATUSES = [
     "churned",      # Stopped posting or dropped out
 ]
 
+# Funnel stages in order; reaching one implies every earlier one. Churned is an exit.
+FUNNEL_STAGES = STATUSES[:-1]
+
 # Owner's manager fee range (fraction of creator earnings)
 MANAGER_FEE_LOW  = 0.20   # 20%
 MANAGER_FEE_HIGH = 0.30   # 30%
@@ -56,6 +85,40 @@ NICHES = [
 
 CONTACT_PLATFORMS = ["TikTok DM", "Email", "Instagram DM", "Twitter DM", "Other"]
 
+# Follower bands used by the secondary index (band starts at the given count)
+FOLLOWER_BANDS = [
+    ("nano",  0),
+    ("micro", 10_000),
+    ("mid",   100_000),
+    ("macro", 500_000),
+]
+
+# Secondary indexes kept alongside creators.json: field -> value -> {creator_id: followers}
+INDEX_FIELDS = ["status", "niche", "band"]
+
+# Full-text search: BM25 parameters and words too common to index
+SEARCH_K1 = 1.2
+SEARCH_B = 0.75
+SEARCH_SHARDS = 256        # term shards; a query reads one shard per query term
+SEARCH_INDEX_VERSION = 3   # bump when the on-disk index layout changes
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "i",
+    "in", "is", "it", "of", "on", "or", "so", "that", "the", "their", "they",
+    "this", "to", "was", "we", "with", "you",
+}
+
+# Lookalike search: squared-distance penalty for a different niche, on top of the
+# standardised follower / revenue / engagement features
+LOOKALIKE_NICHE_PENALTY = 4.0
+FEATURES_VERSION = 1  # bump when the cached feature columns change
+
+# Sort keys accepted by get_top_creators
+RANK_KEYS = {
+    "revenue":   lambda c: c["monthly_revenue_usd"],
+    "followers": lambda c: c["followers"],
+    "owner_cut": lambda c: c["monthly_revenue_usd"] * c["manager_fee_pct"],
+}
+
 # ---------------------------------------------------------------------------
 # Data helpers  (same pattern as affiliate_tracker.py / financials.py)
 # ---------------------------------------------------------------------------
@@ -77,11 +140,131 @@ def save_json(path, data):
 
 
 def load_creators():
-    return load_json(CREATORS_FILE, {})
+    creators = load_json(CREATORS_FILE, {})
+    if any("notes" in c for c in creators.values()):
+        _migrate_inline_notes(creators)
+    return creators
 
 
-def save_creators(data):
+def save_creators(data, index=None):
+    """Save the creator store and its secondary indexes (rebuilt if not passed in)."""
     save_json(CREATORS_FILE, data)
+    save_index(index if index is not None else build_index(data))
+
+
+def _creators_stamp():
+    """(mtime_ns, size) of creators.json, used to detect an out-of-date index."""
+    if not CREATORS_FILE.exists():
+        return None
+    st = CREATORS_FILE.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_index(creators: dict = None):
+    """
+    Load the secondary indexes, rebuilding them if creators.json changed
+    underneath. Callers that already hold the store pass it in so a rebuild
+    does not load it a second time.
+    """
+    index = load_json(INDEX_FILE, None)
+    if index is None or index.get("source") != _creators_stamp():
+        index = build_index(creators if creators is not None else load_creators())
+        save_index(index)
+    return index
+
+
+def save_index(index):
+    index["source"] = _creators_stamp()
+    save_json(INDEX_FILE, index)
+
+
+def append_notes(events: list) -> list:
+    """
+    Append (creator_id, event) pairs to the notes log and return their byte
+    offsets. Only the log is written; the offset index catches up from the
+    log tail on its next read (see load_notes_index).
+    """
+    offsets = []
+    with open(NOTES_LOG_FILE, "ab") as f:
+        for cid, event in events:
+            offsets.append(f.tell())
+            line = json.dumps({"creator_id": cid, **event}, default=str) + "\n"
+            f.write(line.encode("utf-8"))
+    return offsets
+
+
+def load_notes_index(persist: bool = True) -> dict:
+    """
+    creator_id -> byte offsets into the notes log. The saved index records how
+    many log bytes it covers; lines appended since then are scanned from that
+    point and folded in, so each log line is indexed once. With persist=False
+    the caught-up index is returned without being saved.
+    """
+    index = load_json(NOTES_INDEX_FILE, None)
+    if not index or not isinstance(index.get("covered"), int):
+        index = {"covered": 0, "offsets": {}}
+    size = NOTES_LOG_FILE.stat().st_size if NOTES_LOG_FILE.exists() else 0
+    if size < index["covered"]:
+        index = {"covered": 0, "offsets": {}}  # log was replaced; reindex it
+    if size > index["covered"]:
+        offsets = index["offsets"]
+        pos = index["covered"]
+        with open(NOTES_LOG_FILE, "rb") as f:
+            f.seek(pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written line; pick it up next time
+                offsets.setdefault(json.loads(line)["creator_id"], []).append(pos)
+                pos += len(line)
+        index["covered"] = pos
+        if persist:
+            save_json(NOTES_INDEX_FILE, index)
+    return index["offsets"]
+
+
+def load_notes(cid: str) -> list:
+    """Read one creator's notes and status events from the log, oldest first."""
+    offsets = load_notes_index().get(cid, [])
+    notes = []
+    if not offsets:
+        return notes
+    with open(NOTES_LOG_FILE, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            notes.append(json.loads(f.readline()))
+    return notes
+
+
+_STATUS_NOTE = re.compile(r"^Status: (\w+) -> (\w+)(?: \| (.*))?$", re.DOTALL)
+
+
+def _migrate_inline_notes(creators):
+    """One-time move of inline `notes` lists into the notes log."""
+    events = []
+    for cid, c in creators.items():
+        for note in c.pop("notes", []):
+            match = _STATUS_NOTE.match(note["text"])
+            if match:
+                events.append((cid, {"timestamp": note["timestamp"], "type": "status",
+                                     "from": match.group(1), "to": match.group(2),
+                                     "text": note["text"]}))
+            else:
+                events.append((cid, {"timestamp": note["timestamp"], "type": "note",
+                                     "text": note["text"]}))
+    append_notes(events)
+    save_creators(creators)
+
+
+def load_funnel(creators):
+    """Load the funnel rollups, rebuilding them from the notes log if missing."""
+    funnel = load_json(FUNNEL_FILE, None)
+    if funnel is None:
+        funnel = rebuild_funnel(creators)
+    return funnel
+
+
+def save_funnel(funnel):
+    save_json(FUNNEL_FILE, funnel)
 
 # ---------------------------------------------------------------------------
 # Core logic
@@ -92,6 +275,67 @@ def _creator_id(handle: str) -> str:
     return handle.lstrip("@").lower().strip()
 
 
+def _follower_band(followers: int) -> str:
+    band = FOLLOWER_BANDS[0][0]
+    for name, floor in FOLLOWER_BANDS:
+        if followers >= floor:
+            band = name
+    return band
+
+
+def _index_keys(creator: dict) -> dict:
+    return {
+        "status": creator["status"],
+        "niche": creator["niche"],
+        "band": _follower_band(creator["followers"]),
+    }
+
+
+def _index_add(index: dict, creator: dict) -> None:
+    for field, value in _index_keys(creator).items():
+        index[field].setdefault(value, {})[creator["id"]] = creator["followers"]
+
+
+def _index_remove(index: dict, creator: dict) -> None:
+    for field, value in _index_keys(creator).items():
+        bucket = index[field].get(value, {})
+        bucket.pop(creator["id"], None)
+        if not bucket:
+            index[field].pop(value, None)
+
+
+def build_index(creators: dict) -> dict:
+    """Build status / niche / follower-band indexes from scratch."""
+    index = {field: {} for field in INDEX_FIELDS}
+    for c in creators.values():
+        _index_add(index, c)
+    return index
+
+
+def find_creator_ids(status: str = None, niche: str = None, band: str = None,
+                     index: dict = None) -> list:
+    """
+    Creator IDs matching every given filter, largest following first.
+    Works from the indexes alone; no creator records are loaded.
+    """
+    index = index or load_index()
+    filters = [(f, v) for f, v in (("status", status), ("niche", niche), ("band", band)) if v]
+    if not filters:
+        buckets = [{cid: n for b in index["status"].values() for cid, n in b.items()}]
+    else:
+        buckets = sorted((index[f].get(v, {}) for f, v in filters), key=len)
+    matches = buckets[0]
+    ids = [cid for cid in matches if all(cid in b for b in buckets[1:])]
+    ids.sort(key=lambda cid: matches[cid], reverse=True)
+    return ids
+
+
+def get_status_counts() -> dict:
+    """Creators per status, read from the status index only."""
+    index = load_index()
+    return {s: len(index["status"].get(s, {})) for s in STATUSES}
+
+
 def add_creator(
     handle: str,
     niche: str,
@@ -100,6 +344,7 @@ def add_creator(
     contact_value: str,
     platform_notes: str = "",
     manager_fee_pct: float = MANAGER_FEE_LOW,
+    engagement_rate: float = None,
 ) -> dict:
     """Add a new creator to the outreach pipeline."""
     creators = load_creators()
@@ -107,7 +352,22 @@ def add_creator(
     if cid in creators:
         raise ValueError(f"Creator @{cid} already exists. Use update-status or add-note.")
 
-    creator = {
+    index = load_index(creators)
+    creator = _new_creator(cid, niche, followers, contact_platform, contact_value,
+                           platform_notes, manager_fee_pct, engagement_rate)
+    creators[cid] = creator
+    _index_add(index, creator)
+    funnel = load_funnel(creators)
+    _funnel_reach(funnel, creator, "discovered")
+    save_creators(creators, index)
+    save_funnel(funnel)
+    _queue_platform_notes([creator])
+    return creator
+
+
+def _new_creator(cid, niche, followers, contact_platform, contact_value,
+                 platform_notes, manager_fee_pct, engagement_rate=None) -> dict:
+    return {
         "id": cid,
         "handle": f"@{cid}",
         "niche": niche,
@@ -115,17 +375,91 @@ def add_creator(
         "contact_platform": contact_platform,
         "contact_value": contact_value,
         "platform_notes": platform_notes,
+        "engagement_rate": engagement_rate,  # % of views that engage, if known
         "status": "discovered",
         "manager_fee_pct": round(manager_fee_pct, 4),
         "products": [],             # list of product_ids they're promoting
         "monthly_revenue_usd": 0.0, # creator's gross monthly affiliate rev
         "added_at": datetime.now().isoformat(),
         "status_updated_at": datetime.now().isoformat(),
-        "notes": [],
     }
-    creators[cid] = creator
-    save_creators(creators)
-    return creator
+
+
+def _parse_followers(value) -> int:
+    """Accept 45000, '45,000', '45K' or '1.2M'. ValueError for NaN or infinity."""
+    text = str(value or "0").strip().upper().replace(",", "")
+    scale = {"K": 1_000, "M": 1_000_000}.get(text[-1:], 1)
+    if scale > 1:
+        text = text[:-1]
+    number = float(text or 0)
+    if not math.isfinite(number):
+        raise ValueError(f"followers {value!r} is not a finite number")
+    return int(number * scale)
+
+
+def import_creators(path: str) -> dict:
+    """
+    Bulk-import a discovery list (CSV or NDJSON with handle, niche, followers,
+    contact_platform, contact_value, platform_notes, engagement_rate columns).
+
+    Handles are normalised with _creator_id and deduplicated against the store
+    and within the file (first occurrence wins). Existing creators only get
+    their follower count refreshed. Everything is written in a single save.
+    """
+    creators = load_creators()
+    index = load_index(creators)
+    funnel = load_funnel(creators)
+    seen = set()
+    added = []
+    counts = {"added": 0, "updated": 0, "unchanged": 0, "duplicates": 0, "skipped": 0}
+
+    for row in brand_outreach.iter_import_rows(Path(path)):
+        cid = _creator_id(row.get("handle") or "")
+        if not cid:
+            counts["skipped"] += 1
+            continue
+        if cid in seen:
+            counts["duplicates"] += 1
+            continue
+        seen.add(cid)
+        try:
+            followers = _parse_followers(row.get("followers"))
+            engagement = row.get("engagement_rate")
+            engagement = float(str(engagement).rstrip("%")) if engagement not in (None, "") else None
+        except ValueError:
+            counts["skipped"] += 1
+            continue
+
+        existing = creators.get(cid)
+        if existing is None:
+            creator = _new_creator(
+                cid,
+                (row.get("niche") or "Other").strip(),
+                followers,
+                (row.get("contact_platform") or "Other").strip(),
+                (row.get("contact_value") or "").strip(),
+                (row.get("platform_notes") or "").strip(),
+                MANAGER_FEE_LOW,
+                engagement,
+            )
+            creators[cid] = creator
+            _index_add(index, creator)
+            _funnel_reach(funnel, creator, "discovered")
+            added.append(creator)
+            counts["added"] += 1
+        elif followers and existing["followers"] != followers:
+            _index_remove(index, existing)
+            existing["followers"] = followers
+            _index_add(index, existing)
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+
+    if counts["added"] or counts["updated"]:
+        save_creators(creators, index)
+        save_funnel(funnel)
+        _queue_platform_notes(added)
+    return counts
 
 
 def update_status(handle: str, new_status: str, note: str = "") -> dict:
@@ -137,36 +471,97 @@ def update_status(handle: str, new_status: str, note: str = "") -> dict:
     if cid not in creators:
         raise KeyError(f"Creator @{cid} not found. Add them first with add-creator.")
 
+    index = load_index(creators)
+    funnel = load_funnel(creators)
+    _index_remove(index, creators[cid])
     old_status = creators[cid]["status"]
+    entered_at = creators[cid]["status_updated_at"]
     creators[cid]["status"] = new_status
     creators[cid]["status_updated_at"] = datetime.now().isoformat()
+    _funnel_transition(funnel, creators[cid], old_status, new_status,
+                       entered_at, creators[cid]["status_updated_at"])
 
-    # Auto-log the status change as a note
+    # Auto-log the status change to the notes log
     change_note = f"Status: {old_status} -> {new_status}"
     if note:
         change_note += f" | {note}"
-    creators[cid]["notes"].append({
+    append_notes([(cid, {
         "timestamp": datetime.now().isoformat(),
+        "type": "status",
+        "from": old_status,
+        "to": new_status,
         "text": change_note,
-    })
+    })])
 
-    save_creators(creators)
+    _index_add(index, creators[cid])
+    save_creators(creators, index)
+    save_funnel(funnel)
     return creators[cid]
 
 
-def add_note(handle: str, text: str) -> dict:
-    """Append a free-text note to a creator's record."""
-    creators = load_creators()
+def add_note(handle: str, text: str) -> int:
+    """
+    Append a free-text note to a creator's log. Returns how many log entries
+    (notes and status changes) the creator now has; counting only reads the
+    index, leaving the save to the next load_notes_index().
+    """
     cid = _creator_id(handle)
-    if cid not in creators:
+    if not any(cid in bucket for bucket in load_index()["status"].values()):
         raise KeyError(f"Creator @{cid} not found.")
 
-    creators[cid]["notes"].append({
+    append_notes([(cid, {
         "timestamp": datetime.now().isoformat(),
+        "type": "note",
         "text": text.strip(),
-    })
-    save_creators(creators)
-    return creators[cid]
+    })])
+    return len(load_notes_index(persist=False)[cid])
+
+
+def log_outreach(entries: list) -> None:
+    """
+    Record a batch of sent outreach messages, given as (handle, text) pairs,
+    in one commit. Creators still at discovered move to contacted with the
+    text as the status-change note; everyone else gets a plain note.
+    """
+    creators = load_creators()
+    index = load_index(creators)
+    funnel = load_funnel(creators)
+    now = datetime.now().isoformat()
+    events = []
+    for handle, text in entries:
+        cid = _creator_id(handle)
+        creator = creators.get(cid)
+        if creator is None:
+            continue
+        if creator["status"] != "discovered":
+            events.append((cid, {"timestamp": now, "type": "note", "text": text}))
+            continue
+        _index_remove(index, creator)
+        entered_at = creator["status_updated_at"]
+        creator["status"] = "contacted"
+        creator["status_updated_at"] = now
+        _funnel_transition(funnel, creator, "discovered", "contacted", entered_at, now)
+        _index_add(index, creator)
+        events.append((cid, {
+            "timestamp": now,
+            "type": "status",
+            "from": "discovered",
+            "to": "contacted",
+            "text": f"Status: discovered -> contacted | {text}",
+        }))
+    if any(event["type"] == "status" for _, event in events):
+        save_creators(creators, index)
+        save_funnel(funnel)
+    append_notes(events)
+
+
+def get_creator(handle: str) -> dict:
+    """Return one creator's record with their full note history attached."""
+    creators = load_creators()
+    cid = _creator_id(handle)
+    if cid not in creators:
+        raise KeyError(f"Creator @{cid} not found.")
+    return {**creators[cid], "notes": load_notes(cid)}
 
 
 def update_revenue(handle: str, monthly_revenue_usd: float,
@@ -180,26 +575,30 @@ def update_revenue(handle: str, monthly_revenue_usd: float,
     creators[cid]["monthly_revenue_usd"] = round(monthly_revenue_usd, 2)
     if products is not None:
         creators[cid]["products"] = products
-    save_creators(creators)
+    save_creators(creators, load_index(creators))
     return creators[cid]
 
 
-def get_pipeline() -> dict:
-    """Return all creators grouped by status."""
+def get_pipeline(statuses: list = None, niche: str = None, band: str = None) -> dict:
+    """
+    Return creators grouped by status (all statuses unless given), followers
+    descending. Bucket membership comes from the indexes, rebuilt from the
+    same loaded store if they are stale.
+    """
     creators = load_creators()
-    pipeline = {s: [] for s in STATUSES}
-    for c in creators.values():
-        pipeline[c["status"]].append(c)
-    # Sort each bucket by followers descending
-    for s in STATUSES:
-        pipeline[s].sort(key=lambda x: x["followers"], reverse=True)
+    index = load_index(creators)
+    pipeline = {}
+    for s in statuses or STATUSES:
+        ids = find_creator_ids(status=s, niche=niche, band=band, index=index)
+        pipeline[s] = [creators[cid] for cid in ids]
     return pipeline
 
 
 def get_dashboard() -> dict:
     """Aggregate active-creator stats and owner revenue share."""
     creators = load_creators()
-    active = [c for c in creators.values() if c["status"] == "active"]
+    index = load_index(creators)
+    active = [creators[cid] for cid in index["status"].get("active", {})]
 
     total_creator_rev = sum(c["monthly_revenue_usd"] for c in active)
     owner_low  = sum(c["monthly_revenue_usd"] * MANAGER_FEE_LOW  for c in active)
@@ -227,18 +626,20 @@ def get_dashboard() -> dict:
     }
 
 
-def get_top_creators(limit: int = 10) -> list:
-    """Return top creators ranked by monthly revenue."""
+def get_top_creators(limit: int = 10, sort_by: str = "revenue", offset: int = 0) -> list:
+    """
+    Return one page of creators ranked by revenue, followers or owner_cut.
+    Only offset+limit candidates are kept in a bounded heap, so a page costs
+    O(n log k) instead of a full sort; ties keep insertion order.
+    """
+    if sort_by not in RANK_KEYS:
+        raise ValueError(f"Invalid sort '{sort_by}'. Choose from: {', '.join(RANK_KEYS)}")
     creators = load_creators()
-    ranked = sorted(
-        creators.values(),
-        key=lambda c: c["monthly_revenue_usd"],
-        reverse=True,
-    )
+    ranked = heapq.nlargest(offset + limit, creators.values(), key=RANK_KEYS[sort_by])
     results = []
-    for c in ranked[:limit]:
+    for rank, c in enumerate(ranked[offset:], start=offset + 1):
         results.append({
-            "rank": ranked.index(c) + 1,
+            "rank": rank,
             "handle": c["handle"],
             "status": c["status"],
             "niche": c["niche"],
@@ -246,9 +647,555 @@ def get_top_creators(limit: int = 10) -> list:
             "monthly_revenue_usd": c["monthly_revenue_usd"],
             "owner_cut_low":  round(c["monthly_revenue_usd"] * MANAGER_FEE_LOW,  2),
             "owner_cut_high": round(c["monthly_revenue_usd"] * MANAGER_FEE_HIGH, 2),
+            "owner_cut": round(c["monthly_revenue_usd"] * c["manager_fee_pct"], 2),
         })
     return results
 
+# ---------------------------------------------------------------------------
+# Funnel analytics
+# ---------------------------------------------------------------------------
+# Rollups in creator_funnel.json, updated on every status change:
+#   entered[stage]                 creators that ever reached the stage
+#   transitions[from][to]          status moves
+#   time_in_stage[stage][hours]    histogram of whole hours spent before leaving
+#   cohorts[week][stage]           creators added that ISO week who reached the stage
+# Each creator's "stages_reached" list keeps the counts idempotent.
+
+def _week_key(iso_ts: str) -> str:
+    year, week, _ = datetime.fromisoformat(iso_ts).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _funnel_reach(funnel: dict, creator: dict, status: str) -> None:
+    """Count `status` (and every earlier funnel stage) as reached, once per creator."""
+    if status in FUNNEL_STAGES:
+        stages = FUNNEL_STAGES[:FUNNEL_STAGES.index(status) + 1]
+    else:
+        stages = [status]
+    reached = creator.setdefault("stages_reached", [])
+    cohort = funnel["cohorts"].setdefault(_week_key(creator["added_at"]), {})
+    for stage in stages:
+        if stage not in reached:
+            reached.append(stage)
+            funnel["entered"][stage] = funnel["entered"].get(stage, 0) + 1
+            cohort[stage] = cohort.get(stage, 0) + 1
+
+
+def _funnel_transition(funnel: dict, creator: dict, old_status: str, new_status: str,
+                       entered_at: str, changed_at: str) -> None:
+    moves = funnel["transitions"].setdefault(old_status, {})
+    moves[new_status] = moves.get(new_status, 0) + 1
+    elapsed = datetime.fromisoformat(changed_at) - datetime.fromisoformat(entered_at)
+    hours = str(max(0, round(elapsed.total_seconds() / 3600)))
+    durations = funnel["time_in_stage"].setdefault(old_status, {})
+    durations[hours] = durations.get(hours, 0) + 1
+    _funnel_reach(funnel, creator, new_status)
+
+
+def rebuild_funnel(creators: dict) -> dict:
+    """
+    Rebuild the rollups from structured status events in the notes log.
+    Only needed once (or after deleting creator_funnel.json); sets each
+    creator's stages_reached in place, so callers must save the store.
+    """
+    funnel = {"entered": {}, "transitions": {}, "time_in_stage": {}, "cohorts": {}}
+    for c in creators.values():
+        c["stages_reached"] = []
+        _funnel_reach(funnel, c, "discovered")
+    entered_at = {cid: c["added_at"] for cid, c in creators.items()}
+
+    if NOTES_LOG_FILE.exists():
+        with open(NOTES_LOG_FILE, encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                cid = event["creator_id"]
+                if event.get("type") != "status" or cid not in creators:
+                    continue
+                _funnel_transition(funnel, creators[cid], event["from"], event["to"],
+                                   entered_at[cid], event["timestamp"])
+                entered_at[cid] = event["timestamp"]
+
+    # Creators whose history predates the log still count for their current stage
+    for c in creators.values():
+        _funnel_reach(funnel, c, c["status"])
+    return funnel
+
+
+def _median_hours(histogram: dict):
+    total = sum(histogram.values())
+    running = 0
+    for hours in sorted(histogram, key=int):
+        running += histogram[hours]
+        if running * 2 >= total:
+            return int(hours)
+    return None
+
+
+def get_funnel_report(weeks: int = 8) -> dict:
+    """Stage conversion, median time-in-stage and weekly cohorts, from the rollups only."""
+    funnel = load_json(FUNNEL_FILE, None)
+    if funnel is None:
+        creators = load_creators()
+        funnel = rebuild_funnel(creators)
+        save_creators(creators, load_index(creators))
+        save_funnel(funnel)
+
+    entered = funnel["entered"]
+    stages = []
+    for i, stage in enumerate(FUNNEL_STAGES):
+        next_stage = FUNNEL_STAGES[i + 1] if i + 1 < len(FUNNEL_STAGES) else None
+        count = entered.get(stage, 0)
+        stages.append({
+            "stage": stage,
+            "entered": count,
+            "next_stage": next_stage,
+            "conversion_pct": (round(entered.get(next_stage, 0) / count * 100, 1)
+                               if next_stage and count else None),
+            "median_hours_in_stage": _median_hours(funnel["time_in_stage"].get(stage, {})),
+            "churned_from": funnel["transitions"].get(stage, {}).get("churned", 0),
+        })
+
+    cohorts = []
+    for week, reached in sorted(funnel["cohorts"].items())[-weeks:]:
+        cohorts.append({"week": week, **{s: reached.get(s, 0) for s in FUNNEL_STAGES}})
+
+    return {"stages": stages, "churned": entered.get("churned", 0), "cohorts": cohorts}
+
+# ---------------------------------------------------------------------------
+# Full-text search
+# ---------------------------------------------------------------------------
+# Inverted index over creator notes (notes log), creator platform_notes and
+# brand touchpoint messages (touchpoint log), kept in SEARCH_INDEX_DIR:
+#
+#   meta.json       document count, total length and how far each source was read
+#   docs.log        one JSON line per document; its byte offset is the doc id
+#   terms-XX.json   postings {term: {doc_id: [tf, doc_len]}} for terms hashing to XX
+#   platform-XX.json  {creator_id: [checksum, doc_id]} for platform_notes
+#   pending_platform_notes.log  platform_notes queued by the creator write paths
+#
+# All three logs are append-only, so the index only tracks how far it has read
+# each source: add_creator and import_creators queue new platform_notes instead
+# of the refresh rescanning creators.json. Notes or touchpoints still stored
+# inline in a store that has not been migrated yet are re-indexed when their
+# checksum changes. A query reads meta.json, one shard per query term and the
+# top docs; a refresh rewrites only the shards it touched.
+
+def _tokenize(text: str) -> list:
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+
+def _index_shard(shards: dict, kind: str, key: str) -> dict:
+    """The `kind` shard holding `key`, loaded into `shards` on first use."""
+    path = SEARCH_INDEX_DIR / f"{kind}-{zlib.crc32(key.encode('utf-8')) % SEARCH_SHARDS:02x}.json"
+    if path not in shards:
+        shards[path] = load_json(path, {})
+    return shards[path]
+
+
+def _term_shard(shards: dict, term: str) -> dict:
+    """The postings shard holding `term`."""
+    return _index_shard(shards, "terms", term)
+
+
+def _read_doc(doc_id: str) -> dict:
+    with open(SEARCH_DOCS_FILE, "rb") as f:
+        f.seek(int(doc_id))
+        return json.loads(f.readline())
+
+
+def _index_doc(meta: dict, shards: dict, docs, text: str, info: dict,
+               keep_terms: bool = False) -> str:
+    """Append a document to docs.log and post its terms. Returns its doc id."""
+    terms = _tokenize(text)
+    counts = {}
+    for t in terms:
+        counts[t] = counts.get(t, 0) + 1
+    doc_id = str(docs.tell())
+    doc = {**info, "len": len(terms), "snippet": text[:160]}
+    if keep_terms:
+        doc["terms"] = list(counts)
+    docs.write((json.dumps(doc, default=str) + "\n").encode("utf-8"))
+    for t, tf in counts.items():
+        _term_shard(shards, t).setdefault(t, {})[doc_id] = [tf, len(terms)]
+    meta["n_docs"] += 1
+    meta["total_len"] += len(terms)
+    return doc_id
+
+
+def _unindex_doc(meta: dict, shards: dict, docs, doc_id: str) -> None:
+    """Remove a (keep_terms) document's postings; its docs.log line is left behind."""
+    docs.flush()
+    doc = _read_doc(doc_id)
+    for t in doc.get("terms", []):
+        shard = _term_shard(shards, t)
+        postings = shard.get(t, {})
+        postings.pop(doc_id, None)
+        if not postings:
+            shard.pop(t, None)
+    meta["n_docs"] -= 1
+    meta["total_len"] -= doc["len"]
+
+
+def _replace_doc(meta: dict, shards: dict, docs, entries: dict, key: str,
+                 text: str, info: dict) -> None:
+    """
+    Point entries[key] ([checksum, doc_id]) at a document for `text`,
+    re-indexing only if the text changed since it was last indexed.
+    """
+    checksum = zlib.crc32(text.encode("utf-8"))
+    entry = entries.get(key)
+    if entry and entry[0] == checksum:
+        return
+    if entry and entry[1] is not None:
+        _unindex_doc(meta, shards, docs, entry[1])
+    doc_id = _index_doc(meta, shards, docs, text, info, keep_terms=True) if text else None
+    entries[key] = [checksum, doc_id]
+
+
+def _sync_replaceable(meta: dict, shards: dict, docs, prefix: str, current: dict) -> None:
+    """
+    Bring the re-indexable documents under `prefix` in line with `current`
+    ({key: (text, info)}): changed texts are re-indexed, vanished keys dropped.
+    """
+    replaceable = meta["watermarks"]["replaceable"]
+    for key, (text, info) in current.items():
+        _replace_doc(meta, shards, docs, replaceable, prefix + key, text, info)
+    for key in [k for k in replaceable if k.startswith(prefix) and k[len(prefix):] not in current]:
+        doc_id = replaceable.pop(key)[1]
+        if doc_id is not None:
+            _unindex_doc(meta, shards, docs, doc_id)
+
+
+def _empty_search_meta() -> dict:
+    return {
+        "version": SEARCH_INDEX_VERSION, "n_docs": 0, "total_len": 0, "docs_size": 0,
+        "watermarks": {"notes_offset": 0, "touch_offset": 0, "platform_offset": None,
+                       "replaceable": {}},
+    }
+
+
+def _queue_platform_notes(creators: list) -> None:
+    """Queue new creators' platform_notes for the next search refresh."""
+    lines = [
+        json.dumps({"creator_id": c["id"], "text": c["platform_notes"], "ref": c["handle"],
+                    "date": c["added_at"][:10]}) + "\n"
+        for c in creators if c.get("platform_notes")
+    ]
+    if lines:
+        SEARCH_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        with open(SEARCH_PENDING_FILE, "ab") as f:
+            f.write("".join(lines).encode("utf-8"))
+
+
+def _index_platform_notes(meta: dict, shards: dict, docs, cid: str, text: str,
+                          ref: str, date: str) -> None:
+    _replace_doc(meta, shards, docs, _index_shard(shards, "platform", cid), cid, text,
+                 {"kind": "platform notes", "ref": ref, "date": date})
+
+
+def refresh_search_index() -> dict:
+    """
+    Bring the search index up to date with anything added since the last
+    refresh. Returns the index meta (document count, total length, watermarks).
+    Sources are only read, never migrated or rewritten.
+    """
+    SEARCH_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    meta = load_json(SEARCH_META_FILE, None)
+    docs_size = SEARCH_DOCS_FILE.stat().st_size if SEARCH_DOCS_FILE.exists() else 0
+    if (meta is None or meta.get("version") != SEARCH_INDEX_VERSION
+            or docs_size < meta["docs_size"]):
+        # Missing, from an older layout, or its docs.log was lost: start over
+        for pattern in ("terms-*.json", "platform-*.json"):
+            for path in SEARCH_INDEX_DIR.glob(pattern):
+                path.unlink()
+        (DATA_DIR / "search_index.json").unlink(missing_ok=True)
+        meta = _empty_search_meta()
+    marks = meta["watermarks"]
+    shards = {}
+    changed = False
+
+    with open(SEARCH_DOCS_FILE, "ab") as docs:
+        # Drop docs appended by a refresh that was interrupted before saving meta
+        docs.truncate(meta["docs_size"])
+        docs.seek(meta["docs_size"])
+
+        # Creator notes: read only the bytes appended since last time
+        if NOTES_LOG_FILE.exists():
+            with open(NOTES_LOG_FILE, "rb") as f:
+                f.seek(marks["notes_offset"])
+                offset = marks["notes_offset"]
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    event = json.loads(line)
+                    _index_doc(meta, shards, docs, event["text"], {
+                        "kind": "creator note", "ref": f"@{event['creator_id']}",
+                        "date": event["timestamp"][:10],
+                    })
+                    offset += len(line)
+                    changed = True
+                marks["notes_offset"] = offset
+
+        # Creator platform_notes: a new index takes every creator's once, then
+        # only what the write paths queued since
+        pending_size = SEARCH_PENDING_FILE.stat().st_size if SEARCH_PENDING_FILE.exists() else 0
+        creators = None
+        if marks["platform_offset"] is None:
+            creators = load_json(CREATORS_FILE, {})
+            for cid, c in creators.items():
+                _index_platform_notes(meta, shards, docs, cid, c.get("platform_notes") or "",
+                                      c["handle"], c["added_at"][:10])
+            marks["platform_offset"] = pending_size
+            changed = True
+        if pending_size > marks["platform_offset"]:
+            with open(SEARCH_PENDING_FILE, "rb") as f:
+                f.seek(marks["platform_offset"])
+                offset = marks["platform_offset"]
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    queued = json.loads(line)
+                    _index_platform_notes(meta, shards, docs, queued["creator_id"],
+                                          queued["text"], queued["ref"], queued["date"])
+                    offset += len(line)
+                    changed = True
+                marks["platform_offset"] = offset
+
+        # Notes still inline in a creators.json that predates the notes log:
+        # rescanned when the file changes, until a scan finds none (nothing
+        # writes inline notes any more)
+        if marks.get("inline_notes", True) and marks.get("creators_stamp") != _creators_stamp():
+            if creators is None:
+                creators = load_json(CREATORS_FILE, {})
+            inline = {
+                f"{cid}:{i}": (note["text"], {
+                    "kind": "creator note", "ref": f"@{cid}", "date": note["timestamp"][:10],
+                })
+                for cid, c in creators.items() for i, note in enumerate(c.get("notes", []))
+            }
+            _sync_replaceable(meta, shards, docs, "cn:", inline)
+            marks["inline_notes"] = bool(inline)
+            marks["creators_stamp"] = _creators_stamp()
+            changed = True
+
+        # Brand touchpoints still inline in an unmigrated CRM, then the bytes
+        # appended to the touchpoint log since last time
+        if marks.get("crm_stamp") != brand_outreach.crm_stamp():
+            crm = brand_outreach.read_crm()
+            _sync_replaceable(meta, shards, docs, "bt:", {
+                f"{pid}:{i}": (touch.get("message", ""), {
+                    "kind": "brand touchpoint", "ref": p["brand"],
+                    "date": touch.get("date", "")[:10],
+                })
+                for pid, p in crm.get("prospects", {}).items()
+                for i, touch in enumerate(p.get("touchpoints", []))
+            })
+            marks["crm_stamp"] = brand_outreach.crm_stamp()
+            changed = True
+        if brand_outreach.TOUCH_LOG_FILE.exists():
+            with open(brand_outreach.TOUCH_LOG_FILE, "rb") as f:
+                f.seek(marks["touch_offset"])
+                offset = marks["touch_offset"]
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    touch = json.loads(line)
+                    _index_doc(meta, shards, docs, touch.get("message", ""), {
+                        "kind": "brand touchpoint", "ref": touch["brand"],
+                        "date": touch.get("date", "")[:10],
+                    })
+                    offset += len(line)
+                    changed = True
+                marks["touch_offset"] = offset
+
+        meta["docs_size"] = docs.tell()
+
+    if changed:
+        for path, shard in shards.items():
+            save_json(path, shard)
+        save_json(SEARCH_META_FILE, meta)
+    return meta
+
+
+def search_notes(query: str, limit: int = 20) -> list:
+    """BM25-ranked search across creator notes, platform notes and brand touchpoints."""
+    meta = refresh_search_index()
+    n_docs = meta["n_docs"]
+    if not n_docs:
+        return []
+    avg_len = meta["total_len"] / n_docs
+
+    shards = {}
+    scores = {}
+    for term in set(_tokenize(query)):
+        postings = _term_shard(shards, term).get(term, {})
+        if not postings:
+            continue
+        idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+        for doc_id, (tf, doc_len) in postings.items():
+            norm = tf + SEARCH_K1 * (1 - SEARCH_B + SEARCH_B * doc_len / avg_len)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (SEARCH_K1 + 1) / norm
+
+    top = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+    return [{"score": round(score, 3), **{k: v for k, v in _read_doc(doc_id).items()
+                                          if k not in ("terms", "len")}}
+            for doc_id, score in top]
+
+# ---------------------------------------------------------------------------
+# Lookalike search
+# ---------------------------------------------------------------------------
+
+def _standardise(values: list) -> list:
+    """z-scores; missing values (None) become 0, i.e. the column mean."""
+    present = [v for v in values if v is not None]
+    if not present:
+        return [0.0] * len(values)
+    mean = sum(present) / len(present)
+    std = math.sqrt(sum((v - mean) ** 2 for v in present) / len(present)) or 1.0
+    return [round((v - mean) / std, 5) if v is not None else 0.0 for v in values]
+
+
+def load_feature_matrix() -> dict:
+    """
+    Column-oriented feature matrix over all creators, cached in
+    creator_features.json and rebuilt only when creators.json changes.
+    Distance columns: log followers, log revenue, engagement rate (all
+    standardised); raw_* columns are kept for display.
+    """
+    cached = load_json(FEATURES_FILE, None)
+    stamp = _creators_stamp()
+    if cached and cached.get("source") == stamp and cached.get("version") == FEATURES_VERSION:
+        return cached
+
+    creators = list(load_creators().values())
+    matrix = {
+        "version": FEATURES_VERSION,
+        "source": stamp,
+        "ids": [c["id"] for c in creators],
+        "niche": [c["niche"] for c in creators],
+        "status": [c["status"] for c in creators],
+        "raw_followers": [c["followers"] for c in creators],
+        "raw_engagement": [c.get("engagement_rate") for c in creators],
+        "followers": _standardise([math.log10(c["followers"] + 1) for c in creators]),
+        "revenue": _standardise([math.log1p(c["monthly_revenue_usd"]) for c in creators]),
+        "engagement": _standardise([c.get("engagement_rate") for c in creators]),
+    }
+    save_json(FEATURES_FILE, matrix)
+    return matrix
+
+
+def find_lookalikes(handle: str, k: int = 50, statuses: tuple = ("discovered",)) -> list:
+    """
+    The k creators (in `statuses`, uncontacted by default) nearest to `handle`
+    by squared Euclidean distance over the cached feature columns, plus
+    LOOKALIKE_NICHE_PENALTY when the niche differs.
+    """
+    m = load_feature_matrix()
+    cid = _creator_id(handle)
+    try:
+        q = m["ids"].index(cid)
+    except ValueError:
+        raise KeyError(f"Creator @{cid} not found.")
+
+    qf, qr, qe, qn = m["followers"][q], m["revenue"][q], m["engagement"][q], m["niche"][q]
+    distances = [
+        (f - qf) ** 2 + (r - qr) ** 2 + (e - qe) ** 2 + (LOOKALIKE_NICHE_PENALTY if n != qn else 0.0)
+        for f, r, e, n in zip(m["followers"], m["revenue"], m["engagement"], m["niche"])
+    ]
+    wanted = set(statuses)
+    candidates = (i for i, st in enumerate(m["status"]) if st in wanted and i != q)
+    nearest = heapq.nsmallest(k, candidates, key=distances.__getitem__)
+
+    return [{
+        "handle": f"@{m['ids'][i]}",
+        "niche": m["niche"][i],
+        "followers": m["raw_followers"][i],
+        "engagement_rate": m["raw_engagement"][i],
+        "status": m["status"][i],
+        "distance": round(math.sqrt(distances[i]), 3),
+    } for i in nearest]
+
+# ---------------------------------------------------------------------------
+# Payouts
+# ---------------------------------------------------------------------------
+
+def _previous_month() -> str:
+    return (datetime.now().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+
+def compute_payouts(period: str, sync_revenue: bool = False) -> dict:
+    """
+    Build manager-fee statements for one month ("YYYY-MM") from sale events.
+
+    Sales from affiliate_tracker's log are hash-joined to creators through a
+    product_id -> creator map built from each creator's `products` list, in a
+    single pass over the log. A product listed by more than one creator can't
+    be attributed and is reported separately. The statement is written to
+    data/payouts/<period>.json; with sync_revenue the period's commission also
+    becomes each creator's monthly_revenue_usd.
+    """
+    datetime.strptime(period, "%Y-%m")  # validate
+    creators = load_creators()
+    owners = {}
+    for c in creators.values():
+        for pid in c.get("products", []):
+            owners.setdefault(pid, []).append(c["id"])
+
+    earned = {}
+    unattributed = {"sales": 0, "commission_usd": 0.0, "products": set()}
+    for sale in affiliate_tracker.load_sales():
+        if not sale["timestamp"].startswith(period):
+            continue
+        holders = owners.get(sale["product_id"])
+        if not holders:
+            continue
+        if len(holders) > 1:
+            unattributed["sales"] += 1
+            unattributed["commission_usd"] += sale["commission_earned_usd"]
+            unattributed["products"].add(sale["product_id"])
+            continue
+        row = earned.setdefault(holders[0], {"sales": 0, "commission_usd": 0.0, "by_product": {}})
+        row["sales"] += 1
+        row["commission_usd"] += sale["commission_earned_usd"]
+        row["by_product"][sale["product_id"]] = (
+            row["by_product"].get(sale["product_id"], 0.0) + sale["commission_earned_usd"])
+
+    statements = []
+    for cid, row in earned.items():
+        c = creators[cid]
+        fee = round(row["commission_usd"] * c["manager_fee_pct"], 2)
+        statements.append({
+            "handle": c["handle"],
+            "sales": row["sales"],
+            "commission_usd": round(row["commission_usd"], 2),
+            "manager_fee_pct": c["manager_fee_pct"],
+            "manager_fee_usd": fee,
+            "creator_net_usd": round(row["commission_usd"] - fee, 2),
+            "by_product": {pid: round(v, 2) for pid, v in row["by_product"].items()},
+        })
+    statements.sort(key=lambda r: r["commission_usd"], reverse=True)
+
+    payout = {
+        "period": period,
+        "generated_at": datetime.now().isoformat(),
+        "creators": len(statements),
+        "total_commission_usd": round(sum(r["commission_usd"] for r in statements), 2),
+        "total_manager_fee_usd": round(sum(r["manager_fee_usd"] for r in statements), 2),
+        "unattributed": {**unattributed,
+                         "commission_usd": round(unattributed["commission_usd"], 2),
+                         "products": sorted(unattributed["products"])},
+        "statements": statements,
+    }
+    PAYOUTS_DIR.mkdir(parents=True, exist_ok=True)
+    save_json(PAYOUTS_DIR / f"{period}.json", payout)
+
+    if sync_revenue:
+        for c in creators.values():
+            if c.get("products"):
+                c["monthly_revenue_usd"] = round(earned.get(c["id"], {}).get("commission_usd", 0.0), 2)
+        save_creators(creators, load_index(creators))
+    return payout
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -279,18 +1226,30 @@ def cmd_add_creator(_args):
     contact_platform = CONTACT_PLATFORMS[plat_idx] if 0 <= plat_idx < len(CONTACT_PLATFORMS) else "Other"
 
     contact_value = input("Contact value (email address or username): ").strip()
-    platform_notes = input("Platform notes (optional — engagement rate, vibe, etc.): ").strip()
+    platform_notes = input("Platform notes (optional — vibe, content style, etc.): ").strip()
+    engagement_input = input("Engagement rate % (optional, e.g. 6.5): ").strip()
+    engagement_rate = float(engagement_input.rstrip("%")) if engagement_input else None
     fee_input = input(f"Manager fee % (default {int(MANAGER_FEE_LOW*100)}%, e.g. 25): ").strip()
     manager_fee_pct = float(fee_input) / 100 if fee_input else MANAGER_FEE_LOW
 
     creator = add_creator(handle, niche, followers, contact_platform,
-                          contact_value, platform_notes, manager_fee_pct)
+                          contact_value, platform_notes, manager_fee_pct, engagement_rate)
 
     print(f"\nCreator added: {creator['handle']} | {creator['niche']} | "
           f"{_fmt_followers(creator['followers'])} followers | Status: {creator['status']}")
     print(f"Contact: {creator['contact_platform']} — {creator['contact_value']}")
 
 
+def cmd_import_creators(args):
+    counts = import_creators(args.file)
+    print(f"\nImported {args.file}:")
+    print(f"  Added:             {counts['added']:,}")
+    print(f"  Followers updated: {counts['updated']:,}")
+    print(f"  Unchanged:         {counts['unchanged']:,}")
+    print(f"  Duplicate rows:    {counts['duplicates']:,}")
+    print(f"  Skipped (bad):     {counts['skipped']:,}")
+
+
 def cmd_update_status(_args):
     print("\n=== Update Creator Status ===")
     creators = load_creators()
@@ -328,33 +1287,59 @@ def cmd_add_note(_args):
     if not text:
         print("Note cannot be empty.")
         return
-    creator = add_note(handle, text)
-    print(f"\nNote added to {creator['handle']} ({len(creator['notes'])} notes total)")
+    count = add_note(handle, text)
+    print(f"\nNote added to @{_creator_id(handle)} ({count} notes total)")
 
 
-def cmd_pipeline(_args):
-    pipeline = get_pipeline()
-    creators = load_creators()
+def cmd_view(_args):
+    handle = input("TikTok handle: ").strip()
+    c = get_creator(handle)
+
+    print(f"\n{'='*70}")
+    print(f"{c['handle']} — {c['niche']} | {_fmt_followers(c['followers'])} followers | Status: {c['status']}")
+    print(f"{'='*70}")
+    print(f"Contact:      {c['contact_platform']} — {c['contact_value']}")
+    print(f"Manager fee:  {c['manager_fee_pct']*100:.0f}%")
+    print(f"Revenue/mo:   ${c['monthly_revenue_usd']:,.2f}")
+    print(f"Products:     {', '.join(c['products']) if c['products'] else '—'}")
+    if c.get("platform_notes"):
+        print(f"Platform:     {c['platform_notes']}")
+    print(f"\n--- Notes ({len(c['notes'])}) ---")
+    for n in c["notes"]:
+        print(f"  {n['timestamp'][:16]}  {n['text']}")
+
+
+def cmd_pipeline(args):
+    if args.status and args.status not in STATUSES:
+        print(f"Invalid status '{args.status}'. Choose from: {', '.join(STATUSES)}")
+        return
+    counts = get_status_counts()
+    statuses = [args.status] if args.status else STATUSES
+    pipeline = get_pipeline(statuses, niche=args.niche, band=args.band)
 
     print(f"\n{'='*70}")
     print(f"CREATOR PIPELINE — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print(f"{'='*70}")
 
-    total = len(creators)
+    total = sum(counts.values())
     print(f"Total creators tracked: {total}")
     print()
 
-    # Status summary bar
+    # Status summary bar (scaled so large pipelines fit on one line)
     print("Status counts:")
+    scale = max(1, -(-max(counts.values(), default=0) // 50))
     for status in STATUSES:
-        count = len(pipeline[status])
-        bar = "#" * count
+        count = counts[status]
+        bar = "#" * -(-count // scale)
         print(f"  {status:<12} {count:>3}  {bar}")
 
     print()
+    filters = ", ".join(f"{k}={v}" for k, v in (("niche", args.niche), ("band", args.band)) if v)
+    if filters:
+        print(f"Filtered by {filters}\n")
 
     # Detail rows per status
-    for status in STATUSES:
+    for status in statuses:
         group = pipeline[status]
         if not group:
             continue
@@ -408,18 +1393,110 @@ def cmd_dashboard(_args):
     )
 
 
+def _fmt_hours(hours) -> str:
+    if hours is None:
+        return "—"
+    return f"{hours / 24:.1f}d" if hours >= 48 else f"{hours}h"
+
+
+def cmd_funnel(_args):
+    report = get_funnel_report()
+
+    print(f"\n{'='*75}")
+    print(f"CREATOR FUNNEL — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print(f"{'='*75}")
+    print(f"{'Stage':<12} {'Reached':<10} {'→ Next':<22} {'Median time':<13} {'Churned from'}")
+    print(f"{'-'*75}")
+    for s in report["stages"]:
+        conv = f"{s['conversion_pct']}% → {s['next_stage']}" if s["conversion_pct"] is not None else "—"
+        print(f"{s['stage']:<12} {s['entered']:<10,} {conv:<22} "
+              f"{_fmt_hours(s['median_hours_in_stage']):<13} {s['churned_from']}")
+    print(f"\nTotal churned: {report['churned']}")
+
+    if report["cohorts"]:
+        print(f"\n--- Weekly cohorts (by week discovered) ---")
+        print("  " + f"{'Week':<10} " + " ".join(f"{s[:10]:>10}" for s in FUNNEL_STAGES))
+        for c in report["cohorts"]:
+            print("  " + f"{c['week']:<10} " + " ".join(f"{c[s]:>10,}" for s in FUNNEL_STAGES))
+
+
+def cmd_search(args):
+    query = " ".join(args.query)
+    results = search_notes(query, args.limit)
+    if not results:
+        print(f"\nNo notes or touchpoints match '{query}'.")
+        return
+
+    print(f"\n{'='*90}")
+    print(f"SEARCH: {query} — {len(results)} result(s)")
+    print(f"{'='*90}")
+    for r in results:
+        print(f"{r['score']:>6.2f}  {r['date']:<10}  {r['kind']:<16}  {r['ref']}")
+        print(f"        {r['snippet']}")
+
+
+def cmd_lookalikes(args):
+    results = find_lookalikes(args.handle, args.limit)
+    if not results:
+        print(f"\nNo uncontacted creators to compare against @{_creator_id(args.handle)}.")
+        return
+
+    print(f"\n{'='*75}")
+    print(f"LOOKALIKES FOR @{_creator_id(args.handle)} — {len(results)} uncontacted creator(s)")
+    print(f"{'='*75}")
+    print(f"{'#':<4} {'Handle':<22} {'Niche':<14} {'Followers':<11} {'Eng%':<7} {'Distance'}")
+    print(f"{'-'*75}")
+    for i, c in enumerate(results, 1):
+        eng = f"{c['engagement_rate']:.1f}" if c["engagement_rate"] is not None else "—"
+        print(f"{i:<4} {c['handle']:<22} {c['niche']:<14} "
+              f"{_fmt_followers(c['followers']):<11} {eng:<7} {c['distance']}")
+
+
+def cmd_payouts(args):
+    period = args.period or _previous_month()
+    payout = compute_payouts(period, sync_revenue=args.sync_revenue)
+
+    print(f"\n{'='*85}")
+    print(f"CREATOR PAYOUTS — {period}  (statement: data/payouts/{period}.json)")
+    print(f"{'='*85}")
+    if not payout["statements"]:
+        print("No attributed creator sales in this period.")
+    else:
+        print(f"{'Handle':<22} {'Sales':<7} {'Commission':<13} {'Fee %':<7} {'Manager Fee':<13} {'Creator Net'}")
+        print(f"{'-'*85}")
+        for r in payout["statements"]:
+            print(
+                f"{r['handle']:<22} {r['sales']:<7} ${r['commission_usd']:<12,.2f} "
+                f"{r['manager_fee_pct']*100:<7.0f} ${r['manager_fee_usd']:<12,.2f} ${r['creator_net_usd']:,.2f}"
+            )
+        print(f"{'-'*85}")
+        print(f"{'TOTALS':<22} {'':<7} ${payout['total_commission_usd']:<12,.2f} {'':<7} "
+              f"${payout['total_manager_fee_usd']:,.2f}")
+
+    un = payout["unattributed"]
+    if un["sales"]:
+        print(f"\n⚠ {un['sales']} sale(s) (${un['commission_usd']:,.2f}) on products shared by "
+              f"several creators: {', '.join(un['products'])}")
+    if args.sync_revenue:
+        print("\nMonthly revenue updated for creators with products.")
+
+
 def cmd_top_creators(_args):
     limit_input = input("How many creators to show (default 10): ").strip()
     limit = int(limit_input) if limit_input else 10
+    sort_by = input(f"Sort by ({' / '.join(RANK_KEYS)}, default revenue): ").strip() or "revenue"
+    page_input = input("Page (default 1): ").strip()
+    offset = (int(page_input) - 1) * limit if page_input else 0
 
-    top = get_top_creators(limit)
+    top = get_top_creators(limit, sort_by, offset)
 
     if not top:
-        print("\nNo creators tracked yet. Use add-creator to start.")
+        print("\nNo creators on this page. Use add-creator to start, or try page 1.")
         return
 
     print(f"\n{'='*80}")
-    print(f"TOP {limit} CREATORS BY REVENUE — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print(f"TOP {limit} CREATORS BY {sort_by.replace('_', ' ').upper()} — "
+          f"ranks {top[0]['rank']}-{top[-1]['rank']} — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print(f"{'='*80}")
     print(f"{'#':<4} {'Handle':<22} {'Status':<12} {'Niche':<14} {'Followers':<11} {'Rev/mo':<12} {'Owner Cut'}")
     print(f"{'-'*80}")
@@ -452,11 +1529,17 @@ def main():
         epilog="""
 Commands:
   add-creator     Add a creator to the pipeline
+  import-creators Bulk import a CSV / NDJSON discovery list
   update-status   Move a creator through the pipeline
   add-note        Append a note to a creator's record
+  view            One creator's profile and full note history
   pipeline        Full pipeline view with status counts
   dashboard       Active creators, products, and owner revenue share
-  top-creators    Top earners ranked by monthly revenue
+  top-creators    Top creators ranked by revenue, followers or owner cut
+  funnel          Stage conversion rates, time-in-stage, weekly cohorts
+  search          Full-text search over creator notes and brand touchpoints
+  lookalikes      Most similar uncontacted creators to a given creator
+  payouts         Monthly manager-fee statements from sale events
 
 Pipeline stages:
   discovered -> contacted -> replied -> onboarded -> active -> churned
@@ -469,20 +1552,44 @@ Rev-share model:
     )
     subparsers = parser.add_subparsers(dest="command")
     subparsers.add_parser("add-creator",    help="Add a creator to the pipeline")
+    import_parser = subparsers.add_parser("import-creators", help="Bulk import creators from CSV / NDJSON")
+    import_parser.add_argument("file", help="CSV or .ndjson file with handle, niche, followers, ... columns")
     subparsers.add_parser("update-status",  help="Update a creator's outreach status")
     subparsers.add_parser("add-note",       help="Add a note to a creator's record")
-    subparsers.add_parser("pipeline",       help="Show full pipeline with status counts")
+    subparsers.add_parser("view",           help="Show one creator with full note history")
+    pipeline = subparsers.add_parser("pipeline", help="Show full pipeline with status counts")
+    pipeline.add_argument("--status", help="Only list creators in this status")
+    pipeline.add_argument("--niche", help="Only list creators in this niche")
+    pipeline.add_argument("--band", choices=[b for b, _ in FOLLOWER_BANDS],
+                          help="Only list creators in this follower band")
     subparsers.add_parser("dashboard",      help="Active creators, products, and monthly revenue share")
-    subparsers.add_parser("top-creators",   help="Top earning creators by revenue generated")
+    subparsers.add_parser("top-creators",   help="Top creators by revenue, followers or owner cut")
+    subparsers.add_parser("funnel",         help="Stage conversion, time-in-stage and weekly cohorts")
+    search = subparsers.add_parser("search", help="Search creator notes and brand touchpoints")
+    search.add_argument("query", nargs="+", help="Words to search for")
+    search.add_argument("--limit", type=int, default=20, help="Maximum results (default 20)")
+    lookalikes = subparsers.add_parser("lookalikes", help="Most similar uncontacted creators")
+    lookalikes.add_argument("handle", help="Creator to find lookalikes for")
+    lookalikes.add_argument("--limit", type=int, default=50, help="How many to return (default 50)")
+    payouts = subparsers.add_parser("payouts", help="Monthly manager-fee statements from sale events")
+    payouts.add_argument("--period", help="Month as YYYY-MM (default: last month)")
+    payouts.add_argument("--sync-revenue", action="store_true",
+                         help="Set each creator's monthly revenue to the period's commission")
 
     args = parser.parse_args()
     commands = {
         "add-creator":   cmd_add_creator,
+        "import-creators": cmd_import_creators,
         "update-status": cmd_update_status,
         "add-note":      cmd_add_note,
+        "view":          cmd_view,
         "pipeline":      cmd_pipeline,
         "dashboard":     cmd_dashboard,
         "top-creators":  cmd_top_creators,
+        "funnel":        cmd_funnel,
+        "search":        cmd_search,
+        "lookalikes":    cmd_lookalikes,
+        "payouts":       cmd_payouts,
     }
 
     if args.command in commands:
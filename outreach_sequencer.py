@@ -0,0 +1,862 @@
+#!/usr/bin/env python3
+"""
+outreach_sequencer.py
+---------------------
+Sends the multi-step outreach sequences written up in outreach_sequences.md
+(brands) and outreach_templates.md (creators). Targets are enrolled into a
+sequence; a long-running sender renders each step from the markdown, sends it
+through the channel's transport under per-channel rate limits, logs it as a
+creator note or brand touchpoint, and schedules the next follow-up.
+
+Usage:
+    python outreach_sequencer.py sequences                 # List sequences and their steps
+    python outreach_sequencer.py enroll SEQUENCE [ID ...]  # Enroll creators / prospects
+                                                           #   (--status: everyone at a creator status / brand stage)
+    python outreach_sequencer.py status                    # Enrollment counts and next sends
+    python outreach_sequencer.py run                       # Send steps as they come due
+    python outreach_sequencer.py render-batch TEMPLATE     # Render a creator template for a whole
+                                                           #   pipeline status to an NDJSON file
+
+Email goes out over SMTP (localhost:1025 by default), so a local debugging
+server can stand in for a real relay while testing:
+    python -m smtpd -n -c DebuggingServer localhost:1025    # Python <= 3.11
+    python -m aiosmtpd -n -l localhost:1025                 # pip install aiosmtpd
+DM and LinkedIn steps are written to data/outbox/<channel>.ndjson to send by hand.
+
+The sender placeholders come from the environment, and `run` refuses to send
+until they are all set:
+    export OUTREACH_SENDER_NAME="..." OUTREACH_SENDER_EMAIL="..." OUTREACH_SENDER_COMPANY="..."
+"""
+
+import argparse
+import asyncio
+import contextlib
+import heapq
+import json
+import operator
+import os
+import re
+import smtplib
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from json.encoder import encode_basestring
+from pathlib import Path
+
+import brand_outreach
+import creator_outreach
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = BASE_DIR / "data"
+STATE_FILE = DATA_DIR / "sequence_state.json"
+INBOX_FILE = DATA_DIR / "sequence_enrollments.ndjson"  # appended by enroll, drained by run
+OUTBOX_DIR = DATA_DIR / "outbox"
+
+SMTP_HOST = "localhost"
+SMTP_PORT = 1025
+
+# Sender-side template placeholders and the environment variables that fill
+# them. Nothing is sent until all of them are set (see require_sender).
+SENDER_ENV = {
+    "your name": "OUTREACH_SENDER_NAME",
+    "your contact": "OUTREACH_SENDER_EMAIL",
+    "your company": "OUTREACH_SENDER_COMPANY",
+}
+
+# Per-channel sending limits: sends per day (spaced evenly) and concurrent sends
+CHANNEL_LIMITS = {
+    "email":    {"per_day": 10_000, "concurrency": 4},
+    "dm":       {"per_day": 150,    "concurrency": 1},
+    "linkedin": {"per_day": 80,     "concurrency": 1},
+}
+
+SEQUENCE_POLL_SECONDS = 30.0   # how often to check for new enrollments while idle
+SEQUENCE_RETRY_SECONDS = 900.0  # wait before retrying a failed send
+SEQUENCE_MAX_ATTEMPTS = 3
+
+# Each step is (day offset from enrollment, channel, template heading path).
+# Heading paths match markdown headings by prefix, parent / child.
+SEQUENCES = {
+    "brand-email": {
+        "audience": "brand",
+        "source": "outreach_sequences.md",
+        "steps": [
+            (0,  "email", "SEQUENCE 1 / Email 1"),
+            (3,  "email", "SEQUENCE 1 / Email 2"),
+            (9,  "email", "SEQUENCE 1 / Email 3"),
+            (20, "email", "SEQUENCE 1 / Email 4"),
+        ],
+    },
+    "brand-linkedin": {
+        "audience": "brand",
+        "source": "outreach_sequences.md",
+        "steps": [
+            (0, "linkedin", "SEQUENCE 2 / Message 1"),
+            (2, "linkedin", "SEQUENCE 2 / Message 2"),
+            (9, "linkedin", "SEQUENCE 2 / Message 3"),
+        ],
+    },
+    "creator-email": {
+        "audience": "creator",
+        "source": "outreach_templates.md",
+        "steps": [
+            (0, "email", "2. Email Pitch"),
+        ],
+    },
+    "creator-dm": {
+        "audience": "creator",
+        "source": "outreach_templates.md",
+        "steps": [
+            (0, "dm", "1. TikTok DM Pitch"),
+            (3, "dm", "3. Follow-Up DM"),
+        ],
+    },
+}
+
+# Targets past these stages have replied (or been closed out): stop sequencing them
+SEQUENCE_OPEN_STATUSES = {
+    "creator": {"discovered", "contacted"},
+    "brand": {"identified", "researched", "contacted"},
+}
+
+_PLACEHOLDER = re.compile(r"\[([^\[\]\n]+)\]")
+
+# ---------------------------------------------------------------------------
+# Data helpers
+# ---------------------------------------------------------------------------
+
+def ensure_data_dir() -> None:
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def load_json(path: Path, default: object) -> object:
+    if not path.exists():
+        return default
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_json(path: Path, data: object) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def load_state() -> dict:
+    return load_json(STATE_FILE, {"enrollments": {}, "inbox_offset": 0})
+
+
+def save_state(state: dict) -> None:
+    ensure_data_dir()
+    save_json(STATE_FILE, state)
+
+
+def read_inbox(offset: int = 0):
+    """Return (enrollments appended since offset, new offset)."""
+    if not INBOX_FILE.exists():
+        return [], offset
+    with open(INBOX_FILE, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    complete = data[:data.rfind(b"\n") + 1]  # ignore a partially written last line
+    entries = [json.loads(line) for line in complete.splitlines() if line.strip()]
+    return entries, offset + len(complete)
+
+# ---------------------------------------------------------------------------
+# Templates
+# ---------------------------------------------------------------------------
+
+def parse_templates(path: Path) -> dict:
+    """
+    Map each markdown heading path (tuple of ## / ### titles) to a template
+    {"subject", "body"}. The body is the first fenced block in the section or,
+    failing that, the text after a **Body:** line up to the next ---.
+    Sections with neither are not templates and are skipped.
+    """
+    templates = {}
+    path_titles = []
+    section = []
+
+    def flush() -> None:
+        subject, block, body = "", None, None
+        for line in section:
+            if line.startswith("```"):
+                if block is not None:
+                    body = block
+                    break
+                block = []
+            elif block is not None:
+                block.append(line)
+            elif line.startswith("**Subject:**"):
+                subject = line[len("**Subject:**"):].strip()
+            elif line.startswith("**Body:**"):
+                body = []
+            elif body is not None:
+                if line.strip() == "---":
+                    break
+                body.append(line)
+        body = "\n".join(body or []).strip()
+        if body and path_titles:
+            templates[tuple(path_titles)] = {"subject": subject, "body": body}
+
+    for line in Path(path).read_text().splitlines():
+        heading = re.match(r"^(#{2,3}) (.+)$", line)
+        if heading:
+            flush()
+            section = []
+            depth = len(heading.group(1)) - 2
+            path_titles = path_titles[:depth] + [heading.group(2).strip()]
+        else:
+            section.append(line)
+    flush()
+    return templates
+
+
+def find_template(templates: dict, spec: str) -> dict:
+    """Find the template whose heading path matches spec ('Parent / Child') by prefix."""
+    wanted = [part.strip() for part in spec.split(" / ")]
+    for titles, template in templates.items():
+        if len(titles) == len(wanted) and all(t.startswith(w) for t, w in zip(titles, wanted)):
+            return template
+    raise KeyError(f"No template matching '{spec}'.")
+
+
+def _json_escape(text: str) -> str:
+    """Escape text for the inside of a JSON string literal."""
+    return encode_basestring(text)[1:-1]
+
+
+def compile_template(text: str, escape=None):
+    """
+    Compile template text into a render(context) -> (text, missing) function.
+    The literal text is escaped into a positional str.format string once, so
+    rendering is a single itemgetter lookup of the distinct placeholders plus
+    one format call. Placeholders are matched case-insensitively; unfilled
+    ones are left in the output and reported in `missing`.
+
+    With escape (e.g. _json_escape) the literal text is escaped at compile
+    time and only the placeholder values at render time, so the output can be
+    written straight into an encoded document.
+    """
+    escape = escape or str
+    keys, raw, pieces = [], [], []
+    last = 0
+    for match in _PLACEHOLDER.finditer(text):
+        pieces.append(escape(text[last:match.start()]).replace("{", "{{").replace("}", "}}"))
+        key = match.group(1).strip().lower()
+        if key not in keys:
+            keys.append(key)
+            raw.append(match.group(1))
+        pieces.append(f"{{{keys.index(key)}}}")
+        last = match.end()
+    pieces.append(escape(text[last:]).replace("{", "{{").replace("}", "}}"))
+    fmt = "".join(pieces)
+    if not keys:
+        constant = escape(text)
+        return lambda context: (constant, set())
+    lookup = operator.itemgetter(*keys)
+    single = len(keys) == 1
+
+    def render(context: dict):
+        try:
+            values = lookup(context)
+            if single:
+                values = (values,)
+            if None not in values and "" not in values:
+                return fmt.format(*[escape(str(v)) for v in values]), set()
+        except KeyError:
+            pass
+        values = [context.get(key) for key in keys]
+        missing = {raw[i] for i, v in enumerate(values) if v in (None, "")}
+        values = [f"[{raw[i]}]" if v in (None, "") else str(v) for i, v in enumerate(values)]
+        return fmt.format(*[escape(v) for v in values]), missing
+
+    return render
+
+
+_compiled = {}
+
+
+def load_templates(source: str) -> dict:
+    """
+    Compiled templates for a markdown file in this folder: heading path ->
+    {"subject", "body"} render functions, plus "subject_json" / "body_json"
+    variants that emit JSON-escaped text. Parsed once per process and
+    recompiled only when the file's mtime changes.
+    """
+    path = BASE_DIR / source
+    mtime = path.stat().st_mtime_ns
+    cached = _compiled.get(source)
+    if cached is None or cached[0] != mtime:
+        templates = {
+            titles: {
+                "subject": compile_template(t["subject"]),
+                "body": compile_template(t["body"]),
+                "subject_json": compile_template(t["subject"], _json_escape),
+                "body_json": compile_template(t["body"], _json_escape),
+            }
+            for titles, t in parse_templates(path).items()
+        }
+        cached = _compiled[source] = (mtime, templates)
+    return cached[1]
+
+
+def render_template(template: dict, context: dict):
+    """Render a compiled template. Returns (subject, body, missing placeholders)."""
+    subject, missing_subject = template["subject"](context)
+    body, missing_body = template["body"](context)
+    return subject, body, missing_subject | missing_body
+
+
+def target_fields(audience: str, target: dict) -> dict:
+    """Placeholder values taken from one creator or prospect record."""
+    if audience == "creator":
+        name = target["id"]
+        niche = target.get("niche", "")
+        followers = f"{target.get('followers', 0):,}"
+        return {
+            "name": name,
+            "first name": name,
+            "handle": target["handle"],
+            "niche": niche,
+            "their niche": niche,
+            "followers": followers,
+            "follower count": followers,
+            "product": target["products"][-1] if target.get("products") else "",
+        }
+    contact = (target.get("contact") or "").strip()
+    return {
+        "brand": target["brand"],
+        "name": contact or target["brand"],
+        "first name": contact.split()[0] if contact else "there",
+        "niche": target.get("niche", ""),
+        "their niche": target.get("niche", ""),
+    }
+
+
+def load_sender() -> dict:
+    """Sender placeholder values from the environment; unset ones are left out."""
+    return {field: os.environ[var].strip() for field, var in SENDER_ENV.items()
+            if os.environ.get(var, "").strip()}
+
+
+def require_sender() -> dict:
+    """load_sender(), refusing with a ValueError if any sender variable is unset."""
+    sender = load_sender()
+    missing = [var for field, var in SENDER_ENV.items() if field not in sender]
+    if missing:
+        raise ValueError(f"Sender not configured — set {', '.join(missing)} before sending.")
+    return sender
+
+
+def fixed_fields(personalization: dict) -> dict:
+    """Placeholder values shared by every target: the sender, then any overrides."""
+    return {**load_sender(), **{k.lower(): v for k, v in personalization.items()}}
+
+
+def target_context(audience: str, target: dict, personalization: dict) -> dict:
+    """Placeholder values for one creator or prospect."""
+    context = target_fields(audience, target)
+    context.update(fixed_fields(personalization))
+    return context
+
+
+def contact_address(audience: str, channel: str, target: dict) -> str:
+    """Where a step on this channel goes for the target, or '' if they have no such contact."""
+    if audience == "creator":
+        value = (target.get("contact_value") or "").strip()
+        is_email = target.get("contact_platform") == "Email" or "@" in value.lstrip("@")
+    else:
+        value = (target.get("contact_url") or "").strip()
+        is_email = "@" in value and "linkedin" not in value.lower()
+    if channel == "email":
+        return value if is_email else ""
+    if channel == "linkedin":
+        return value if "linkedin" in value.lower() else ""
+    return target.get("handle") or value
+
+
+def render_batch(spec: str, status: str, out_path, personalization: dict = None,
+                 source: str = "outreach_templates.md") -> dict:
+    """
+    Render one creator template for every creator at a pipeline status,
+    streaming one JSON line per creator to out_path (nothing is held in
+    memory but the creator store). Lines are assembled from the JSON-escaped
+    template variants, so only placeholder values are escaped per message.
+    Returns counts of rendered messages and of those with unfilled placeholders.
+    """
+    template = find_template(load_templates(source), spec)
+    creators = creator_outreach.load_creators()
+    ids = creator_outreach.find_creator_ids(status=status)
+    fixed = fixed_fields(personalization or {})
+    render_subject, render_body = template["subject_json"], template["body_json"]
+    counts = {"rendered": 0, "missing": 0}
+    with open(out_path, "w", encoding="utf-8") as f:
+        for cid in ids:
+            creator = creators[cid]
+            context = target_fields("creator", creator)
+            context.update(fixed)
+            subject, missing_subject = render_subject(context)
+            body, missing_body = render_body(context)
+            contact = f"{creator.get('contact_platform', '')}: {creator.get('contact_value', '')}"
+            line = (f'{{"handle": "{_json_escape(creator["handle"])}", '
+                    f'"contact": "{_json_escape(contact)}", '
+                    f'"subject": "{subject}", "body": "{body}"')
+            missing = missing_subject | missing_body
+            if missing:
+                line += f', "missing": {json.dumps(sorted(missing), ensure_ascii=False)}'
+                counts["missing"] += 1
+            f.write(line + "}\n")
+            counts["rendered"] += 1
+    return counts
+
+# ---------------------------------------------------------------------------
+# Transports and rate limits
+# ---------------------------------------------------------------------------
+
+def smtp_transport(host: str = SMTP_HOST, port: int = SMTP_PORT, sender: str = None):
+    """
+    Async transport that sends a message over SMTP in a worker thread, from
+    `sender` or else the configured OUTREACH_SENDER_EMAIL.
+    """
+    sender = sender or require_sender()["your contact"]
+    def send_sync(message: dict) -> None:
+        email = EmailMessage()
+        email["From"] = sender
+        email["To"] = message["to"]
+        email["Subject"] = message["subject"]
+        email.set_content(message["body"])
+        with smtplib.SMTP(host, port, timeout=30) as smtp:
+            smtp.send_message(email)
+
+    async def send(message: dict) -> None:
+        await asyncio.to_thread(send_sync, message)
+
+    return send
+
+
+def outbox_transport(channel: str):
+    """Async transport that appends messages to data/outbox/<channel>.ndjson for manual sending."""
+    async def send(message: dict) -> None:
+        OUTBOX_DIR.mkdir(parents=True, exist_ok=True)
+        with open(OUTBOX_DIR / f"{channel}.ndjson", "a") as f:
+            f.write(json.dumps({**message, "queued_at": datetime.now().isoformat()}) + "\n")
+
+    return send
+
+
+def default_transports(email: str = "smtp", host: str = SMTP_HOST, port: int = SMTP_PORT) -> dict:
+    transports = {channel: outbox_transport(channel) for channel in CHANNEL_LIMITS}
+    if email == "smtp":
+        transports["email"] = smtp_transport(host, port)
+    return transports
+
+
+def rate_limiter(per_day: int, concurrency: int):
+    """
+    Async context manager factory: at most `concurrency` sends in flight and
+    starts spaced evenly so no more than per_day go out per day.
+    """
+    interval = 86_400 / per_day
+    slots = asyncio.Semaphore(concurrency)
+    lock = asyncio.Lock()
+    next_start = 0.0
+
+    @contextlib.asynccontextmanager
+    async def limit():
+        nonlocal next_start
+        async with slots:
+            async with lock:
+                now = time.monotonic()
+                start = max(now, next_start)
+                next_start = start + interval
+            await asyncio.sleep(start - now)
+            yield
+
+    return limit
+
+# ---------------------------------------------------------------------------
+# Core logic
+# ---------------------------------------------------------------------------
+
+def _enrollment_id(sequence: str, target_id: str) -> str:
+    return f"{sequence}:{target_id}"
+
+
+def _due_at(enrollment: dict) -> str:
+    day = SEQUENCES[enrollment["sequence"]]["steps"][enrollment["step"]][0]
+    return (datetime.fromisoformat(enrollment["started_at"]) + timedelta(days=day)).isoformat()
+
+
+def enroll(sequence: str, target_ids: list = None, status: str = None,
+           personalization: dict = None) -> dict:
+    """
+    Enroll targets in a sequence, by id or every target at `status` (creator
+    status or brand stage). Targets already enrolled in the sequence or with
+    no contact for its first channel are skipped. Returns counts.
+    """
+    if sequence not in SEQUENCES:
+        raise ValueError(f"Unknown sequence '{sequence}'. Choose from: {', '.join(SEQUENCES)}")
+    audience = SEQUENCES[sequence]["audience"]
+    first_channel = SEQUENCES[sequence]["steps"][0][1]
+    if audience == "creator":
+        targets = creator_outreach.load_creators()
+        ids = [creator_outreach._creator_id(t) for t in target_ids or []]
+    else:
+        targets = brand_outreach._load()["prospects"]
+        ids = list(target_ids or [])
+    if status:
+        ids += [tid for tid, t in targets.items()
+                if t.get("status" if audience == "creator" else "stage") == status]
+
+    state = load_state()
+    queued, _ = read_inbox(state["inbox_offset"])
+    enrolled = set(state["enrollments"]) | {e["id"] for e in queued}
+
+    counts = {"enrolled": 0, "already_enrolled": 0, "no_contact": 0, "not_found": 0}
+    now = datetime.now().isoformat()
+    lines = []
+    for tid in dict.fromkeys(ids):
+        eid = _enrollment_id(sequence, tid)
+        if tid not in targets:
+            counts["not_found"] += 1
+        elif eid in enrolled:
+            counts["already_enrolled"] += 1
+        elif not contact_address(audience, first_channel, targets[tid]):
+            counts["no_contact"] += 1
+        else:
+            enrolled.add(eid)
+            lines.append(json.dumps({
+                "id": eid,
+                "sequence": sequence,
+                "audience": audience,
+                "target_id": tid,
+                "personalization": personalization or {},
+                "step": 0,
+                "status": "active",
+                "attempts": 0,
+                "started_at": now,
+                "due_at": now,
+            }))
+            counts["enrolled"] += 1
+    if lines:
+        ensure_data_dir()
+        with open(INBOX_FILE, "a") as f:
+            f.write("\n".join(lines) + "\n")
+    return counts
+
+
+def _record_sends(sent: list) -> None:
+    """Log a batch of sent (enrollment, message) steps as creator notes / brand touchpoints."""
+    notes, touches = [], []
+    for enrollment, message in sent:
+        label = f"[{message['sequence']} step {message['step']}]"
+        summary = message["subject"] or message["body"].splitlines()[0]
+        if enrollment["audience"] == "creator":
+            notes.append((message["target_id"], f"{label} sent via {message['channel']}: {summary}"))
+        else:
+            touches.append((message["target_id"], message["channel"], f"{label} {summary}", "no_reply"))
+    if notes:
+        creator_outreach.log_outreach(notes)
+    if touches:
+        brand_outreach.log_touchpoints(touches, mark_contacted=True)
+
+
+def _load_targets(audience: str) -> dict:
+    if audience == "creator":
+        return creator_outreach.load_creators()
+    return brand_outreach._load()["prospects"]
+
+
+def _prepare(enrollment: dict, targets: dict, templates: dict):
+    """Build the message for an enrollment's current step, or return (None, reason) to end it."""
+    sequence = SEQUENCES[enrollment["sequence"]]
+    day, channel, spec = sequence["steps"][enrollment["step"]]
+    target = targets.get(enrollment["target_id"])
+    if target is None:
+        return None, "stopped: target removed"
+    field = "status" if enrollment["audience"] == "creator" else "stage"
+    if target.get(field) not in SEQUENCE_OPEN_STATUSES[enrollment["audience"]]:
+        return None, f"stopped: target is {target.get(field)}"
+    to = contact_address(enrollment["audience"], channel, target)
+    if not to:
+        return None, f"blocked: no {channel} contact"
+
+    template = find_template(templates, spec)
+    context = target_context(enrollment["audience"], target, enrollment["personalization"])
+    subject, body, missing = render_template(template, context)
+    if missing:
+        return None, f"blocked: unfilled {', '.join(sorted(missing))}"
+    return {
+        "channel": channel,
+        "to": to,
+        "subject": subject,
+        "body": body,
+        "sequence": enrollment["sequence"],
+        "step": enrollment["step"] + 1,
+        "target_id": enrollment["target_id"],
+    }, None
+
+
+async def run_sequences(transports: dict = None, limits: dict = None,
+                        poll_seconds: float = SEQUENCE_POLL_SECONDS,
+                        retry_seconds: float = SEQUENCE_RETRY_SECONDS,
+                        once: bool = False) -> None:
+    """
+    Send sequence steps as they come due.
+
+    Due times live in a min-heap; the loop sleeps until the earliest one (or
+    poll_seconds, to pick up new enrollments from the inbox file). Each due
+    step is rendered, sent through its channel's transport under that
+    channel's rate limiter, logged against the target, and the next step is
+    pushed back onto the heap. Targets that have replied or moved on are
+    stopped; steps with unfilled placeholders or no contact are blocked
+    rather than sent. This process is the only writer of the state file. With
+    once=True it exits when nothing is due or in flight. Refuses to start
+    (ValueError) until the sender is configured; see SENDER_ENV.
+    """
+    require_sender()
+    transports = transports or default_transports()
+    limits = {**CHANNEL_LIMITS, **(limits or {})}
+    limiters = {channel: rate_limiter(**limit) for channel, limit in limits.items()}
+    state = load_state()
+    enrollments = state["enrollments"]
+    for enrollment in enrollments.values():
+        if enrollment["status"] == "sending":  # interrupted mid-send: try again
+            enrollment["status"] = "active"
+    heap = [(datetime.fromisoformat(e["due_at"]).timestamp(), eid)
+            for eid, e in enrollments.items() if e["status"] == "active"]
+    heapq.heapify(heap)
+    tasks = set()
+    sent = []
+    wake = asyncio.Event()
+
+    async def send_step(enrollment: dict, message: dict) -> None:
+        channel = message["channel"]
+        try:
+            async with limiters[channel]():
+                await transports[channel](message)
+        except Exception as exc:
+            enrollment["status"] = "active"
+            enrollment["attempts"] += 1
+            enrollment["last_error"] = str(exc)
+            if enrollment["attempts"] >= SEQUENCE_MAX_ATTEMPTS:
+                enrollment["status"] = "failed"
+            else:
+                enrollment["due_at"] = datetime.fromtimestamp(time.time() + retry_seconds).isoformat()
+            print(f"✗ {enrollment['id']} step {message['step']} failed: {exc}")
+        else:
+            enrollment["status"] = "active"
+            sent.append((enrollment, message))
+            enrollment["attempts"] = 0
+            enrollment["last_sent_at"] = datetime.now().isoformat()
+            enrollment["step"] += 1
+            if enrollment["step"] < len(SEQUENCES[enrollment["sequence"]]["steps"]):
+                enrollment["due_at"] = max(_due_at(enrollment), enrollment["last_sent_at"])
+            else:
+                enrollment["status"] = "completed"
+            print(f"✓ {enrollment['id']} step {message['step']} sent via {channel} → {message['to']}")
+        finally:
+            if enrollment["status"] == "active":
+                heapq.heappush(heap, (datetime.fromisoformat(enrollment["due_at"]).timestamp(),
+                                      enrollment["id"]))
+            wake.set()
+
+    while True:
+        changed = wake.is_set()
+        wake.clear()
+        if sent:
+            # Sends that finished while the last batch was being logged share one commit
+            _record_sends(sent)
+            sent.clear()
+
+        new, state["inbox_offset"] = read_inbox(state["inbox_offset"])
+        for enrollment in new:
+            if enrollment["id"] not in enrollments:
+                enrollments[enrollment["id"]] = enrollment
+                heapq.heappush(heap, (datetime.fromisoformat(enrollment["due_at"]).timestamp(),
+                                      enrollment["id"]))
+
+        now = time.time()
+        due = []
+        while heap and heap[0][0] <= now:
+            _, eid = heapq.heappop(heap)
+            if enrollments[eid]["status"] == "active":
+                due.append(enrollments[eid])
+        if due:
+            targets = {audience: _load_targets(audience)
+                       for audience in {e["audience"] for e in due}}
+            for enrollment in due:
+                source = SEQUENCES[enrollment["sequence"]]["source"]
+                message, reason = _prepare(enrollment, targets[enrollment["audience"]],
+                                           load_templates(source))
+                if message is None:
+                    enrollment["status"] = reason.split(":")[0]
+                    enrollment["reason"] = reason
+                    print(f"  {enrollment['id']} {reason}")
+                    continue
+                enrollment["status"] = "sending"  # until send_step settles it
+                task = asyncio.create_task(send_step(enrollment, message))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if changed or new or due:
+            save_state(state)
+
+        if once and all(task.done() for task in tasks):
+            return
+        timeout = min(poll_seconds, heap[0][0] - now) if heap else poll_seconds
+        try:
+            await asyncio.wait_for(wake.wait(), max(timeout, 0))
+        except asyncio.TimeoutError:
+            pass
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def cmd_sequences(_args) -> None:
+    for name, sequence in SEQUENCES.items():
+        print(f"\n  {name}  ({sequence['audience']}, from {sequence['source']})")
+        for day, channel, spec in sequence["steps"]:
+            print(f"    Day {day + 1:<3} {channel:<9} {spec}")
+    print()
+
+
+def _parse_set(pairs: list) -> dict:
+    personalization = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"--set expects KEY=VALUE, got '{pair}'.")
+        personalization[key.strip()] = value.strip()
+    return personalization
+
+
+def cmd_enroll(args) -> None:
+    counts = enroll(args.sequence, args.targets, args.status, _parse_set(args.set))
+    print(f"\n✓ Enrolled {counts['enrolled']} in {args.sequence}")
+    for key in ("already_enrolled", "no_contact", "not_found"):
+        if counts[key]:
+            print(f"  Skipped {counts[key]} ({key.replace('_', ' ')})")
+
+
+def cmd_status(_args) -> None:
+    state = load_state()
+    pending, _ = read_inbox(state["inbox_offset"])
+    enrollments = list(state["enrollments"].values()) + pending
+    if not enrollments:
+        print("No enrollments yet. Run: python outreach_sequencer.py enroll SEQUENCE ...")
+        return
+    counts = {}
+    for e in enrollments:
+        key = (e["sequence"], e["status"])
+        counts[key] = counts.get(key, 0) + 1
+    print(f"\n{'Sequence':<16} {'Status':<11} {'Count':>6}")
+    print("-" * 35)
+    for (sequence, status), count in sorted(counts.items()):
+        print(f"{sequence:<16} {status:<11} {count:>6}")
+
+    upcoming = heapq.nsmallest(10, (e for e in enrollments if e["status"] == "active"),
+                               key=lambda e: e["due_at"])
+    if upcoming:
+        print("\nNext sends:")
+        for e in upcoming:
+            print(f"  {e['due_at'][:16].replace('T', ' ')}  {e['id']}  step {e['step'] + 1}")
+    blocked = [e for e in enrollments if e["status"] in ("blocked", "failed")]
+    if blocked:
+        print(f"\nNeeds attention ({len(blocked)}):")
+        for e in blocked[:10]:
+            print(f"  {e['id']}: {e.get('reason') or e.get('last_error')}")
+    print()
+
+
+def cmd_render_batch(args) -> None:
+    if args.status not in creator_outreach.STATUSES:
+        raise ValueError(f"Invalid status '{args.status}'. Choose from: {', '.join(creator_outreach.STATUSES)}")
+    start = time.perf_counter()
+    counts = render_batch(args.template, args.status, args.out, _parse_set(args.set))
+    elapsed = time.perf_counter() - start
+    print(f"\n✓ Rendered {counts['rendered']:,} messages to {args.out} in {elapsed:.2f}s")
+    if counts["missing"]:
+        print(f"  {counts['missing']:,} have unfilled placeholders (see their \"missing\" field)")
+
+
+def cmd_run(args) -> None:
+    limits = {}
+    for pair in args.limit or []:
+        channel, _, per_day = pair.partition("=")
+        if channel not in CHANNEL_LIMITS:
+            raise ValueError(f"Unknown channel '{channel}'. Choose from: {', '.join(CHANNEL_LIMITS)}")
+        limits[channel] = {**CHANNEL_LIMITS[channel], "per_day": int(per_day)}
+    transports = default_transports(args.email, args.smtp_host, args.smtp_port)
+    print(f"Sequencer running (email via {args.email}"
+          f"{f' {args.smtp_host}:{args.smtp_port}' if args.email == 'smtp' else ''}). Ctrl+C to stop.")
+    try:
+        asyncio.run(run_sequences(transports, limits, once=args.once))
+    except KeyboardInterrupt:
+        print("\nSequencer stopped.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Outreach sequence sender for creators and brand prospects",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Commands:
+  sequences     List sequences and their steps
+  enroll        Enroll creators / prospects in a sequence
+  status        Enrollment counts, next sends, blocked enrollments
+  render-batch  Render a creator template for a whole pipeline status to a file
+  run           Send steps as they come due (long-running)
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("sequences", help="List sequences and their steps")
+    enroll_p = subparsers.add_parser("enroll", help="Enroll creators / prospects in a sequence")
+    enroll_p.add_argument("sequence", choices=list(SEQUENCES))
+    enroll_p.add_argument("targets", nargs="*", help="Creator handles or prospect ids")
+    enroll_p.add_argument("--status", help="Also enroll everyone at this creator status / brand stage")
+    enroll_p.add_argument("--set", action="append", metavar="KEY=VALUE",
+                          help="Fill a template placeholder, e.g. --set 'X=50'")
+    subparsers.add_parser("status", help="Enrollment counts and next sends")
+    batch_p = subparsers.add_parser("render-batch",
+                                    help="Render a creator template for a whole pipeline status")
+    batch_p.add_argument("template", help="Template heading, e.g. '1. TikTok DM Pitch' or '2. Email'")
+    batch_p.add_argument("--status", default="discovered", help="Creator status (default: discovered)")
+    batch_p.add_argument("--out", default=str(DATA_DIR / "rendered.ndjson"), help="Output NDJSON file")
+    batch_p.add_argument("--set", action="append", metavar="KEY=VALUE",
+                         help="Fill a template placeholder for every creator")
+    run_p = subparsers.add_parser("run", help="Send steps as they come due")
+    run_p.add_argument("--email", choices=["smtp", "outbox"], default="smtp",
+                       help="Email transport (default: smtp)")
+    run_p.add_argument("--smtp-host", default=SMTP_HOST)
+    run_p.add_argument("--smtp-port", type=int, default=SMTP_PORT)
+    run_p.add_argument("--limit", action="append", metavar="CHANNEL=PER_DAY",
+                       help="Override a channel's daily send limit")
+    run_p.add_argument("--once", action="store_true", help="Send everything due now, then exit")
+
+    args = parser.parse_args()
+    ensure_data_dir()
+
+    commands = {
+        "sequences": cmd_sequences,
+        "enroll": cmd_enroll,
+        "status": cmd_status,
+        "render-batch": cmd_render_batch,
+        "run": cmd_run,
+    }
+
+    if args.command in commands:
+        try:
+            commands[args.command](args)
+        except (ValueError, KeyError) as e:
+            print(f"Error: {e}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,23 +12,35 @@ Tracks competitor creators and outputs weekly Top 10 product recommendations.
 
 Note: TikTok does not provide a public API for trending products.
 This tool uses manual data entry + category-level benchmarks from
-TikTok Creative Center public data. For automated scraping, use
-a headless browser (Playwright) with TikTok Creative Center at
+TikTok Creative Center public data. To collect signals automatically,
+point trend_fetcher.py at pages that expose them (see its docstring);
+Creative Center itself still needs a headless browser (Playwright) at
 ads.tiktok.com/business/creativecenter/inspiration/popular/pc/en
 
 Usage:
     python product_research.py add          # Add a product to research
-    python product_research.py score        # Score and rank all products
+    python product_research.py import FILE  # Bulk import a CSV / NDJSON product export
+    python product_research.py score        # Rescore changed products and rank (--all: every product)
     python product_research.py top10        # Show this week's top 10
     python product_research.py competitor   # Track a competitor creator
+    python product_research.py signal ID SIGNAL VALUE  # Record a views / orders / sightings count
     python product_research.py trends       # Show category trend data
+    python product_research.py sweep        # Top-10 sensitivity to weights and benchmarks
 """
 
 import argparse
+import hashlib
+import heapq
 import json
+import math
+import random
+import re
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import brand_outreach
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -36,6 +48,15 @@ from pathlib import Path
 DATA_DIR = Path(__file__).parent / "data"
 RESEARCH_FILE = DATA_DIR / "product_research.json"
 COMPETITORS_FILE = DATA_DIR / "competitors.json"
+RANKING_FILE = DATA_DIR / "product_ranking.json"
+SIGNALS_FILE = DATA_DIR / "product_signals.log"  # append-only, one dated observation per line
+SIGHTINGS_FILE = DATA_DIR / "competitor_sightings.log"  # append-only, one competitor sighting per line
+SIGHTINGS_STATE_FILE = DATA_DIR / "competitor_sightings_state.json"  # log offset folded + open days' counts
+
+# Bump when the score weights or formulas change: every product is rescored.
+# Benchmark edits need no bump — they are part of each product's score hash.
+SCORING_VERSION = 2
+RANKING_SIZE = 100  # best products kept in the persisted ranking
 
 # Commission rate benchmarks by network (used to normalize scoring)
 COMMISSION_BENCHMARKS = {
@@ -64,6 +85,55 @@ CATEGORY_CVR_BENCHMARKS = {
 
 CATEGORIES = list(CATEGORY_CVR_BENCHMARKS.keys())
 
+# Composite score weights (must sum to 1)
+SCORE_WEIGHTS = {
+    "commission": 0.30,
+    "conversion": 0.25,
+    "trend": 0.25,
+    "competition": 0.20,
+}
+
+# Sensitivity sweep defaults: random weight vectors drawn around
+# SCORE_WEIGHTS (higher concentration = closer to it), and benchmark
+# perturbations scaling commission thresholds and category CVRs by
+# 1 - spread, 1 and 1 + spread.
+SWEEP_SAMPLES = 1000
+SWEEP_CONCENTRATION = 20
+SWEEP_BENCH_SPREAD = 0.2
+
+# Trend velocity from dated observations. Each signal keeps an EWMA of
+# log(1 + value) and of its slope per day (Holt smoothing for uneven gaps);
+# velocity is the weighted mean slope. One trend point = TREND_POINT_SLOPE
+# log-growth per day (2%/day) either side of a stable 5. Until a product has
+# TREND_MIN_OBSERVATIONS observations its manual trend_score is used.
+TREND_SIGNALS = {
+    "views": 1.0,      # video / hashtag views in the period observed
+    "orders": 2.0,     # orders in the period observed
+    "sightings": 1.0,  # competitor videos seen promoting it per day (see fold_sightings)
+}
+TREND_LEVEL_HALF_LIFE = 3.0   # days
+TREND_SLOPE_HALF_LIFE = 7.0   # days
+TREND_POINT_SLOPE = 0.02
+TREND_MIN_OBSERVATIONS = 3
+
+# Export column names accepted by `import` for each product field, compared
+# in snake case ("Commission Rate (%)" -> commission_rate), first match
+# wins. `--map COLUMN=FIELD` adds more.
+IMPORT_COLUMNS = {
+    "id": ["id", "product_id", "sku", "item_id", "asin"],
+    "name": ["name", "product_name", "product", "title"],
+    "price_usd": ["price_usd", "price", "sale_price", "item_price"],
+    "commission_pct": ["commission_pct", "commission", "commission_rate"],
+    "network": ["network", "platform", "marketplace"],
+    "category": ["category", "product_category", "niche"],
+    "trend_score": ["trend_score", "trend", "popularity"],
+    "competition_level": ["competition_level", "competition"],
+    "affiliate_url": ["affiliate_url", "url", "product_url", "link"],
+    "notes": ["notes"],
+}
+IMPORT_BATCH = 10_000  # products scored per score_catalog call during import
+_NETWORKS = {name.lower(): name for name in COMMISSION_BENCHMARKS}
+
 # ---------------------------------------------------------------------------
 # Data helpers
 # ---------------------------------------------------------------------------
@@ -89,7 +159,35 @@ def load_research():
 
 
 def save_research(data):
+    """Save the research database and the ranking derived from it."""
     save_json(RESEARCH_FILE, data)
+    save_json(RANKING_FILE, {"stamp": _research_stamp(), "products": build_ranking(data)})
+
+
+def _research_stamp():
+    if not RESEARCH_FILE.exists():
+        return None
+    st = RESEARCH_FILE.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def build_ranking(research: dict) -> list:
+    """The RANKING_SIZE best products by composite score; ties keep database order."""
+    top = heapq.nsmallest(
+        RANKING_SIZE, enumerate(research.values()),
+        key=lambda item: (-item[1].get("composite_score", 0), item[0]),
+    )
+    return [product for _, product in top]
+
+
+def load_ranking() -> list:
+    """The persisted ranking, rebuilt if the database was changed behind its back."""
+    ranking = load_json(RANKING_FILE, None)
+    if ranking is None or ranking.get("stamp") != _research_stamp():
+        ranking = {"stamp": _research_stamp(), "products": build_ranking(load_research())}
+        ensure_data_dir()
+        save_json(RANKING_FILE, ranking)
+    return ranking["products"]
 
 
 def load_competitors():
@@ -103,9 +201,10 @@ def save_competitors(data):
 # Scoring engine
 # ---------------------------------------------------------------------------
 
-def score_commission(commission_pct: float, network: str) -> float:
+def score_commission(commission_pct: float, network: str, benchmarks: dict = None) -> float:
     """Score 0-10 based on commission rate relative to network benchmarks."""
-    bench = COMMISSION_BENCHMARKS.get(network, COMMISSION_BENCHMARKS["Direct"])
+    benchmarks = benchmarks or COMMISSION_BENCHMARKS
+    bench = benchmarks.get(network, benchmarks["Direct"])
     if commission_pct >= bench["excellent"]:
         return 10.0
     elif commission_pct >= bench["good"]:
@@ -116,12 +215,12 @@ def score_commission(commission_pct: float, network: str) -> float:
         return max(1.0, 4.0 * commission_pct / bench["average"])
 
 
-def score_conversion_potential(category: str, price_usd: float) -> float:
+def score_conversion_potential(category: str, price_usd: float, benchmarks: dict = None) -> float:
     """
     Score 0-10 based on category CVR benchmark + price point.
     Sweet spot: $30-$100 for TikTok audiences.
     """
-    base_cvr = CATEGORY_CVR_BENCHMARKS.get(category, 0.025)
+    base_cvr = (benchmarks or CATEGORY_CVR_BENCHMARKS).get(category, 0.025)
     cvr_score = min(10.0, base_cvr / 0.05 * 10)  # normalize to 0-10
 
     # Price penalty: very cheap (<$15) or very expensive (>$300) converts worse
@@ -143,12 +242,18 @@ def score_conversion_potential(category: str, price_usd: float) -> float:
 
 def score_trend_velocity(trend_score: int) -> float:
     """
-    trend_score: 1-10 manually entered (based on TikTok Creative Center, Google Trends).
+    trend_score: 1-10 manually entered (based on TikTok Creative Center, Google Trends)
+    or computed from signal observations (see record_observations).
     1 = declining, 5 = stable, 10 = viral/exploding
     """
     return float(min(10, max(1, trend_score)))
 
 
+def _trend_input(product: dict):
+    """The trend rating to score: computed from signals once there are enough, else manual."""
+    return product.get("signal_trend", product.get("trend_score", 5))
+
+
 def score_competition(competition_level: str) -> float:
     """
     competition_level: 'low', 'medium', 'high', 'saturated'
@@ -163,9 +268,19 @@ def score_competition(competition_level: str) -> float:
     return mapping.get(competition_level.lower(), 5.0)
 
 
+def weighted_composite(s_commission: float, s_conversion: float, s_trend: float,
+                       s_competition: float, weights: tuple = None) -> float:
+    """
+    Unrounded weighted sum of the four sub-scores. weights is a
+    (commission, conversion, trend, competition) tuple; SCORE_WEIGHTS if omitted.
+    """
+    wc, wv, wt, wk = weights or tuple(SCORE_WEIGHTS.values())
+    return s_commission * wc + s_conversion * wv + s_trend * wt + s_competition * wk
+
+
 def compute_composite_score(product: dict) -> float:
     """
-    Weighted composite score (0-10):
+    Weighted composite score (0-10), weights from SCORE_WEIGHTS:
       - Commission:           30%
       - Conversion potential: 25%
       - Trend velocity:       25%
@@ -179,17 +294,10 @@ def compute_composite_score(product: dict) -> float:
         product.get("category", "other"),
         product.get("price_usd", 50)
     )
-    s_trend = score_trend_velocity(product.get("trend_score", 5))
+    s_trend = score_trend_velocity(_trend_input(product))
     s_competition = score_competition(product.get("competition_level", "medium"))
 
-    composite = (
-        s_commission * 0.30 +
-        s_conversion * 0.25 +
-        s_trend * 0.25 +
-        s_competition * 0.20
-    )
-
-    return round(composite, 2)
+    return round(weighted_composite(s_commission, s_conversion, s_trend, s_competition), 2)
 
 
 def estimated_weekly_epc(product: dict) -> float:
@@ -198,6 +306,248 @@ def estimated_weekly_epc(product: dict) -> float:
     cvr = CATEGORY_CVR_BENCHMARKS.get(product.get("category", "other"), 0.025)
     return round(commission_usd * cvr, 4)
 
+
+def score_inputs_hash(product: dict) -> str:
+    """
+    Provenance of a product's score: a hash of the fields it is computed
+    from, the benchmark entries those fields select, and SCORING_VERSION.
+    Editing one network's or category's benchmark only changes the hash of
+    the products that use it.
+    """
+    network = product.get("network", "Direct")
+    category = product.get("category", "other")
+    key = (
+        SCORING_VERSION,
+        product.get("commission_pct"), network, category, product.get("price_usd"),
+        _trend_input(product), product.get("competition_level"),
+        COMMISSION_BENCHMARKS.get(network, COMMISSION_BENCHMARKS["Direct"]),
+        CATEGORY_CVR_BENCHMARKS.get(category, 0.025),
+    )
+    return hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+
+
+def rescore(products: list) -> None:
+    """Score products in place, recording the hash of the inputs used."""
+    scores, epcs = score_catalog(products)
+    for product, score, epc in zip(products, scores, epcs):
+        product["composite_score"] = score
+        product["estimated_epc"] = epc
+        product["score_hash"] = score_inputs_hash(product)
+
+
+def _map_distinct(fn, *columns) -> list:
+    """fn applied row-wise over the columns, calling it once per distinct row."""
+    cache = {}
+    out = []
+    for key in zip(*columns):
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = fn(*key)
+        out.append(value)
+    return out
+
+
+def _epc(price_usd, commission_pct, category):
+    return estimated_weekly_epc({"price_usd": price_usd, "commission_pct": commission_pct,
+                                 "category": category})
+
+
+def score_catalog(products: list) -> tuple:
+    """
+    Composite scores and estimated EPCs for a whole catalog, in product order.
+
+    This is a dedupe cache, not vectorised scoring: each sub-score is computed
+    by the scalar functions above once per distinct input (network x
+    commission rate, category x price, ...) and mapped back onto the rows.
+    Marketplace exports repeat a few rates, price points and categories
+    across many SKUs, which is where the saving comes from; with continuous
+    prices every row is its own input and this costs the same as scoring
+    product by product. Results are identical to compute_composite_score and
+    estimated_weekly_epc.
+    """
+    categories = [p.get("category", "other") for p in products]
+    prices = [p.get("price_usd", 50) for p in products]
+
+    s_commission = _map_distinct(
+        score_commission,
+        [p.get("commission_pct", 0) for p in products],
+        [p.get("network", "Direct") for p in products],
+    )
+    s_conversion = _map_distinct(score_conversion_potential, categories, prices)
+    s_trend = _map_distinct(score_trend_velocity, [_trend_input(p) for p in products])
+    s_competition = _map_distinct(
+        score_competition, [p.get("competition_level", "medium") for p in products]
+    )
+
+    weights = tuple(SCORE_WEIGHTS.values())
+    scores = [
+        round(weighted_composite(c, v, t, k, weights), 2)
+        for c, v, t, k in zip(s_commission, s_conversion, s_trend, s_competition)
+    ]
+    epcs = _map_distinct(_epc, prices, [p.get("commission_pct", 10) for p in products], categories)
+    return scores, epcs
+
+# ---------------------------------------------------------------------------
+# Sensitivity sweep
+# ---------------------------------------------------------------------------
+
+def _sweep_columns(products: list) -> dict:
+    """
+    The catalog's scoring inputs as columns, with the sub-scores that no
+    benchmark affects already computed. Unknown networks and categories
+    become Direct / other, as the scalar functions score them.
+    """
+    return {
+        "commission_pct": [p.get("commission_pct", 0) for p in products],
+        "network": [n if n in COMMISSION_BENCHMARKS else "Direct"
+                    for n in (p.get("network", "Direct") for p in products)],
+        "category": [c if c in CATEGORY_CVR_BENCHMARKS else "other"
+                     for c in (p.get("category", "other") for p in products)],
+        "price_usd": [p.get("price_usd", 50) for p in products],
+        "trend": _map_distinct(score_trend_velocity, [_trend_input(p) for p in products]),
+        "competition": _map_distinct(
+            score_competition, [p.get("competition_level", "medium") for p in products]
+        ),
+    }
+
+
+def _sub_score_rows(columns: dict, commission_scale: float = 1.0, cvr_scale: float = 1.0) -> list:
+    """
+    (commission, conversion, trend, competition) sub-scores per product with
+    the commission thresholds and category CVRs scaled.
+    """
+    commission = {net: {k: v * commission_scale for k, v in bench.items()}
+                  for net, bench in COMMISSION_BENCHMARKS.items()}
+    cvr = {cat: v * cvr_scale for cat, v in CATEGORY_CVR_BENCHMARKS.items()}
+    return list(zip(
+        _map_distinct(lambda pct, net: score_commission(pct, net, commission),
+                      columns["commission_pct"], columns["network"]),
+        _map_distinct(lambda cat, price: score_conversion_potential(cat, price, cvr),
+                      columns["category"], columns["price_usd"]),
+        columns["trend"],
+        columns["competition"],
+    ))
+
+
+def _skyband(rows: list, k: int) -> list:
+    """
+    Indices of the rows that can rank in the top k for some positive weight
+    vector (ties going to the earlier row): those beaten in every sub-score
+    by fewer than k others. Rows are grouped into a lattice by their
+    conversion / trend / competition scores, which take few distinct values;
+    each cell keeps the k best rows by commission score over all cells that
+    dominate it, built from its three upper neighbours.
+    """
+    axes = [sorted({row[d] for row in rows}) for d in (1, 2, 3)]
+    pos = [{value: i for i, value in enumerate(axis)} for axis in axes]
+    cells = {}
+    for i, (c, v, t, comp) in enumerate(rows):
+        cells.setdefault((pos[0][v], pos[1][t], pos[2][comp]), []).append((c, -i))
+
+    best = {}
+    for a in range(len(axes[0]) - 1, -1, -1):
+        for b in range(len(axes[1]) - 1, -1, -1):
+            for d in range(len(axes[2]) - 1, -1, -1):
+                pool = set(cells.get((a, b, d), ()))
+                for up in ((a + 1, b, d), (a, b + 1, d), (a, b, d + 1)):
+                    pool.update(best.get(up, ()))
+                if pool:
+                    best[(a, b, d)] = heapq.nlargest(k, pool)
+
+    keep = []
+    for cell, members in cells.items():
+        dominating = best[cell]  # best first, including the cell's own rows
+        for key in members:
+            if len(dominating) < k or key >= dominating[k - 1]:
+                keep.append(-key[1])
+    return sorted(keep)
+
+
+def weight_grid(step: float) -> list:
+    """Every weight vector on the simplex in multiples of `step`, all weights > 0."""
+    if not 0 < step <= 0.25:
+        raise ValueError(f"Grid step {step:g} leaves no weight vector with all four weights > 0; "
+                         f"use a step of at most 0.25.")
+    n = round(1 / step)
+    return [
+        (a * step, b * step, c * step, (n - a - b - c) * step)
+        for a in range(1, n) for b in range(1, n - a) for c in range(1, n - a - b)
+    ]
+
+
+def sample_weights(n: int, concentration: float = SWEEP_CONCENTRATION, seed: int = 0) -> list:
+    """n random weight vectors from a Dirichlet centred on SCORE_WEIGHTS."""
+    rng = random.Random(seed)
+    base = list(SCORE_WEIGHTS.values())
+    vectors = []
+    for _ in range(n):
+        draws = [rng.gammavariate(w * concentration, 1.0) for w in base]
+        total = sum(draws)
+        vectors.append(tuple(d / total for d in draws))
+    return vectors
+
+
+def sweep_rankings(products: list, weight_vectors: list, perturbations: list, top: int = 10) -> dict:
+    """
+    Rank the catalog under every (weight vector, benchmark perturbation)
+    scenario. Per perturbation the catalog is first cut down to its top-k
+    skyband (see _skyband), which holds every product that can make the
+    top `top` under any positive weights, so each scenario only ranks that
+    short list. Scores here are unrounded.
+
+    Returns the baseline top list (SCORE_WEIGHTS, unperturbed), the ranks
+    each product held in the scenarios where it made the top list, and each
+    scenario's top list.
+    """
+    baseline = None
+    placed = {}
+    orders = []
+    candidates = 0
+
+    columns = _sweep_columns(products)
+    for scale in dict.fromkeys([(1.0, 1.0)] + list(perturbations)):
+        rows = _sub_score_rows(columns, *scale)
+        band = _skyband(rows, top)
+        candidates = max(candidates, len(band))
+        band_rows = [rows[i] for i in band]
+
+        def ranked(weights):
+            scored = [(weighted_composite(*row, weights), -i)
+                      for i, row in zip(band, band_rows)]
+            return [-i for _, i in heapq.nlargest(top, scored)]
+
+        if scale == (1.0, 1.0):
+            baseline = ranked(tuple(SCORE_WEIGHTS.values()))
+        if scale not in perturbations:
+            continue
+        for weights in weight_vectors:
+            order = ranked(weights)
+            for rank, i in enumerate(order, 1):
+                placed.setdefault(i, []).append(rank)
+            orders.append(order)
+
+    return {"candidates": candidates, "baseline": baseline, "placed": placed, "orders": orders}
+
+
+def rank_stability(result: dict, top: int = 10) -> dict:
+    """Summary of how far the scenario top lists move from the baseline one."""
+    baseline = result["baseline"]
+    base_rank = {i: rank for rank, i in enumerate(baseline, 1)}
+    orders = result["orders"]
+    overlap = [len(base_rank.keys() & set(order)) for order in orders]
+    shifts = []
+    for order in orders:
+        rank = {i: r for r, i in enumerate(order, 1)}
+        shifts.extend(abs(rank.get(i, top + 1) - r) for i, r in base_rank.items())
+    return {
+        "scenarios": len(orders),
+        "mean_overlap": sum(overlap) / len(overlap) if overlap else 0.0,
+        "worst_overlap": min(overlap, default=0),
+        "same_leader": (sum(1 for o in orders if o and baseline and o[0] == baseline[0]) / len(orders)
+                        if orders else 0.0),
+        "mean_rank_shift": sum(shifts) / len(shifts) if shifts else 0.0,
+    }
+
 # ---------------------------------------------------------------------------
 # Product operations
 # ---------------------------------------------------------------------------
@@ -209,8 +559,7 @@ def add_product(product: dict) -> dict:
     if pid in research:
         raise ValueError(f"Product {pid} already exists. Use update to modify.")
 
-    product["composite_score"] = compute_composite_score(product)
-    product["estimated_epc"] = estimated_weekly_epc(product)
+    rescore([product])
     product["added_at"] = datetime.now().isoformat()
     product["status"] = "researching"
 
@@ -221,19 +570,35 @@ def add_product(product: dict) -> dict:
 
 def update_product(product_id: str, updates: dict) -> dict:
     """Update a product's data and recompute score."""
-    research = load_research()
-    if product_id not in research:
+    updated = update_products({product_id: updates})
+    if product_id not in updated:
         raise ValueError(f"Product {product_id} not found.")
-    research[product_id].update(updates)
-    research[product_id]["composite_score"] = compute_composite_score(research[product_id])
-    research[product_id]["estimated_epc"] = estimated_weekly_epc(research[product_id])
-    research[product_id]["updated_at"] = datetime.now().isoformat()
-    save_research(research)
-    return research[product_id]
+    return updated[product_id]
+
+
+def update_products(updates: dict) -> dict:
+    """
+    Apply {product_id: fields} updates and rescore them in a single save.
+    Unknown ids are skipped. Returns the updated products by id.
+    """
+    research = load_research()
+    now = datetime.now().isoformat()
+    updated = {}
+    for product_id, fields in updates.items():
+        if product_id in research:
+            research[product_id].update(fields)
+            research[product_id]["updated_at"] = now
+            updated[product_id] = research[product_id]
+    if updated:
+        rescore(list(updated.values()))
+        save_research(research)
+    return updated
 
 
 def get_top_10(this_week_only: bool = False) -> list:
-    """Return top 10 products by composite score."""
+    """Return top 10 products by composite score (from the persisted ranking)."""
+    if not this_week_only:
+        return load_ranking()[:10]
     research = load_research()
     products = list(research.values())
 
@@ -281,6 +646,344 @@ def log_competitor_product(handle: str, product_name: str, video_url: str,
     competitors[handle]["products_observed"].append(entry)
     competitors[handle]["last_checked"] = datetime.now().isoformat()
     save_competitors(competitors)
+    ensure_data_dir()
+    with open(SIGHTINGS_FILE, "a") as f:
+        f.write(json.dumps({"product": product_name, "date": entry["observed_at"]}) + "\n")
+    fold_sightings()
+
+
+def fold_sightings(today=None) -> dict:
+    """
+    Turn competitor sightings into one "sightings" observation per product
+    per day, valued at that day's count. Lines appended to the sightings log
+    since the last fold are tallied into per-day counts kept in
+    SIGHTINGS_STATE_FILE; days before `today` are complete and are recorded
+    in one record_observations call, so the product database is rewritten at
+    most once a day rather than on every sighting. Returns its counts.
+    """
+    state = load_json(SIGHTINGS_STATE_FILE, {"offset": 0, "days": {}})
+    days = state["days"]
+    changed = False
+    if SIGHTINGS_FILE.exists():
+        with open(SIGHTINGS_FILE, "rb") as f:
+            f.seek(state["offset"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                sighting = json.loads(line)
+                counts = days.setdefault(sighting["date"][:10], {})
+                counts[sighting["product"]] = counts.get(sighting["product"], 0) + 1
+                state["offset"] += len(line)
+                changed = True
+
+    today = (today or datetime.now().date()).isoformat()
+    observations = [
+        (product, "sightings", count, day)
+        for day in sorted(d for d in days if d < today)
+        for product, count in days.pop(day).items()
+    ]
+    result = {"logged": 0, "applied": 0, "duplicates": 0, "rescored": 0}
+    if observations:
+        result = record_observations(observations)
+        changed = True
+    if changed:
+        ensure_data_dir()
+        save_json(SIGHTINGS_STATE_FILE, state)
+    return result
+
+# ---------------------------------------------------------------------------
+# Trend signals
+# ---------------------------------------------------------------------------
+
+def update_signal(state, value: float, when: datetime) -> dict:
+    """
+    Fold one observation into a signal's smoothed state in O(1): Holt's
+    level + slope on log(1 + value), with smoothing weights scaled to the
+    gap since the previous observation. Same-time or out-of-order
+    observations only nudge the level.
+    """
+    x = math.log1p(max(value, 0))
+    if state is None:
+        return {"at": when.isoformat(), "level": x, "slope": 0.0, "n": 1}
+    last = datetime.fromisoformat(state["at"])
+    gap = (when - last).total_seconds() / 86400
+    if gap <= 0:
+        state["level"] += 0.5 * (x - state["level"])
+        state["n"] += 1
+        return state
+    alpha = 1 - 0.5 ** (gap / TREND_LEVEL_HALF_LIFE)
+    beta = 1 - 0.5 ** (gap / TREND_SLOPE_HALF_LIFE)
+    predicted = state["level"] + state["slope"] * gap
+    level = predicted + alpha * (x - predicted)
+    state["slope"] += beta * ((level - state["level"]) / gap - state["slope"])
+    state["level"] = level
+    state["at"] = when.isoformat()
+    state["n"] += 1
+    return state
+
+
+def signal_trend(signals: dict):
+    """1-10 trend rating from a product's signal states, or None until there are enough."""
+    if sum(state["n"] for state in signals.values()) < TREND_MIN_OBSERVATIONS:
+        return None
+    moving = {name: state for name, state in signals.items() if state["n"] > 1}
+    if not moving:
+        return None
+    weight = sum(TREND_SIGNALS[name] for name in moving)
+    velocity = sum(TREND_SIGNALS[name] * state["slope"] for name, state in moving.items()) / weight
+    return round(min(10.0, max(1.0, 5 + velocity / TREND_POINT_SLOPE)), 1)
+
+
+def _product_lookup(research: dict):
+    """Resolve a product by id, by slug of its name, or by name (case-insensitive)."""
+    by_name = None
+
+    def find(ref):
+        nonlocal by_name
+        ref = str(ref).strip()
+        if ref in research:
+            return ref
+        if _slug(ref) in research:
+            return _slug(ref)
+        if by_name is None:
+            by_name = {str(p.get("name", "")).lower(): pid for pid, p in research.items()}
+        return by_name.get(ref.lower())
+
+    return find
+
+
+def _observation_time(when, now: datetime) -> datetime:
+    """
+    An observation's time as a naive local datetime, from a datetime, an ISO
+    string or None (now). Offset-aware times are converted to local time.
+    """
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    when = when or now
+    if when.tzinfo is not None:
+        when = when.astimezone().replace(tzinfo=None)
+    return when
+
+
+def record_observations(observations) -> dict:
+    """
+    Record dated (product, signal, value, when) observations; `product` is
+    an id or name and `when` a datetime / ISO string (None = now), stored
+    as naive local time.
+
+    Every observation is appended to the signal log. Observations of known
+    products update that signal's smoothed state on the product and its
+    computed trend rating; products whose rating changed are rescored and
+    the database is saved once. An observation dated exactly when that
+    product's signal was last observed is a repeat (e.g. a replayed page)
+    and is dropped, as is a value that is not a finite number. Returns
+    {"logged", "applied", "duplicates", "invalid", "rescored"}.
+    """
+    research = load_research()
+    find = _product_lookup(research)
+    now = datetime.now()
+    lines = []
+    touched = {}
+    applied = 0
+    duplicates = 0
+    invalid = 0
+    for ref, signal, value, when in observations:
+        if signal not in TREND_SIGNALS:
+            raise ValueError(f"Unknown signal '{signal}'. Choose from: {', '.join(TREND_SIGNALS)}")
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = math.nan
+        if not math.isfinite(value):
+            invalid += 1
+            continue
+        when = _observation_time(when, now)
+        pid = find(ref)
+        previous = research[pid].get("signals", {}).get(signal) if pid is not None else None
+        if previous is not None and previous["at"] == when.isoformat():
+            duplicates += 1
+            continue
+        lines.append(json.dumps({"product_id": pid or str(ref), "signal": signal,
+                                 "value": value, "date": when.isoformat()}) + "\n")
+        if pid is None:
+            continue
+        product = research[pid]
+        signals = product.setdefault("signals", {})
+        signals[signal] = update_signal(previous, value, when)
+        touched[pid] = product
+        applied += 1
+
+    ensure_data_dir()
+    with open(SIGNALS_FILE, "a") as f:
+        f.writelines(lines)
+
+    stale = []
+    for product in touched.values():
+        trend = signal_trend(product["signals"])
+        if trend is not None and trend != product.get("signal_trend"):
+            product["signal_trend"] = trend
+            stale.append(product)
+    rescore(stale)
+    if touched:
+        save_research(research)
+    return {"logged": len(lines), "applied": applied, "duplicates": duplicates,
+            "invalid": invalid, "rescored": len(stale)}
+
+# ---------------------------------------------------------------------------
+# Bulk import
+# ---------------------------------------------------------------------------
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _parse_number(value) -> float:
+    """Accept 24.99, '$24.99', '1,299' or '15%'. ValueError for NaN or infinity."""
+    text = str(value).strip().replace(",", "").replace("$", "").rstrip("%")
+    number = float(text)
+    if not math.isfinite(number):
+        raise ValueError(f"{value!r} is not a finite number")
+    return number
+
+
+def _parse_observation(row: dict) -> tuple:
+    """(product, signal, value, when) from a `signal` row; ValueError naming the bad field."""
+    product = str(row.get("product") or row.get("product_id") or "").strip()
+    if not product:
+        raise ValueError("no product")
+    signal = str(row.get("signal") or "").strip()
+    if signal not in TREND_SIGNALS:
+        raise ValueError(f"unknown signal '{signal}'")
+    try:
+        value = _parse_number(row.get("value"))
+    except ValueError:
+        value = math.nan
+    if not math.isfinite(value) or value < 0:
+        raise ValueError(f"value {row.get('value')!r} is not a count")
+    try:
+        when = _observation_time(row.get("date") or None, datetime.now())
+    except (TypeError, ValueError):
+        raise ValueError(f"date {row.get('date')!r} is not an ISO date")
+    return product, signal, value, when
+
+
+def _column_key(name) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_")
+
+
+def _column_map(keys, columns: dict) -> dict:
+    """{product field: export column} for one header."""
+    by_name = {}
+    for k in keys:
+        by_name.setdefault(_column_key(k), k)
+    mapping = {}
+    for field, names in columns.items():
+        for name in names:
+            if name in by_name:
+                mapping[field] = by_name[name]
+                break
+    return mapping
+
+
+def _export_fields(row: dict, mapping: dict) -> dict:
+    """
+    The non-blank mapped fields of one export row in the research schema.
+    Raises ValueError on a non-numeric or non-finite price, commission or
+    trend score.
+    """
+    fields = {}
+    for field, column in mapping.items():
+        value = row.get(column)
+        if value is None or str(value).strip() == "":
+            continue
+        if field in ("price_usd", "commission_pct"):
+            value = _parse_number(value)
+        elif field == "trend_score":
+            value = int(round(_parse_number(value)))
+        elif field == "category":
+            value = _slug(str(value)).replace("-", "_")
+        elif field == "competition_level":
+            value = str(value).strip().lower()
+        elif field == "network":
+            value = str(value).strip()
+            value = _NETWORKS.get(value.lower(), value)
+        else:
+            value = str(value).strip()
+        fields[field] = value
+    return fields
+
+
+def import_products(path, column_map=None, network=None, batch_size=IMPORT_BATCH) -> dict:
+    """
+    Stream a CSV / NDJSON export into the research database.
+
+    Columns are mapped to the product schema via IMPORT_COLUMNS plus
+    `column_map` ({column: field}); rows without an id use a slug of the
+    name. Products are merged by id: new ones are added as researching,
+    existing ones take the export's non-blank values. Repeated ids in the
+    file count once (first wins). `network` fills in rows that have none.
+    Changed products are scored in batches of `batch_size` and the
+    database is written once at the end.
+    """
+    columns = {field: list(names) for field, names in IMPORT_COLUMNS.items()}
+    for column, field in (column_map or {}).items():
+        if field not in columns:
+            raise ValueError(f"Unknown product field '{field}'. Choose from: {', '.join(columns)}")
+        columns[field].insert(0, _column_key(column))
+
+    research = load_research()
+    now = datetime.now().isoformat()
+    seen = set()
+    mappings = {}
+    batch = []
+    counts = {"added": 0, "updated": 0, "unchanged": 0, "duplicates": 0, "skipped": 0}
+
+    def flush():
+        rescore(batch)
+        batch.clear()
+
+    for row in brand_outreach.iter_import_rows(Path(path)):
+        keys = tuple(row)
+        mapping = mappings.get(keys)
+        if mapping is None:
+            mapping = mappings[keys] = _column_map(keys, columns)
+        try:
+            fields = _export_fields(row, mapping)
+        except ValueError:
+            counts["skipped"] += 1
+            continue
+        pid = fields.pop("id", None) or _slug(fields.get("name", ""))
+        if not pid:
+            counts["skipped"] += 1
+            continue
+        if pid in seen:
+            counts["duplicates"] += 1
+            continue
+        seen.add(pid)
+        if network and "network" not in fields:
+            fields["network"] = network
+
+        product = research.get(pid)
+        if product is None:
+            product = research[pid] = {"id": pid, "name": pid, **fields,
+                                       "added_at": now, "status": "researching"}
+            counts["added"] += 1
+        elif any(product.get(k) != v for k, v in fields.items()):
+            product.update(fields)
+            product["updated_at"] = now
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+            continue
+        batch.append(product)
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+    if counts["added"] or counts["updated"]:
+        save_research(research)
+    return counts
 
 # ---------------------------------------------------------------------------
 # CLI
@@ -322,19 +1025,44 @@ def cmd_add(_args):
     print(f"  Commission/Sale:    ${price * commission_pct / 100:.2f}")
 
 
-def cmd_score(_args):
-    """Recompute scores for all products (useful after updating benchmarks)."""
+def cmd_import(args):
+    try:
+        column_map = dict(m.split("=", 1) for m in args.map)
+    except ValueError:
+        print("--map takes COLUMN=FIELD, e.g. --map 'Item Price=price_usd'")
+        return
+    start = time.perf_counter()
+    try:
+        counts = import_products(args.file, column_map, args.network)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"\n✓ Imported {args.file} in {time.perf_counter() - start:.1f}s")
+    print(f"  Added:          {counts['added']:>8,}")
+    print(f"  Updated:        {counts['updated']:>8,}")
+    print(f"  Unchanged:      {counts['unchanged']:>8,}")
+    print(f"  Duplicate rows: {counts['duplicates']:>8,}")
+    print(f"  Skipped (bad):  {counts['skipped']:>8,}")
+
+
+def cmd_score(args):
+    """
+    Rescore products whose inputs or benchmarks changed since they were last
+    scored (all of them with --all). The database is only rewritten if any were.
+    """
     research = load_research()
-    for pid, product in research.items():
-        research[pid]["composite_score"] = compute_composite_score(product)
-        research[pid]["estimated_epc"] = estimated_weekly_epc(product)
-    save_research(research)
-    print(f"✓ Rescored {len(research)} products.")
-    cmd_top10(_args)
+    stale = [p for p in research.values()
+             if args.all or p.get("score_hash") != score_inputs_hash(p)]
+    if stale:
+        rescore(stale)
+        save_research(research)
+    print(f"✓ Rescored {len(stale)} of {len(research)} products.")
+    cmd_top10(args)
 
 
 def cmd_top10(_args):
     """Display the top 10 products to promote this week."""
+    fold_sightings()
     top = get_top_10()
     if not top:
         print("No products in database. Use `add` to add products.")
@@ -350,7 +1078,7 @@ def cmd_top10(_args):
         print(
             f"{i:<3} {p['name'][:21]:<22} {p.get('network','')[:15]:<16} "
             f"${p.get('price_usd',0):<7.0f} {p.get('commission_pct',0):<7.0f} "
-            f"{p.get('trend_score',0):<7} {p.get('competition_level','')[:9]:<10} "
+            f"{_trend_input(p):<7} {p.get('competition_level','')[:9]:<10} "
             f"{p.get('composite_score',0):<7} ${p.get('estimated_epc',0):.4f}"
         )
     print(f"\nTop pick: {top[0]['name']} — Score {top[0]['composite_score']}/10")
@@ -386,6 +1114,48 @@ def cmd_competitor(_args):
                 print(f"  → {obs['product']} ({obs['estimated_views']:,} views) — {obs['observed_at'][:10]}")
 
 
+def cmd_signal(args):
+    """Record one observation, or a CSV / NDJSON file of them (product, signal, value, date)."""
+    bad = []
+    if args.file:
+        observations = []
+        for n, row in enumerate(brand_outreach.iter_import_rows(Path(args.file)), 1):
+            try:
+                observations.append(_parse_observation(row))
+            except ValueError as e:
+                bad.append(f"row {n}: {e}")
+    elif args.product and args.signal and args.value is not None:
+        try:
+            observations = [_parse_observation({"product": args.product, "signal": args.signal,
+                                                "value": args.value, "date": args.date})]
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+    else:
+        print("Give PRODUCT SIGNAL VALUE, or --file.")
+        return
+    try:
+        result = record_observations(observations)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"✓ Logged {result['logged']} observation(s); {result['applied']} matched a product, "
+          f"{result['rescored']} product(s) rescored.")
+    if result["duplicates"]:
+        print(f"  Ignored {result['duplicates']} repeat(s) of an observation already recorded.")
+    if bad:
+        print(f"  Skipped {len(bad)} unusable row(s):")
+        for problem in bad[:10]:
+            print(f"    {problem}")
+        if len(bad) > 10:
+            print(f"    … and {len(bad) - 10} more")
+    if not args.file and result["applied"]:
+        research = load_research()
+        product = research[_product_lookup(research)(args.product)]
+        source = "signals" if "signal_trend" in product else "manual (not enough observations yet)"
+        print(f"  Trend: {_trend_input(product)} — {source}   Score: {product.get('composite_score')}/10")
+
+
 def cmd_trends(_args):
     """Show category CVR benchmarks and trend guidance."""
     print(f"\n{'='*60}")
@@ -404,23 +1174,129 @@ def cmd_trends(_args):
     print("  - Exploding Topics: explodingtopics.com")
 
 
+def cmd_sweep(args):
+    """Top-list sensitivity to the score weights and benchmarks, or one what-if scenario."""
+    research = load_research()
+    products = list(research.values())
+    if not products:
+        print("No products in database. Use `add` or `import` to add products.")
+        return
+
+    if args.weights:
+        try:
+            weights = [float(w) for w in args.weights.split(",")]
+        except ValueError:
+            weights = []
+        if len(weights) != 4 or not all(math.isfinite(w) and w > 0 for w in weights):
+            print("--weights takes four positive finite numbers: commission,conversion,trend,competition")
+            return
+        total = sum(weights)
+        weight_vectors = [tuple(w / total for w in weights)]
+        perturbations = [(args.commission_scale, args.cvr_scale)]
+        label = (f"what-if weights {'/'.join(f'{w:.0%}' for w in weight_vectors[0])}, "
+                 f"commission benchmarks ×{args.commission_scale:g}, CVR benchmarks ×{args.cvr_scale:g}")
+    else:
+        if args.grid:
+            try:
+                weight_vectors = weight_grid(args.grid)
+            except ValueError as e:
+                print(e)
+                return
+            label = f"{len(weight_vectors):,} weight vectors (grid step {args.grid:g})"
+        else:
+            if args.samples <= 0:
+                print("--samples must be at least 1")
+                return
+            weight_vectors = sample_weights(args.samples, seed=args.seed)
+            label = f"{len(weight_vectors):,} weight vectors (random, around current weights)"
+        spread = args.spread
+        scales = sorted({1.0 - spread, 1.0, 1.0 + spread})
+        perturbations = [(c, v) for c in scales for v in scales]
+        label += f" × {len(perturbations)} benchmark perturbations (±{spread:.0%})"
+
+    start = time.perf_counter()
+    result = sweep_rankings(products, weight_vectors, perturbations, args.top)
+    stats = rank_stability(result, args.top)
+    elapsed = time.perf_counter() - start
+    base_rank = {i: rank for rank, i in enumerate(result["baseline"], 1)}
+
+    print(f"\n{'='*90}")
+    print(f"SENSITIVITY SWEEP — {stats['scenarios']:,} scenarios over {len(products):,} products ({elapsed:.1f}s)")
+    print(f"{'='*90}")
+    print(f"  {label}")
+    print(f"  Products that can reach the top {args.top}:   {result['candidates']:,}")
+    print(f"  Top-{args.top} overlap with current ranking:   "
+          f"mean {stats['mean_overlap']:.1f}/{args.top}, worst {stats['worst_overlap']}/{args.top}")
+    print(f"  Current #1 stays #1:                 {stats['same_leader']:.0%} of scenarios")
+    print(f"  Mean rank shift of current top {args.top}:   {stats['mean_rank_shift']:.1f}"
+          f"  (dropping out counts as #{args.top + 1})")
+
+    placed = result["placed"]
+    rows = sorted(
+        ((i, sorted(ranks)) for i, ranks in placed.items()),
+        key=lambda item: (-len(item[1]), item[1][len(item[1]) // 2], base_rank.get(item[0], args.top + 1)),
+    )
+    print(f"\n{'Product':<28} {'Now':<5} {'In top ' + str(args.top):<11} {'Best':<6} {'Median':<8} {'Worst'}")
+    print(f"{'-'*90}")
+    for i, ranks in rows[:20]:
+        now = base_rank.get(i, "—")
+        share = len(ranks) / stats["scenarios"]
+        print(f"{products[i]['name'][:27]:<28} {now!s:<5} {share:<11.0%} {ranks[0]:<6} "
+              f"{ranks[len(ranks) // 2]:<8} {ranks[-1]}")
+    if len(rows) > 20:
+        print(f"  … {len(rows) - 20} more products reach the top {args.top} in some scenario")
+    dropped = [i for i in result["baseline"] if i not in placed]
+    for i in dropped:
+        print(f"{products[i]['name'][:27]:<28} {base_rank[i]!s:<5} {0:<11.0%}")
+
+
 def main():
     ensure_data_dir()
     parser = argparse.ArgumentParser(description="Affiliate Product Research & Scoring")
     subparsers = parser.add_subparsers(dest="command")
     subparsers.add_parser("add", help="Add a product to research")
-    subparsers.add_parser("score", help="Rescore all products")
+    imp = subparsers.add_parser("import", help="Bulk import a CSV / NDJSON product export")
+    imp.add_argument("file", help="CSV, or .ndjson / .jsonl with one product per line")
+    imp.add_argument("--map", action="append", default=[], metavar="COLUMN=FIELD",
+                     help="Map an export column to a product field (repeatable)")
+    imp.add_argument("--network", help="Network for rows that don't name one (e.g. 'TikTok Shop')")
+    score = subparsers.add_parser("score", help="Rescore products whose inputs or benchmarks changed")
+    score.add_argument("--all", action="store_true", help="Rescore every product")
     subparsers.add_parser("top10", help="Show top 10 products this week")
     subparsers.add_parser("competitor", help="Track competitor creators")
     subparsers.add_parser("trends", help="Show category trend benchmarks")
+    signal = subparsers.add_parser("signal", help="Record a dated trend signal observation")
+    signal.add_argument("product", nargs="?", help="Product ID or name")
+    signal.add_argument("signal", nargs="?", choices=list(TREND_SIGNALS), help="Signal observed")
+    signal.add_argument("value", nargs="?", type=float, help="Count observed (views, orders, ...)")
+    signal.add_argument("--date", help="When it was observed (ISO date, default now)")
+    signal.add_argument("--file", help="CSV / NDJSON of product, signal, value, date rows")
+    sweep = subparsers.add_parser("sweep", help="Top-10 sensitivity to score weights and benchmarks")
+    sweep.add_argument("--samples", type=int, default=SWEEP_SAMPLES,
+                       help=f"Random weight vectors to try (default {SWEEP_SAMPLES})")
+    sweep.add_argument("--grid", type=float, metavar="STEP",
+                       help="Try every weight vector in steps of STEP (e.g. 0.05) instead")
+    sweep.add_argument("--spread", type=float, default=SWEEP_BENCH_SPREAD,
+                       help=f"Benchmark perturbation, ± share (default {SWEEP_BENCH_SPREAD})")
+    sweep.add_argument("--top", type=int, default=10, help="Size of the top list (default 10)")
+    sweep.add_argument("--seed", type=int, default=0, help="Random seed for --samples")
+    sweep.add_argument("--weights", metavar="C,V,T,K",
+                       help="What-if: one scenario with these commission,conversion,trend,competition weights")
+    sweep.add_argument("--commission-scale", type=float, default=1.0,
+                       help="What-if: scale commission benchmarks (default 1)")
+    sweep.add_argument("--cvr-scale", type=float, default=1.0,
+                       help="What-if: scale category CVR benchmarks (default 1)")
 
     args = parser.parse_args()
     commands = {
         "add": cmd_add,
+        "import": cmd_import,
         "score": cmd_score,
         "top10": cmd_top10,
         "competitor": cmd_competitor,
         "trends": cmd_trends,
+        "signal": cmd_signal,
+        "sweep": cmd_sweep,
     }
     if args.command in commands:
         commands[args.command](args)
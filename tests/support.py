@@ -0,0 +1,30 @@
+"""Shared test helpers: put the scripts on sys.path and sandbox their data/ files."""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def use_temp_data_dir(test, *modules) -> Path:
+    """
+    Point each module's DATA_DIR, and every path constant under it, at a fresh
+    temporary directory for the duration of `test`. Returns that directory.
+    """
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    data = Path(tmp.name)
+    for module in modules:
+        original = module.DATA_DIR
+        for name, value in list(vars(module).items()):
+            if isinstance(value, Path) and (value == original or original in value.parents):
+                patcher = mock.patch.object(module, name, data / value.relative_to(original))
+                patcher.start()
+                test.addCleanup(patcher.stop)
+    return data
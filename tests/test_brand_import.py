@@ -0,0 +1,65 @@
+"""Bulk prospect import: merging, duplicate rows and the enrichment hook."""
+
+import unittest
+
+from support import FIXTURES, use_temp_data_dir
+
+import brand_outreach
+
+
+def niche_enricher(prospect):
+    """Stand-in for an enrichment API: fills a missing niche, nothing else."""
+    return {} if prospect.get("niche") else {"niche": "beauty"}
+
+
+def overreaching_enricher(prospect):
+    """Tries to move the deal along as well as fill in contact details."""
+    return {"contact": "partners@example.com", "stage": "closed_won", "touch_count": 9}
+
+
+def failing_enricher(prospect):
+    raise RuntimeError("enrichment API unavailable")
+
+
+class ImportProspectsTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_data_dir(self, brand_outreach)
+
+    def test_import_merges_and_counts_rows(self):
+        counts = brand_outreach.import_prospects(FIXTURES / "prospects.csv")
+        self.assertEqual(counts["added"], 2)
+        self.assertEqual(counts["duplicates"], 1)
+        self.assertEqual(counts["skipped"], 2)
+
+        prospects = brand_outreach.read_crm()["prospects"]
+        self.assertEqual(prospects["glow_labs"]["est_monthly_gmv"], 12_500.0)
+        self.assertEqual(prospects["kitchen_co"]["est_monthly_gmv"], 8_000.0)
+
+        again = brand_outreach.import_prospects(FIXTURES / "prospects.csv")
+        self.assertEqual((again["added"], again["unchanged"]), (0, 2))
+
+    def test_enricher_updates_are_saved(self):
+        counts = brand_outreach.import_prospects(FIXTURES / "prospects.csv", niche_enricher, workers=2)
+        self.assertEqual(counts["enriched"], 1)
+        self.assertEqual(brand_outreach.read_crm()["prospects"]["glow_labs"]["niche"], "beauty")
+
+    def test_enricher_cannot_set_stage_or_touch_history(self):
+        brand_outreach.import_prospects(FIXTURES / "prospects.csv", overreaching_enricher, workers=2)
+        crm = brand_outreach.read_crm()
+        glow = crm["prospects"]["glow_labs"]
+        self.assertEqual(glow["contact"], "partners@example.com")
+        self.assertEqual((glow["stage"], glow["touch_count"]), ("identified", 0))
+        self.assertEqual(crm["stats"]["stages"]["closed_won"]["count"], 0)
+
+    def test_failing_enricher_leaves_import_intact(self):
+        counts = brand_outreach.import_prospects(FIXTURES / "prospects.csv", failing_enricher)
+        self.assertEqual((counts["added"], counts["enrich_failed"]), (2, 2))
+
+    def test_enricher_spec_must_name_a_callable(self):
+        with self.assertRaises(ValueError):
+            brand_outreach.load_enricher("stub")
+        self.assertIs(brand_outreach.load_enricher("test_brand_import:niche_enricher"), niche_enricher)
+
+
+if __name__ == "__main__":
+    unittest.main()
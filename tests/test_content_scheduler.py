@@ -0,0 +1,54 @@
+"""Earnings estimates: measured views and link clicks are taken as-is, only forecasts use slot multipliers."""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from support import use_temp_data_dir
+
+import affiliate_tracker
+import content_scheduler
+
+TUESDAY_EVENING = "2026-10-13T19:00:00"
+
+
+class EarningsEstimateTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_data_dir(self, content_scheduler, affiliate_tracker)
+        for name in ("_calibration", "_rate_lookup"):
+            patcher = mock.patch.object(content_scheduler, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        video = content_scheduler.add_video_to_queue(
+            "Serum demo", "Glow Serum", "PAS", "glow-link", TUESDAY_EVENING,
+            "beauty", "Stop scrolling",
+        )
+        content_scheduler.mark_posted(video["id"])
+        posted = content_scheduler.load_posted()
+        posted[0]["posted_at"] = TUESDAY_EVENING
+        content_scheduler.save_posted(posted)
+        self.video_id = video["id"]
+
+    def test_actual_link_clicks_come_through_unchanged(self):
+        video = content_scheduler.update_metrics(self.video_id, 10_000, 500, 40, 12, link_clicks=100)
+        estimate = video["earnings_estimate"]
+        self.assertEqual(estimate["estimated_clicks"], 100)
+        self.assertEqual(estimate["estimated_earnings_usd"], 187.5)
+
+        result = content_scheduler.estimate_catalog()
+        self.assertEqual(result["total_estimated_earnings_usd"], 187.5)
+        estimate = content_scheduler.load_posted()[0]["earnings_estimate"]
+        self.assertEqual(estimate["estimated_clicks"], 100)
+
+    def test_uncalibrated_forecast_averages_to_baseline(self):
+        days = [content_scheduler.day_multiplier(d) for d in range(7)]
+        self.assertAlmostEqual(sum(days) / 7, 1.0)
+        self.assertGreater(days[1], days[0])  # Tuesday still beats Monday
+
+        tuesday = datetime.fromisoformat(TUESDAY_EVENING)
+        forecast = content_scheduler.estimate_earnings(10_000, scheduled_for=tuesday)
+        self.assertEqual(forecast["estimated_clicks"], int(10_000 * days[1] * 0.01))
+
+
+if __name__ == "__main__":
+    unittest.main()
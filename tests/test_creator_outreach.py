@@ -0,0 +1,95 @@
+"""Creator notes log and the incrementally refreshed search index."""
+
+import json
+import unittest
+from unittest import mock
+
+from support import use_temp_data_dir
+
+import brand_outreach
+import creator_outreach
+
+
+class NotesLogTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_data_dir(self, creator_outreach, brand_outreach)
+        creator_outreach.add_creator("@GlowGuru", "Beauty", 45_000, "Email", "glow@example.com")
+
+    def test_add_note_counts_without_saving_index(self):
+        self.assertEqual(creator_outreach.add_note("glowguru", "  Loved the serum demo  "), 1)
+        self.assertFalse(creator_outreach.NOTES_INDEX_FILE.exists())
+
+        creator_outreach.update_status("@glowguru", "contacted", "sent DM")
+        self.assertEqual(creator_outreach.add_note("@GlowGuru", "Asked for rates"), 3)
+        self.assertFalse(creator_outreach.NOTES_INDEX_FILE.exists())
+
+        notes = creator_outreach.load_notes("glowguru")
+        self.assertEqual([n["type"] for n in notes], ["note", "status", "note"])
+        self.assertEqual(notes[0]["text"], "Loved the serum demo")
+        self.assertTrue(creator_outreach.NOTES_INDEX_FILE.exists())
+        self.assertEqual(creator_outreach.add_note("glowguru", "Rates: $400/video"), 4)
+
+    def test_add_note_unknown_creator(self):
+        with self.assertRaises(KeyError):
+            creator_outreach.add_note("nobody", "hello")
+        self.assertFalse(creator_outreach.NOTES_LOG_FILE.exists())
+
+
+class ImportCreatorsTest(unittest.TestCase):
+    def setUp(self):
+        self.data = use_temp_data_dir(self, creator_outreach, brand_outreach)
+
+    def test_unparseable_follower_counts_are_skipped(self):
+        csv = self.data / "creators.csv"
+        csv.write_text("handle,niche,followers\n"
+                       "@glowguru,Beauty,45K\n"
+                       "@toobig,Beauty,inf\n"
+                       "@nanfan,Home,NaN\n"
+                       "@lots,Home,1.2M\n")
+        counts = creator_outreach.import_creators(str(csv))
+        self.assertEqual((counts["added"], counts["skipped"]), (2, 2))
+        self.assertEqual(creator_outreach.load_creators()["lots"]["followers"], 1_200_000)
+
+
+class SearchRefreshTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_data_dir(self, creator_outreach, brand_outreach)
+        creator_outreach.add_creator("@glowguru", "Beauty", 45_000, "Email", "glow@example.com",
+                                     platform_notes="Night-time skincare routines")
+        creator_outreach.add_creator("@quiet", "Home", 8_000, "DM", "quiet")
+
+    def refs(self, query: str) -> list:
+        return [hit["ref"] for hit in creator_outreach.search_notes(query)]
+
+    def test_new_creators_are_indexed_without_rescanning_the_store(self):
+        self.assertEqual(self.refs("skincare"), ["@glowguru"])
+        meta = json.loads(creator_outreach.SEARCH_META_FILE.read_text())
+        self.assertEqual(meta["watermarks"]["replaceable"], {})
+
+        creator_outreach.add_creator("@desksetup", "Tech", 12_000, "Email", "desk@example.com",
+                                     platform_notes="Minimal desk setup tours")
+        csv = creator_outreach.DATA_DIR / "more.csv"
+        csv.write_text("handle,niche,followers,platform_notes\n"
+                       "@lampfan,Home,3K,Cozy desk lamp reviews\n")
+        creator_outreach.import_creators(str(csv))
+
+        with mock.patch.object(creator_outreach, "load_json",
+                               wraps=creator_outreach.load_json) as load_json:
+            self.assertEqual(sorted(self.refs("desk")), ["@desksetup", "@lampfan"])
+        read = [call.args[0] for call in load_json.call_args_list]
+        self.assertNotIn(creator_outreach.CREATORS_FILE, read)
+
+        before = json.loads(creator_outreach.SEARCH_META_FILE.read_text())
+        self.assertEqual(before["n_docs"], 3)
+        self.assertEqual(self.refs("skincare"), ["@glowguru"])
+        self.assertEqual(creator_outreach.refresh_search_index(), before)
+
+    def test_rebuilt_index_takes_existing_platform_notes(self):
+        creator_outreach.refresh_search_index()
+        creator_outreach.SEARCH_META_FILE.unlink()
+        self.assertEqual(self.refs("routines"), ["@glowguru"])
+        self.assertEqual(json.loads(creator_outreach.SEARCH_META_FILE.read_text())["n_docs"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
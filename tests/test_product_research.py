@@ -0,0 +1,70 @@
+"""Product export import and trend signal observations: bad numbers are skipped."""
+
+import json
+import unittest
+
+from support import use_temp_data_dir
+
+import product_research
+
+
+class ExportImportTest(unittest.TestCase):
+    def setUp(self):
+        self.data = use_temp_data_dir(self, product_research)
+
+    def test_non_finite_numbers_are_skipped(self):
+        export = self.data / "export.csv"
+        export.write_text(
+            "sku,product_name,price,commission,trend\n"
+            "GS-1,Glow Serum,$29.99,15%,7\n"
+            "DL-2,Desk Lamp,inf,10,5\n"
+            "PB-3,Pet Brush,19.00,NaN,5\n"
+            "MB-4,Massage Ball,12.50,8,-Infinity\n"
+        )
+        counts = product_research.import_products(export, network="TikTok Shop")
+        self.assertEqual((counts["added"], counts["skipped"]), (1, 3))
+
+        research = product_research.load_research()
+        self.assertEqual(sorted(research), ["GS-1"])
+        self.assertEqual(research["GS-1"]["price_usd"], 29.99)
+        self.assertEqual(research["GS-1"]["commission_pct"], 15.0)
+
+    def test_ndjson_export_uses_the_same_rules(self):
+        export = self.data / "export.ndjson"
+        rows = [
+            {"id": "glow-serum", "name": "Glow Serum", "price_usd": 29.99, "trend_score": 6},
+            {"id": "desk-lamp", "name": "Desk Lamp", "price_usd": "nan"},
+        ]
+        export.write_text("".join(json.dumps(r) + "\n" for r in rows)
+                          + '{"id": "pet-brush", "price_usd": Infinity}\n')
+        counts = product_research.import_products(export)
+        self.assertEqual((counts["added"], counts["skipped"]), (1, 2))
+        self.assertEqual(product_research.load_research()["glow-serum"]["trend_score"], 6)
+
+
+class RecordObservationsTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_data_dir(self, product_research)
+        product_research.add_product({
+            "id": "glow-serum", "name": "Glow Serum", "price_usd": 29.99, "commission_pct": 15,
+            "network": "TikTok Shop", "category": "beauty_skincare", "trend_score": 4,
+            "competition_level": "medium",
+        })
+
+    def test_non_finite_values_are_skipped(self):
+        result = product_research.record_observations([
+            ("glow-serum", "views", float("nan"), "2026-10-01T09:00:00"),
+            ("glow-serum", "views", float("inf"), "2026-10-02T09:00:00"),
+            ("glow-serum", "orders", "lots", "2026-10-02T09:00:00"),
+            ("glow-serum", "views", 1200, "2026-10-03T09:00:00"),
+        ])
+        self.assertEqual((result["logged"], result["applied"], result["invalid"]), (1, 1, 3))
+
+        state = product_research.load_research()["glow-serum"]["signals"]
+        self.assertEqual(list(state), ["views"])
+        self.assertEqual(state["views"]["at"], "2026-10-03T09:00:00")
+        self.assertNotIn("NaN", product_research.SIGNALS_FILE.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
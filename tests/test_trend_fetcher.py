@@ -0,0 +1,132 @@
+"""End-to-end trend fetch: flaky local HTTP server -> fetch_sources -> product_research."""
+
+import asyncio
+import random
+import threading
+import time
+import unittest
+
+from support import FIXTURES, use_temp_data_dir
+
+import product_research
+import trend_fetcher
+
+PAGES = FIXTURES / "trend_pages"
+FLAKY = 0.4
+SEED = 7
+
+PRODUCTS = [
+    {"id": "glow-serum", "name": "Glow Serum", "price_usd": 29.99, "commission_pct": 15,
+     "network": "TikTok Shop", "category": "beauty_skincare", "trend_score": 4,
+     "competition_level": "medium"},
+    {"id": "desk-lamp", "name": "Desk Lamp", "price_usd": 45.0, "commission_pct": 10,
+     "network": "Amazon Associates", "category": "home_gadgets", "trend_score": 6,
+     "competition_level": "high"},
+    {"id": "pet-brush", "name": "Pet Brush", "price_usd": 19.0, "commission_pct": 12,
+     "network": "TikTok Shop", "category": "pet_products", "trend_score": 5,
+     "competition_level": "low"},
+]
+PAGE_FILES = {"glow-serum": "glow-serum.json", "desk-lamp": "desk-lamp.html", "pet-brush": "pet-brush.json"}
+
+
+def expected_failures(seed: int, flaky: float, answered: int) -> int:
+    """503s a seeded fixture server sends before its answered-th other response."""
+    rng = random.Random(seed)
+    failures = 0
+    while answered:
+        if rng.random() < flaky:
+            failures += 1
+        else:
+            answered -= 1
+    return failures
+
+
+class TrendFetchEndToEndTest(unittest.TestCase):
+    def setUp(self):
+        use_temp_data_dir(self, product_research, trend_fetcher)
+        for product in PRODUCTS:
+            product_research.add_product(dict(product))
+
+    def serve(self, flaky: float, seed: int = None) -> str:
+        server = trend_fetcher.fixture_server(PAGES, port=0, flaky=flaky, seed=seed)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.server = server
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def watch_all(self, base: str) -> list:
+        for pid, page in PAGE_FILES.items():
+            trend_fetcher.add_source(pid, f"{base}/{page}")
+        trend_fetcher.add_source("pet-brush", f"{base}/missing.json")  # 404: not retried
+        return list(trend_fetcher.load_sources().values())
+
+    def run_fetch(self, sources: list) -> dict:
+        return asyncio.run(trend_fetcher.fetch_sources(
+            sources, trend_fetcher.http_fetcher(timeout=5), host_delay=0.0,
+            retries=20, backoff=0.001,
+        ))
+
+    def test_retries_flaky_server_and_applies_observations(self):
+        sources = self.watch_all(self.serve(FLAKY, SEED))
+        counts = self.run_fetch(sources)
+
+        self.assertGreater(counts["retries"], 0)
+        self.assertEqual(counts["retries"], len(self.server.failures))
+        self.assertEqual(counts["retries"], expected_failures(SEED, FLAKY, len(sources)))
+        self.assertEqual((counts["fetched"], counts["failed"]), (3, 1))
+        self.assertEqual(counts["observations"], 4)  # serum views + orders, lamp views, brush views
+        self.assertEqual(counts["updated"], 2)       # serum price, lamp commission
+
+        research = product_research.load_research()
+        by_url = {s["url"].rsplit("/", 1)[1]: s for s in sources}
+        serum = research["glow-serum"]
+        self.assertEqual(sorted(serum["signals"]), ["orders", "views"])
+        self.assertEqual(serum["signals"]["views"]["at"], by_url["glow-serum.json"]["last_fetched"])
+        self.assertEqual(serum["price_usd"], 34.99)
+        self.assertEqual(research["desk-lamp"]["commission_pct"], 22.0)
+        self.assertEqual(by_url["missing.json"]["last_error"], "HTTP 404")
+
+    def test_rerun_replays_cache_without_recording_again(self):
+        sources = self.watch_all(self.serve(0.0))
+        first = self.run_fetch(sources)
+        self.assertEqual(first["observations"], 4)
+        logged = product_research.SIGNALS_FILE.read_text().count("\n")
+
+        for _ in range(2):  # `run --force`
+            again = self.run_fetch(sources)
+            self.assertEqual((again["cached"], again["observations"]), (3, 0))
+
+        # Applied mark lost (e.g. interrupted before saving sources): the
+        # cached fetch time makes the replay an exact duplicate
+        for source in sources:
+            source["last_applied"] = None
+        self.assertEqual(self.run_fetch(sources)["observations"], 0)
+
+        research = product_research.load_research()
+        self.assertEqual(research["glow-serum"]["signals"]["views"]["n"], 1)
+        self.assertNotIn("signal_trend", research["glow-serum"])
+        self.assertEqual(product_research.SIGNALS_FILE.read_text().count("\n"), logged)
+
+    def test_busy_host_does_not_hold_slots(self):
+        started = {}
+
+        async def fetcher(url):
+            started[url] = time.monotonic()
+            return "{}"
+
+        sources = [{"url": f"http://busy.example/{n}", "product_id": "pet-brush",
+                    "last_error": None} for n in range(3)]
+        sources += [{"url": f"http://quiet{n}.example/", "product_id": "desk-lamp",
+                     "last_error": None} for n in range(5)]
+        begin = time.monotonic()
+        asyncio.run(trend_fetcher.fetch_sources(sources, fetcher, concurrency=1,
+                                                host_delay=0.3, use_cache=False))
+        quiet = [started[s["url"]] - begin for s in sources[3:]]
+        self.assertLess(max(quiet), 0.2)
+        busy = sorted(started[s["url"]] for s in sources[:3])
+        self.assertGreaterEqual(busy[2] - busy[0], 0.55)
+
+
+if __name__ == "__main__":
+    unittest.main()
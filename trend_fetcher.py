@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+trend_fetcher.py
+----------------
+Collects trending-product signals automatically. Each source is a URL
+watched for one product in product_research.py. A run fetches every source
+concurrently (bounded, with a politeness delay per host and retries with
+backoff), caches each response on disk for the day, parses out signal
+counts and product fields, and feeds them back to product_research in
+batches: counts as dated observations (record_observations), field changes
+through update_products. Scores refresh as the data lands.
+
+Usage:
+    python trend_fetcher.py add PRODUCT URL   # Watch a URL for a product (id or name)
+    python trend_fetcher.py sources           # List watched sources and their last fetch
+    python trend_fetcher.py run               # Fetch every source and update products
+                                              #   (--fixtures DIR: read pages from files instead)
+    python trend_fetcher.py serve DIR         # Serve fixture pages over local HTTP for testing
+
+Pages are parsed as JSON ({"views": 120000, "orders": 85, "price_usd": 34.99})
+or, for HTML, from meta tags (<meta name="signal:views" content="120000">,
+<meta name="product:price_usd" content="34.99">). Anything else needs a
+parser: --parser module:function, called with (body, source) and returning
+the same kind of dict.
+
+End-to-end test against a local stand-in, e.g. with the fixture pages under
+tests/fixtures/trend_pages and sources pointing at http://127.0.0.1:8765/...:
+    python trend_fetcher.py serve tests/fixtures/trend_pages --flaky 0.2 &
+    python trend_fetcher.py run
+tests/test_trend_fetcher.py runs the same thing automatically.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import http.server
+import importlib
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import date, datetime, timedelta
+from functools import partial
+from pathlib import Path
+from urllib.parse import urlparse
+
+import product_research
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = BASE_DIR / "data"
+SOURCES_FILE = DATA_DIR / "signal_sources.json"
+CACHE_DIR = DATA_DIR / "fetch_cache"  # <date>-<hash of url + date>.json: body + when it was fetched
+
+FETCH_CONCURRENCY = 8       # requests in flight across all hosts
+FETCH_HOST_DELAY = 1.0      # seconds between request starts to the same host
+FETCH_RETRIES = 3           # retries after the first attempt
+FETCH_BACKOFF = 2.0         # seconds before the first retry, doubling each time (+ up to 50% jitter)
+FETCH_TIMEOUT = 20.0        # seconds per request
+FETCH_BATCH = 200           # parsed pages per product_research update
+CACHE_KEEP_DAYS = 7
+USER_AGENT = "TikTokShopOS-trend-fetcher/1.0"
+
+# Product fields a page may update (everything else parsed is ignored)
+PRODUCT_FIELDS = ("price_usd", "commission_pct", "competition_level", "category", "network")
+NUMERIC_FIELDS = ("price_usd", "commission_pct")
+
+SERVE_PORT = 8765
+
+_META = re.compile(r'<meta\s+name="(signal|product):(\w+)"\s+content="([^"]*)"', re.IGNORECASE)
+
+# ---------------------------------------------------------------------------
+# Data helpers
+# ---------------------------------------------------------------------------
+
+def ensure_data_dir() -> None:
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def load_json(path: Path, default: object) -> object:
+    if not path.exists():
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_json(path: Path, data: object) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def load_sources() -> dict:
+    return load_json(SOURCES_FILE, {})
+
+
+def save_sources(sources: dict) -> None:
+    save_json(SOURCES_FILE, sources)
+
+
+def add_source(product: str, url: str) -> dict:
+    """Watch `url` for a product given by id or name."""
+    research = product_research.load_research()
+    product_id = product_research._product_lookup(research)(product)
+    if product_id is None:
+        raise ValueError(f"Product {product} not found.")
+    if urlparse(url).scheme not in ("http", "https"):
+        raise ValueError(f"Source URL must be http(s): {url}")
+    sources = load_sources()
+    source = {
+        "product_id": product_id,
+        "url": url,
+        "added_at": datetime.now().isoformat(),
+        "last_fetched": None,
+        "last_applied": None,
+        "last_error": None,
+    }
+    sources[url] = source
+    save_sources(sources)
+    return source
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+def _cache_path(url: str, day: str) -> Path:
+    key = hashlib.sha1(f"{url}|{day}".encode()).hexdigest()[:20]
+    return CACHE_DIR / f"{day}-{key}.json"
+
+
+def cache_get(url: str, day: str):
+    """(body, fetched_at) cached for this URL on this day, or None."""
+    entry = load_json(_cache_path(url, day), None)
+    if not entry or entry["url"] != url or "fetched_at" not in entry:
+        return None
+    return entry["body"], entry["fetched_at"]
+
+
+def cache_put(url: str, day: str, body: str, fetched_at: str) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    save_json(_cache_path(url, day), {"url": url, "date": day, "fetched_at": fetched_at, "body": body})
+
+
+def prune_cache(keep_days: int = CACHE_KEEP_DAYS) -> int:
+    """Delete cached responses older than keep_days. Returns how many went."""
+    if not CACHE_DIR.exists():
+        return 0
+    cutoff = (date.today() - timedelta(days=keep_days)).isoformat()
+    removed = 0
+    for path in CACHE_DIR.glob("*.json"):
+        if path.name[:10] < cutoff:
+            path.unlink()
+            removed += 1
+    return removed
+
+# ---------------------------------------------------------------------------
+# Fetchers
+# ---------------------------------------------------------------------------
+
+class FetchError(Exception):
+    """A failed fetch; retryable ones (timeouts, 429, 5xx) are tried again."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def http_fetcher(timeout: float = FETCH_TIMEOUT, user_agent: str = USER_AGENT):
+    """Async fetcher that GETs a URL with urllib in a worker thread."""
+    def get(url: str) -> str:
+        request = urllib.request.Request(url, headers={"User-Agent": user_agent})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                charset = response.headers.get_content_charset() or "utf-8"
+                return response.read().decode(charset, errors="replace")
+        except urllib.error.HTTPError as e:
+            raise FetchError(f"HTTP {e.code}", retryable=e.code == 429 or e.code >= 500) from e
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            raise FetchError(str(getattr(e, "reason", e))) from e
+
+    async def fetch(url: str) -> str:
+        return await asyncio.to_thread(get, url)
+
+    return fetch
+
+
+def fixture_fetcher(directory):
+    """
+    Async fetcher that reads a URL's page from directory/<url path>, the
+    same layout `serve` publishes, so tests can skip the network.
+    """
+    root = Path(directory)
+
+    async def fetch(url: str) -> str:
+        path = root / urlparse(url).path.lstrip("/")
+        if not path.is_file():
+            raise FetchError(f"no fixture {path}", retryable=False)
+        return path.read_text(encoding="utf-8")
+
+    return fetch
+
+
+def host_gate(delay: float, slots: asyncio.Semaphore):
+    """
+    Async context manager factory: `async with gate(url)` waits until `delay`
+    seconds have passed since the previous request start to the same host,
+    then holds one of `slots` for the block. Requests queue per host before
+    taking a slot, so a busy host holds at most one waiting slot request
+    and never ties up slots that other hosts could use.
+    """
+    next_start = {}
+    locks = {}
+
+    @contextlib.asynccontextmanager
+    async def gate(url: str):
+        host = urlparse(url).netloc
+        async with locks.setdefault(host, asyncio.Lock()):
+            await asyncio.sleep(max(next_start.get(host, 0.0) - time.monotonic(), 0.0))
+            await slots.acquire()
+            next_start[host] = time.monotonic() + delay
+        try:
+            yield
+        finally:
+            slots.release()
+
+    return gate
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def parse_page(body: str, source: dict) -> dict:
+    """
+    Signal counts and product fields from a JSON document or from HTML
+    signal: / product: meta tags. Keys are signal names (views, orders,
+    sightings) and PRODUCT_FIELDS; other keys are dropped.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = {name: value for _, name, value in _META.findall(body)}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items()
+            if (k in product_research.TREND_SIGNALS or k in PRODUCT_FIELDS) and v not in (None, "")}
+
+
+def load_parser(spec: str):
+    """Resolve a page parser given as 'module:function'."""
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Parser '{spec}' must be given as module:function.")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _split_page(source: dict, page: dict, when: str):
+    """(observations, field updates) for product_research from one parsed page."""
+    observations = []
+    fields = {}
+    for key, value in page.items():
+        if key in product_research.TREND_SIGNALS:
+            observations.append((source["product_id"], key, product_research._parse_number(value), when))
+        elif key in NUMERIC_FIELDS:
+            fields[key] = product_research._parse_number(value)
+        else:
+            fields[key] = str(value).strip()
+    return observations, fields
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+def apply_pages(pages: list) -> dict:
+    """
+    Feed a batch of (source, parsed page, observed-at) results to
+    product_research: one record_observations call for the signal counts
+    and one update_products call for changed fields.
+    """
+    observations = []
+    updates = {}
+    for source, page, when in pages:
+        try:
+            obs, fields = _split_page(source, page, when)
+        except ValueError as e:
+            source["last_error"] = f"unparseable value: {e}"
+            continue
+        observations.extend(obs)
+        if fields:
+            updates.setdefault(source["product_id"], {}).update(fields)
+    result = product_research.record_observations(observations) if observations else {"applied": 0}
+    updated = product_research.update_products(updates) if updates else {}
+    return {"observations": result["applied"], "updated": len(updated)}
+
+
+async def fetch_sources(sources: list, fetcher, parser=parse_page,
+                        concurrency: int = FETCH_CONCURRENCY, host_delay: float = FETCH_HOST_DELAY,
+                        retries: int = FETCH_RETRIES, backoff: float = FETCH_BACKOFF,
+                        use_cache: bool = True, batch_size: int = FETCH_BATCH) -> dict:
+    """
+    Fetch, parse and apply every source.
+
+    At most `concurrency` fetches are in flight; requests to one host start
+    at least host_delay apart; retryable failures are tried again after
+    backoff, 2 × backoff, ... (with jitter), without holding a slot.
+    Responses are cached per URL and day together with when they were
+    fetched, and signal counts are dated with that fetch time. A source
+    already applied today contributes field updates only, so rerunning
+    (--force) never records the same day's counts twice. Parsed pages are
+    applied in batches of batch_size in a worker thread while fetching
+    carries on. Source entries are updated in place.
+    """
+    today = date.today().isoformat()
+    polite = host_gate(host_delay, asyncio.Semaphore(concurrency))
+    counts = {"fetched": 0, "cached": 0, "failed": 0, "retries": 0, "observations": 0, "updated": 0}
+
+    async def fetch_one(source: dict):
+        url = source["url"]
+        cached = cache_get(url, today) if use_cache else None
+        if cached is not None:
+            body, fetched_at = cached
+            counts["cached"] += 1
+        else:
+            for attempt in range(retries + 1):
+                try:
+                    async with polite(url):
+                        body = await fetcher(url)
+                    break
+                except FetchError as e:
+                    if not e.retryable or attempt == retries:
+                        source["last_error"] = str(e)
+                        counts["failed"] += 1
+                        return None
+                    counts["retries"] += 1
+                    await asyncio.sleep(backoff * 2 ** attempt * (1 + random.random() / 2))
+            fetched_at = datetime.now().isoformat()
+            cache_put(url, today, body, fetched_at)
+            counts["fetched"] += 1
+        source["last_fetched"] = fetched_at
+        source["last_error"] = None
+        try:
+            page = parser(body, source)
+        except Exception as e:
+            source["last_error"] = f"parse failed: {e}"
+            counts["failed"] += 1
+            return None
+        if source.get("last_applied") == today:
+            page = {k: v for k, v in page.items() if k not in product_research.TREND_SIGNALS}
+        return source, page, fetched_at
+
+    async def flush(pages: list) -> None:
+        result = await asyncio.to_thread(apply_pages, pages)
+        counts["observations"] += result["observations"]
+        counts["updated"] += result["updated"]
+        for source, _, _ in pages:
+            if source["last_error"] is None:
+                source["last_applied"] = today
+
+    batch = []
+    for task in asyncio.as_completed([fetch_one(source) for source in sources]):
+        result = await task
+        if result is None or not result[1]:
+            continue
+        batch.append(result)
+        if len(batch) >= batch_size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+    return counts
+
+# ---------------------------------------------------------------------------
+# Local stand-in server
+# ---------------------------------------------------------------------------
+
+def fixture_server(directory, port: int = SERVE_PORT, flaky: float = 0.0, seed: int = None):
+    """
+    HTTP server publishing fixture pages from `directory`, failing a
+    `flaky` share of requests with 503 to exercise retries. With a seed the
+    n-th request handled always gets the same outcome. The paths of failed
+    requests are kept in server.failures.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                fail = rng.random() < flaky
+            if fail:
+                self.server.failures.append(self.path)
+                self.send_error(503, "Flaky on purpose")
+                return
+            super().do_GET()
+
+        def log_message(self, format, *args):
+            pass
+
+    handler = partial(Handler, directory=str(directory))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.failures = []
+    return server
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def cmd_add(args) -> None:
+    source = add_source(args.product, args.url)
+    print(f"✓ Watching {source['url']} for {source['product_id']}")
+
+
+def cmd_sources(_args) -> None:
+    sources = load_sources()
+    if not sources:
+        print("No sources. Use `add PRODUCT URL`.")
+        return
+    print(f"\n{'Product':<24} {'Last fetched':<17} {'Status':<22} URL")
+    print(f"{'-'*90}")
+    for source in sources.values():
+        fetched = (source["last_fetched"] or "never")[:16].replace("T", " ")
+        status = source["last_error"] or ("ok" if source["last_fetched"] else "")
+        print(f"{source['product_id'][:23]:<24} {fetched:<17} {status[:21]:<22} {source['url']}")
+
+
+def cmd_run(args) -> None:
+    sources = load_sources()
+    today = date.today().isoformat()
+    due = [s for s in sources.values() if args.force or s.get("last_applied") != today]
+    if not due:
+        print(f"Nothing to fetch — all {len(sources)} sources already applied today (--force to redo).")
+        return
+    fetcher = fixture_fetcher(args.fixtures) if args.fixtures else http_fetcher()
+    parser = load_parser(args.parser) if args.parser else parse_page
+    pruned = prune_cache()
+    start = time.perf_counter()
+    print(f"Fetching {len(due)} sources ({args.concurrency} at a time, "
+          f"{args.delay:g}s per host, {'fixtures' if args.fixtures else 'http'})...")
+    try:
+        counts = asyncio.run(fetch_sources(
+            due, fetcher, parser, concurrency=args.concurrency, host_delay=args.delay,
+            retries=args.retries, use_cache=not args.no_cache,
+        ))
+    finally:
+        save_sources(sources)
+    print(f"\n✓ Done in {time.perf_counter() - start:.1f}s")
+    print(f"  Fetched:          {counts['fetched']:>8,}  ({counts['retries']:,} retries)")
+    print(f"  From cache:       {counts['cached']:>8,}")
+    print(f"  Failed:           {counts['failed']:>8,}")
+    print(f"  Observations:     {counts['observations']:>8,}")
+    print(f"  Products updated: {counts['updated']:>8,}")
+    if pruned:
+        print(f"  Old cache files removed: {pruned:,}")
+    failed = [s for s in due if s["last_error"]]
+    for source in failed[:10]:
+        print(f"  ✗ {source['url']}: {source['last_error']}")
+
+
+def cmd_serve(args) -> None:
+    server = fixture_server(args.directory, args.port, args.flaky, args.seed)
+    print(f"Serving {args.directory} at http://127.0.0.1:{args.port}/ "
+          f"({args.flaky:.0%} flaky). Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Trending-product signal fetcher for product_research",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Commands:
+  add       Watch a URL for a product
+  sources   List watched sources
+  run       Fetch every source and update products
+  serve     Serve fixture pages over local HTTP for testing
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    add_p = subparsers.add_parser("add", help="Watch a URL for a product")
+    add_p.add_argument("product", help="Product ID or name")
+    add_p.add_argument("url", help="Page exposing the product's signals")
+    subparsers.add_parser("sources", help="List watched sources")
+    run_p = subparsers.add_parser("run", help="Fetch every source and update products")
+    run_p.add_argument("--fixtures", metavar="DIR", help="Read pages from DIR/<url path> instead of HTTP")
+    run_p.add_argument("--parser", metavar="MODULE:FUNCTION", help="Custom page parser")
+    run_p.add_argument("--concurrency", type=int, default=FETCH_CONCURRENCY,
+                       help=f"Requests in flight (default {FETCH_CONCURRENCY})")
+    run_p.add_argument("--delay", type=float, default=FETCH_HOST_DELAY,
+                       help=f"Seconds between requests to one host (default {FETCH_HOST_DELAY:g})")
+    run_p.add_argument("--retries", type=int, default=FETCH_RETRIES,
+                       help=f"Retries per source (default {FETCH_RETRIES})")
+    run_p.add_argument("--no-cache", action="store_true", help="Ignore today's cached responses")
+    run_p.add_argument("--force", action="store_true", help="Include sources already applied today")
+    serve_p = subparsers.add_parser("serve", help="Serve fixture pages over local HTTP")
+    serve_p.add_argument("directory", help="Fixture directory")
+    serve_p.add_argument("--port", type=int, default=SERVE_PORT, help=f"Port (default {SERVE_PORT})")
+    serve_p.add_argument("--flaky", type=float, default=0.0,
+                         help="Share of requests to fail with 503 (default 0)")
+    serve_p.add_argument("--seed", type=int, help="Make the flaky failures repeatable")
+
+    args = parser.parse_args()
+    ensure_data_dir()
+
+    commands = {
+        "add": cmd_add,
+        "sources": cmd_sources,
+        "run": cmd_run,
+        "serve": cmd_serve,
+    }
+
+    if args.command in commands:
+        try:
+            commands[args.command](args)
+        except (ValueError, ImportError, AttributeError) as e:
+            print(f"Error: {e}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()